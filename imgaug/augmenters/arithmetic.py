@@ -33,9 +33,11 @@ List of augmenters:
 """
 from __future__ import print_function, division, absolute_import
 
+from io import BytesIO
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
 from PIL import Image
-import imageio
-import tempfile
 import numpy as np
 import six.moves as sm
 
@@ -43,6 +45,36 @@ from . import meta
 from .. import imgaug as ia
 from .. import parameters as iap
 
+# Minimum number of mask values (height * width * channels with separate values)
+# of an image for ReplaceElementwise's sparse mode. For smaller images, the per-image
+# sampling overhead of the sparse mode outweighs the batched sampling of full masks.
+REPLACE_SPARSE_MIN_SIZE = 2**17
+
+
+def _draw_standard_normal_float32(size, seed):
+    """
+    Sample float32 values from a standard normal distribution.
+
+    Parameters
+    ----------
+    size : tuple of int
+        Shape of the array to sample.
+
+    seed : int
+        Seed of the generator that samples the values.
+
+    Returns
+    -------
+    out : ndarray
+        Float32 standard normal values of shape `size`.
+
+    """
+    if hasattr(np.random, "default_rng"):
+        # numpy >=1.17, generates float32 values directly and is
+        # noticeably faster than RandomState.normal()
+        return np.random.default_rng(seed).standard_normal(size, dtype=np.float32)
+    return np.random.RandomState(seed).standard_normal(size).astype(np.float32)
+
 
 class Add(meta.Augmenter):
     """
@@ -109,26 +141,34 @@ class Add(meta.Augmenter):
         self.per_channel = iap.handle_probability_param(per_channel, "per_channel")
 
     def _augment_images(self, images, random_state, parents, hooks):
-        input_dtypes = meta.copy_dtypes_for_restore(images, force_list=True)
+        nb_images = len(images)
+        samples = self._draw_samples([image.shape[2] for image in images], random_state)
+
+        if ia.is_np_array(images) and images.dtype.type == np.uint8:
+            # the saturating addition of a value per image and channel is applied to uint8 images
+            # via lookup tables of shape (256, C), without upcasting the images
+            luts = np.arange(256, dtype=np.int32)[np.newaxis, :, np.newaxis] + samples[:, np.newaxis, :]
+            luts = np.clip(luts, 0, 255).astype(np.uint8)
+            return meta.apply_luts_uint8_(images, luts)
+        elif ia.is_np_array(images):
+            # All images share shape and dtype, so the per-image and per-channel values can be
+            # applied to the whole batch in one broadcasted addition of an (N,1,1,C) array.
+            input_dtype = meta.copy_dtypes_for_restore(images)
+            samples = samples[:, np.newaxis, np.newaxis, :]
+            result = images.astype(np.int32)
+            result += samples
+            result = meta.clip_augmented_images_(result, 0, 255) # TODO make value range more flexible
+            return meta.restore_augmented_images_dtypes_(result, input_dtype)
 
+        input_dtypes = meta.copy_dtypes_for_restore(images, force_list=True)
         result = images
-        nb_images = len(images)
-        seeds = random_state.randint(0, 10**6, (nb_images,))
         for i in sm.xrange(nb_images):
+            if images[i].dtype.type == np.uint8:
+                lut = np.arange(256, dtype=np.int32)[:, np.newaxis] + samples[i, 0:images[i].shape[2]]
+                result[i] = meta.apply_luts_uint8_([images[i]], [np.clip(lut, 0, 255).astype(np.uint8)])[0]
+                continue
             image = images[i].astype(np.int32)
-            rs_image = ia.new_random_state(seeds[i])
-            per_channel = self.per_channel.draw_sample(random_state=rs_image)
-            if per_channel == 1:
-                nb_channels = image.shape[2]
-                samples = self.value.draw_samples((nb_channels,), random_state=rs_image).astype(image.dtype)
-                for c, sample in enumerate(samples):
-                    # TODO make value range more flexible
-                    ia.do_assert(-255 <= sample <= 255)
-                    image[..., c] += sample
-            else:
-                sample = self.value.draw_sample(random_state=rs_image).astype(image.dtype)
-                ia.do_assert(-255 <= sample <= 255) # TODO make value range more flexible
-                image += sample
+            image += samples[i, 0:image.shape[2]]
 
             image = meta.clip_augmented_image_(image, 0, 255) # TODO make value range more flexible
             image = meta.restore_augmented_image_dtype_(image, input_dtypes[i])
@@ -137,6 +177,13 @@ class Add(meta.Augmenter):
 
         return result
 
+    def _draw_samples(self, nb_channels, random_state):
+        samples, _ = iap.draw_per_channel_samples(self.value, self.per_channel, nb_channels, random_state)
+        samples = samples.astype(np.int32)
+        # TODO make value range more flexible
+        ia.do_assert(np.all(-255 <= samples) and np.all(samples <= 255))
+        return samples
+
     def _augment_heatmaps(self, heatmaps, random_state, parents, hooks):
         return heatmaps
 
@@ -146,6 +193,9 @@ class Add(meta.Augmenter):
     def get_parameters(self):
         return [self.value, self.per_channel]
 
+    def _is_pointwise(self):
+        return True
+
 
 class AddElementwise(meta.Augmenter):
     """
@@ -219,20 +269,27 @@ class AddElementwise(meta.Augmenter):
         result = images
         nb_images = len(images)
         seeds = random_state.randint(0, 10**6, (nb_images,))
+        value = self.value.compile()
+        # int32 sample buffers, reused for images of the same size
+        buffers = dict()
         for i in sm.xrange(nb_images):
             seed = seeds[i]
-            image = images[i].astype(np.int32)
-            height, width, nb_channels = image.shape
+            height, width, nb_channels = images[i].shape
             rs_image = ia.new_random_state(seed)
             per_channel = self.per_channel.draw_sample(random_state=rs_image)
-            if per_channel == 1:
-                samples = self.value\
-                    .draw_samples((height, width, nb_channels), random_state=rs_image)\
-                    .astype(image.dtype)
-            else:
-                samples = self.value.draw_samples((height, width, 1), random_state=rs_image).astype(image.dtype)
-                samples = np.tile(samples, (1, 1, nb_channels))
-            after_add = image + samples
+            size = (height, width, nb_channels if per_channel == 1 else 1)
+            if isinstance(value, iap.Normal) and images[i].dtype.type == np.uint8:
+                result[i] = self._add_gaussian_noise_uint8(images[i], value, size, rs_image)
+                continue
+            if size not in buffers:
+                buffers[size] = np.empty(size, dtype=np.int32)
+            # samples of size (H,W,1) are broadcasted to all channels
+            samples = value.draw_samples(size, random_state=rs_image, out=buffers[size])
+            if images[i].dtype.type == np.uint8:
+                result[i] = meta.add_elementwise_uint8(images[i], samples)
+                continue
+            after_add = images[i].astype(np.int32)
+            after_add += samples
 
             after_add = meta.clip_augmented_image_(after_add, 0, 255) # TODO make value range more flexible
             after_add = meta.restore_augmented_image_dtype_(after_add, input_dtypes[i])
@@ -241,6 +298,26 @@ class AddElementwise(meta.Augmenter):
 
         return result
 
+    @classmethod
+    def _add_gaussian_noise_uint8(cls, image, value, size, random_state):
+        # Fast path for gaussian noise on uint8 images. Instead of sampling
+        # float64 values per pixel, float32 standard normal values are
+        # sampled from a generator that is seeded from the image's random
+        # state. They are then scaled to N(loc, scale) in-place.
+        # Like in the generic path, loc and scale are drawn once per image
+        # and the noise is truncated to integers before being added.
+        loc = value.loc.draw_sample(random_state=random_state)
+        scale = value.scale.draw_sample(random_state=random_state)
+        ia.do_assert(scale >= 0, "Expected scale to be in range [0, inf), got %s." % (scale,))
+
+        noise = _draw_standard_normal_float32(size, random_state.randint(0, 10**6))
+        noise *= np.float32(scale)
+        noise += np.float32(loc)
+        # values beyond +/-255 are clipped anyways when adding them to
+        # uint8, clipping here prevents int16 overflows
+        np.clip(noise, -255, 255, out=noise)
+        return meta.add_elementwise_uint8(image, noise.astype(np.int16))
+
     def _augment_heatmaps(self, heatmaps, random_state, parents, hooks):
         return heatmaps
 
@@ -255,6 +332,10 @@ def AdditiveGaussianNoise(loc=0, scale=0, per_channel=False, name=None, determin
     """
     Add gaussian noise (aka white noise) to images.
 
+    For uint8 images, the noise is sampled as float32 values from a faster
+    generator that is seeded per image, instead of as float64 values via
+    ``numpy.random.RandomState.normal()``.
+
     Parameters
     ----------
     loc : number or tuple of number or list of number or imgaug.parameters.StochasticParameter, optional
@@ -386,25 +467,32 @@ class Multiply(meta.Augmenter):
         self.per_channel = iap.handle_probability_param(per_channel, "per_channel")
 
     def _augment_images(self, images, random_state, parents, hooks):
-        input_dtypes = meta.copy_dtypes_for_restore(images, force_list=True)
+        nb_images = len(images)
+        samples = self._draw_samples([image.shape[2] for image in images], random_state)
+
+        if ia.is_np_array(images) and images.dtype.type == np.uint8:
+            # see Add._augment_images()
+            luts = np.arange(256, dtype=np.float32)[np.newaxis, :, np.newaxis] * samples[:, np.newaxis, :]
+            luts = np.clip(luts, 0, 255).astype(np.uint8)
+            return meta.apply_luts_uint8_(images, luts)
+        elif ia.is_np_array(images):
+            # see Add._augment_images()
+            input_dtype = meta.copy_dtypes_for_restore(images)
+            samples = samples[:, np.newaxis, np.newaxis, :]
+            result = images.astype(np.float32)
+            result *= samples
+            result = meta.clip_augmented_images_(result, 0, 255) # TODO make value range more flexible
+            return meta.restore_augmented_images_dtypes_(result, input_dtype)
 
+        input_dtypes = meta.copy_dtypes_for_restore(images, force_list=True)
         result = images
-        nb_images = len(images)
-        seeds = random_state.randint(0, 10**6, (nb_images,))
         for i in sm.xrange(nb_images):
+            if images[i].dtype.type == np.uint8:
+                lut = np.arange(256, dtype=np.float32)[:, np.newaxis] * samples[i, 0:images[i].shape[2]]
+                result[i] = meta.apply_luts_uint8_([images[i]], [np.clip(lut, 0, 255).astype(np.uint8)])[0]
+                continue
             image = images[i].astype(np.float32)
-            rs_image = ia.new_random_state(seeds[i])
-            per_channel = self.per_channel.draw_sample(random_state=rs_image)
-            if per_channel == 1:
-                nb_channels = image.shape[2]
-                samples = self.mul.draw_samples((nb_channels,), random_state=rs_image)
-                for c, sample in enumerate(samples):
-                    ia.do_assert(sample >= 0)
-                    image[..., c] *= sample
-            else:
-                sample = self.mul.draw_sample(random_state=rs_image)
-                ia.do_assert(sample >= 0)
-                image *= sample
+            image *= samples[i, 0:image.shape[2]]
 
             image = meta.clip_augmented_image_(image, 0, 255) # TODO make value range more flexible
             image = meta.restore_augmented_image_dtype_(image, input_dtypes[i])
@@ -413,6 +501,12 @@ class Multiply(meta.Augmenter):
 
         return result
 
+    def _draw_samples(self, nb_channels, random_state):
+        samples, _ = iap.draw_per_channel_samples(self.mul, self.per_channel, nb_channels, random_state)
+        ia.do_assert(np.all(samples >= 0))
+        # float32, as the images are multiplied in float32 space
+        return samples.astype(np.float32)
+
     def _augment_heatmaps(self, heatmaps, random_state, parents, hooks):
         return heatmaps
 
@@ -422,6 +516,9 @@ class Multiply(meta.Augmenter):
     def get_parameters(self):
         return [self.mul, self.per_channel]
 
+    def _is_pointwise(self):
+        return True
+
 
 class MultiplyElementwise(meta.Augmenter):
     """
@@ -495,19 +592,35 @@ class MultiplyElementwise(meta.Augmenter):
 
         result = images
         nb_images = len(images)
+        mul = self.mul.compile()
+        if ia.is_np_array(images) and nb_images > 0:
+            # all images have the same shape, sample the values of the whole batch at once
+            per_channel_mask = iap.draw_per_channel_mask(self.per_channel, nb_images, random_state)
+            samples = iap.draw_per_channel_elementwise_samples(mul, per_channel_mask, images.shape, random_state)
+            if images.dtype.type == np.uint8:
+                # per image, which keeps the float32 buffer small
+                for i in sm.xrange(nb_images):
+                    result[i] = meta.multiply_elementwise_uint8(images[i], samples[i])
+                return result
+            result = images.astype(np.float32) * samples
+            result = meta.clip_augmented_images_(result, 0, 255) # TODO make value range more flexible
+            return meta.restore_augmented_images_dtypes_(result, images.dtype)
+
         seeds = random_state.randint(0, 10**6, (nb_images,))
         for i in sm.xrange(nb_images):
             seed = seeds[i]
-            image = images[i].astype(np.float32)
-            height, width, nb_channels = image.shape
+            height, width, nb_channels = images[i].shape
             rs_image = ia.new_random_state(seed)
             per_channel = self.per_channel.draw_sample(random_state=rs_image)
             if per_channel == 1:
-                samples = self.mul.draw_samples((height, width, nb_channels), random_state=rs_image)
+                samples = mul.draw_samples((height, width, nb_channels), random_state=rs_image)
             else:
-                samples = self.mul.draw_samples((height, width, 1), random_state=rs_image)
-                samples = np.tile(samples, (1, 1, nb_channels))
-            image = image * samples
+                # broadcasted to all channels
+                samples = mul.draw_samples((height, width, 1), random_state=rs_image)
+            if images[i].dtype.type == np.uint8:
+                result[i] = meta.multiply_elementwise_uint8(images[i], samples)
+                continue
+            image = images[i].astype(np.float32) * samples
 
             image = meta.clip_augmented_image_(image, 0, 255) # TODO make value range more flexible
             image = meta.restore_augmented_image_dtype_(image, input_dtypes[i])
@@ -783,6 +896,29 @@ class ReplaceElementwise(meta.Augmenter):
         If this value is a float ``p``, then for ``p`` percent of all images
         `per_channel` will be treated as True, otherwise as False.
 
+    sparse_threshold : None or float, optional
+        If `mask` is a :class:`imgaug.parameters.Binomial` (e.g. created from
+        a float or tuple), then uint8 images for which its probability is at
+        or below this threshold are augmented sparsely. Instead of sampling a
+        full mask and full-sized replacement values, the locations to replace
+        are sampled directly and replacement values are only sampled for these
+        locations. This leads to the same distribution of outputs and is
+        faster for low probabilities and large images. Images with less than
+        ``REPLACE_SPARSE_MIN_SIZE`` mask values (e.g. below about 360x360
+        pixels without per-channel values) are never augmented sparsely.
+        If None, the sparse mode is never used.
+
+    replacement_sampling : {"masked", "full"}, optional
+        How replacement values are sampled outside of the sparse mode.
+
+            * If ``"masked"``, replacement values are only sampled for the
+              locations that are marked in the mask.
+            * If ``"full"``, images are augmented one by one and the mask
+              and the replacement values are sampled for all pixels (and
+              channels), as in imgaug 0.2.6. This does not use the sparse
+              mode, is much slower, but reproduces the outputs of imgaug
+              0.2.6 for the same seeds.
+
     name : None or str, optional
         See :func:`imgaug.augmenters.meta.Augmenter.__init__`.
 
@@ -800,43 +936,75 @@ class ReplaceElementwise(meta.Augmenter):
 
     """
 
-    def __init__(self, mask, replacement, per_channel=False, name=None, deterministic=False, random_state=None):
+    def __init__(self, mask, replacement, per_channel=False, sparse_threshold=0.1, replacement_sampling="masked",
+                 name=None, deterministic=False, random_state=None):
         super(ReplaceElementwise, self).__init__(name=name, deterministic=deterministic, random_state=random_state)
 
         self.mask = iap.handle_probability_param(mask, "mask", tuple_to_uniform=True, list_to_choice=True)
         self.replacement = iap.handle_continuous_param(replacement, "replacement")
         self.per_channel = iap.handle_probability_param(per_channel, "per_channel")
+        self.sparse_threshold = sparse_threshold
+        ia.do_assert(replacement_sampling in ["masked", "full"],
+                     "Expected replacement_sampling to be \"masked\" or \"full\", got %s." % (replacement_sampling,))
+        self.replacement_sampling = replacement_sampling
 
     def _augment_images(self, images, random_state, parents, hooks):
-        input_dtypes = meta.copy_dtypes_for_restore(images, force_list=True)
-
         result = images
         nb_images = len(images)
         seeds = random_state.randint(0, 10**6, (nb_images,))
+        if self.replacement_sampling == "full":
+            return self._augment_images_full(images, seeds)
+        per_channel_mask = iap.draw_per_channel_mask(self.per_channel, nb_images, random_state)
+        # the sparse mode has to decide per image, based on the image's mask probability
+        sparse_allowed = self.sparse_threshold is not None and isinstance(self.mask, iap.Binomial)
+        if ia.is_np_array(images) and nb_images > 0:
+            return self._augment_batch(images, seeds, per_channel_mask, sparse_allowed)
+
         for i in sm.xrange(nb_images):
             seed = seeds[i]
-            image = images[i].astype(np.float32)
+            image = images[i]
             height, width, nb_channels = image.shape
-            per_channel = self.per_channel.draw_sample(random_state=ia.new_random_state(seed+1))
-            if per_channel == 1:
-                mask_samples = self.mask.draw_samples(
-                    (height, width, nb_channels),
-                    random_state=ia.new_random_state(seed+2)
-                )
-                replacement_samples = self.replacement.draw_samples(
-                    (height, width, nb_channels),
-                    random_state=ia.new_random_state(seed+3)
-                )
+            # without per-channel values, the samples are broadcasted to all channels
+            nb_channels_samples = nb_channels if per_channel_mask[i] else 1
+            is_sparse_size = height * width * nb_channels_samples >= REPLACE_SPARSE_MIN_SIZE
+            if sparse_allowed and is_sparse_size and image.dtype.type == np.uint8:
+                rs_mask = ia.new_random_state(seed+2)
+                p = self.mask.p.draw_sample(random_state=rs_mask)
+                if p <= self.sparse_threshold:
+                    result[i] = self._replace_sparse(image, p, nb_channels_samples, rs_mask,
+                                                     ia.new_random_state(seed+3))
+                    continue
+                mask = iap.Binomial(p).draw_mask((height, width, nb_channels_samples), random_state=rs_mask)
             else:
-                mask_samples = self.mask.draw_samples(
-                    (height, width, 1),
+                mask = self.mask.draw_mask(
+                    (height, width, nb_channels_samples),
                     random_state=ia.new_random_state(seed+2)
                 )
+            result[i] = self._replace_masked([image], [mask], per_channel_mask[i:i+1],
+                                             ia.new_random_state(seed+3))[0]
+
+        return result
+
+    def _augment_images_full(self, images, seeds):
+        # Same sampling and arithmetic as in imgaug 0.2.6, which reproduces its outputs.
+        input_dtypes = meta.copy_dtypes_for_restore(images, force_list=True)
+
+        result = images
+        for i, seed in enumerate(seeds):
+            image = images[i].astype(np.float32)
+            height, width, nb_channels = image.shape
+            per_channel = self.per_channel.draw_sample(random_state=ia.new_random_state(seed+1))
+            nb_channels_samples = nb_channels if per_channel == 1 else 1
+            mask_samples = self.mask.draw_samples(
+                (height, width, nb_channels_samples),
+                random_state=ia.new_random_state(seed+2)
+            )
+            replacement_samples = self.replacement.draw_samples(
+                (height, width, nb_channels_samples),
+                random_state=ia.new_random_state(seed+3)
+            )
+            if per_channel != 1:
                 mask_samples = np.tile(mask_samples, (1, 1, nb_channels))
-                replacement_samples = self.replacement.draw_samples(
-                    (height, width, 1),
-                    random_state=ia.new_random_state(seed+3)
-                )
                 replacement_samples = np.tile(replacement_samples, (1, 1, nb_channels))
 
             mask_thresh = mask_samples > 0.5
@@ -849,6 +1017,89 @@ class ReplaceElementwise(meta.Augmenter):
 
         return result
 
+    def _augment_batch(self, images, seeds, per_channel_mask, sparse_allowed):
+        # all images have the same shape, hence the masks and replacement values of
+        # the whole batch are sampled at once
+        seed = seeds[0]
+        random_state_mask = ia.new_random_state(seed+2)
+        nb_images, height, width, nb_channels = images.shape
+        # without per-channel values, images have only height * width mask values
+        is_sparse_size = height * width * nb_channels >= REPLACE_SPARSE_MIN_SIZE
+        if not (sparse_allowed and is_sparse_size and images.dtype.type == np.uint8):
+            masks = iap.draw_per_channel_elementwise_samples(
+                self.mask, per_channel_mask, images.shape, random_state_mask, as_mask=True)
+            return self._replace_masked(images, masks, per_channel_mask, ia.new_random_state(seed+3))
+
+        # Large images with mask probabilities at or below the threshold are augmented
+        # sparsely. All other images are augmented as a batch, using masks for their
+        # already sampled probabilities.
+        ps = self.mask.p.draw_samples((nb_images,), random_state=random_state_mask)
+        ia.do_assert(np.all(np.logical_and(0 <= ps, ps <= 1.0)),
+                     "Expected probability p to be in range [0.0, 1.0], got %s." % (ps,))
+        nb_channels_samples = np.where(per_channel_mask, nb_channels, 1)
+        is_sparse = np.logical_and(ps <= self.sparse_threshold,
+                                   height * width * nb_channels_samples >= REPLACE_SPARSE_MIN_SIZE)
+        for i in np.flatnonzero(is_sparse):
+            nb_channels_samples = nb_channels if per_channel_mask[i] else 1
+            images[i] = self._replace_sparse(images[i], ps[i], nb_channels_samples,
+                                             ia.new_random_state(seeds[i]+2), ia.new_random_state(seeds[i]+3))
+        if np.all(is_sparse):
+            return images
+
+        is_dense = ~is_sparse
+        per_channel_mask_dense = per_channel_mask[is_dense]
+        nb_channels_samples = nb_channels if np.any(per_channel_mask_dense) else 1
+        masks = iap.draw_binomial_masks(ps[is_dense], (int(np.sum(is_dense)), height, width, nb_channels_samples),
+                                        random_state_mask)
+        if nb_channels_samples > 1 and not np.all(per_channel_mask_dense):
+            masks[~per_channel_mask_dense] = masks[~per_channel_mask_dense][..., 0:1]
+        if np.all(is_dense):
+            return self._replace_masked(images, masks, per_channel_mask, ia.new_random_state(seed+3))
+        images[is_dense] = self._replace_masked(images[is_dense], masks, per_channel_mask_dense,
+                                                ia.new_random_state(seed+3))
+        return images
+
+    def _replace_sparse(self, image, p, nb_channels_samples, random_state_mask, random_state_replacement):
+        # image is a uint8 image, the mask is sampled as flat indices over (H, W, C) or (H, W)
+        height, width, nb_channels = image.shape
+        image = np.ascontiguousarray(image)
+        indices = iap.draw_sparse_mask_indices(height * width * nb_channels_samples, p, random_state_mask)
+        replacement_samples = self.replacement.draw_samples((len(indices),), random_state=random_state_replacement)
+        replacement_samples = np.clip(replacement_samples, 0, 255).astype(np.uint8)
+        if nb_channels_samples == nb_channels:
+            image.reshape((-1,))[indices] = replacement_samples
+        else:
+            image.reshape((-1, nb_channels))[indices] = replacement_samples[:, np.newaxis]
+        return image
+
+    def _replace_masked(self, images, masks, per_channel_mask, random_state):
+        # Replacement values are only sampled for the locations at which the masks are True. The
+        # masks of images without per-channel values may be tiled over the channels, their first
+        # channel marks the pixels at which all channels are replaced by the same value.
+        masks = [mask if per_channel else mask[..., 0:1] for mask, per_channel in zip(masks, per_channel_mask)]
+        counts = [int(np.sum(mask)) for mask in masks]
+        replacement_samples = self.replacement.draw_samples((sum(counts),), random_state=random_state)
+        offsets = np.cumsum([0] + counts)
+
+        result = images
+        for i, (image, mask) in enumerate(zip(images, masks)):
+            samples = replacement_samples[offsets[i]:offsets[i+1]]
+            if image.dtype.type == np.uint8:
+                # replace directly in the uint8 image, only the replacement values have to be clipped
+                image_repl = image
+                samples = np.clip(samples, 0, 255)
+            else:
+                image_repl = image.astype(np.float32)
+            if mask.shape[2] == image.shape[2]:
+                image_repl[mask] = samples
+            else:
+                image_repl[mask[..., 0]] = samples[:, np.newaxis]
+            if image.dtype.type != np.uint8:
+                image_repl = meta.clip_augmented_image_(image_repl, 0, 255) # TODO make value range more flexible
+                image_repl = meta.restore_augmented_image_dtype_(image_repl, image.dtype)
+            result[i] = image_repl
+        return result
+
     def _augment_heatmaps(self, heatmaps, random_state, parents, hooks):
         return heatmaps
 
@@ -1426,26 +1677,28 @@ class Invert(meta.Augmenter):
 
         result = images
         nb_images = len(images)
-        seeds = random_state.randint(0, 10**6, (nb_images,))
+        p_samples, _ = iap.draw_per_channel_samples(self.p, self.per_channel,
+                                                    [image.shape[2] for image in images], random_state)
+        ia.do_assert(np.all(0 <= p_samples) and np.all(p_samples <= 1.0))
+        invert_masks = p_samples > 0.5
         for i in sm.xrange(nb_images):
+            if images[i].dtype.type == np.uint8:
+                # lookup table with one column per channel, only the columns of
+                # inverted channels are changed
+                invert_mask = invert_masks[i, 0:images[i].shape[2]]
+                ramp = np.arange(256, dtype=np.int32)[:, np.newaxis]
+                lut = np.where(invert_mask[np.newaxis, :], -np.abs(ramp - self.min_value) + self.max_value, ramp)
+                lut = np.clip(lut, self.min_value, self.max_value).astype(np.uint8)
+                result[i] = meta.apply_luts_uint8_([images[i]], [lut])[0]
+                continue
             image = images[i].astype(np.int32)
-            rs_image = ia.new_random_state(seeds[i])
-            per_channel = self.per_channel.draw_sample(random_state=rs_image)
-            if per_channel == 1:
-                nb_channels = image.shape[2]
-                p_samples = self.p.draw_samples((nb_channels,), random_state=rs_image)
-                for c, p_sample in enumerate(p_samples):
-                    ia.do_assert(0 <= p_sample <= 1)
-                    if p_sample > 0.5:
-                        image_c = image[..., c]
-                        distance_from_min = np.abs(image_c - self.min_value) # d=abs(v-m)
-                        image[..., c] = -distance_from_min + self.max_value # v'=M-d
-            else:
-                p_sample = self.p.draw_sample(random_state=rs_image)
-                ia.do_assert(0 <= p_sample <= 1.0)
-                if p_sample > 0.5:
-                    distance_from_min = np.abs(image - self.min_value) # d=abs(v-m)
-                    image = -distance_from_min + self.max_value
+            invert_mask = invert_masks[i, 0:image.shape[2]]
+            if np.all(invert_mask):
+                distance_from_min = np.abs(image - self.min_value) # d=abs(v-m)
+                image = -distance_from_min + self.max_value # v'=M-d
+            elif np.any(invert_mask):
+                distance_from_min = np.abs(image[..., invert_mask] - self.min_value)
+                image[..., invert_mask] = -distance_from_min + self.max_value
 
             image = meta.clip_augmented_image_(image, self.min_value, self.max_value)
             image = meta.restore_augmented_image_dtype_(image, input_dtypes[i])
@@ -1463,6 +1716,9 @@ class Invert(meta.Augmenter):
     def get_parameters(self):
         return [self.p, self.per_channel, self.min_value, self.max_value]
 
+    def _is_pointwise(self):
+        return True
+
 
 # TODO merge with contrast.LinearContrast
 class ContrastNormalization(meta.Augmenter):
@@ -1527,19 +1783,20 @@ class ContrastNormalization(meta.Augmenter):
 
         result = images
         nb_images = len(images)
-        seeds = random_state.randint(0, 10**6, (nb_images,))
+        alphas, _ = iap.draw_per_channel_samples(self.alpha, self.per_channel,
+                                                 [image.shape[2] for image in images], random_state)
         for i in sm.xrange(nb_images):
+            nb_channels = images[i].shape[2]
+            if images[i].dtype.type == np.uint8:
+                lut = np.arange(256, dtype=np.float32)[:, np.newaxis] - 128
+                lut = lut * alphas[i, 0:nb_channels].astype(np.float32)
+                lut += 128
+                result[i] = meta.apply_luts_uint8_([images[i]], [np.clip(lut, 0, 255).astype(np.uint8)])[0]
+                continue
             image = images[i].astype(np.float32)
-            rs_image = ia.new_random_state(seeds[i])
-            per_channel = self.per_channel.draw_sample(random_state=rs_image)
-            if per_channel:
-                nb_channels = images[i].shape[2]
-                alphas = self.alpha.draw_samples((nb_channels,), random_state=rs_image)
-                for c, alpha in enumerate(alphas):
-                    image[..., c] = alpha * (image[..., c] - 128) + 128
-            else:
-                alpha = self.alpha.draw_sample(random_state=rs_image)
-                image = alpha * (image - 128) + 128
+            image -= 128
+            image *= alphas[i, 0:nb_channels].astype(np.float32)
+            image += 128
 
             image = meta.clip_augmented_image_(image, 0, 255) # TODO make value range more flexible
             image = meta.restore_augmented_image_dtype_(image, input_dtypes[i])
@@ -1557,6 +1814,9 @@ class ContrastNormalization(meta.Augmenter):
     def get_parameters(self):
         return [self.alpha, self.per_channel]
 
+    def _is_pointwise(self):
+        return True
+
 
 class JpegCompression(meta.Augmenter):
     """
@@ -1568,7 +1828,9 @@ class JpegCompression(meta.Augmenter):
     see https://en.wikipedia.org/wiki/Compression_artifact.
 
     Note that this augmenter still returns images as numpy arrays (i.e. saves the images with JPEG compression and
-    then reloads them into arrays). It does not return the raw JPEG file content.
+    then reloads them into arrays). It does not return the raw JPEG file content. The images are compressed and
+    decompressed in memory, without temporary files. As PIL releases the GIL while doing so, the images of a batch
+    are processed in parallel threads.
 
     Parameters
     ----------
@@ -1586,6 +1848,10 @@ class JpegCompression(meta.Augmenter):
               that parameter per ``N`` input images, each representing the compression
               for the nth image. Expected to be discrete.
 
+    nb_workers : None or int, optional
+        Number of threads used to compress the images of a batch. If None, the number of CPU cores is used.
+        A value of 1 compresses the images sequentially in the calling thread.
+
     name : None or str, optional
         See :func:`imgaug.augmenters.meta.Augmenter.__init__`.
 
@@ -1603,7 +1869,7 @@ class JpegCompression(meta.Augmenter):
     80 and 95 (randomly sampled per image).
 
     """
-    def __init__(self, compression=50, name=None, deterministic=False, random_state=None):
+    def __init__(self, compression=50, nb_workers=None, name=None, deterministic=False, random_state=None):
         super(JpegCompression, self).__init__(name=name, deterministic=deterministic, random_state=random_state)
 
         # will be converted to int during augmentation, which is why we allow floats here
@@ -1619,37 +1885,60 @@ class JpegCompression(meta.Augmenter):
         self.maximum_quality = 100
         self.minimum_quality = 1
 
+        ia.do_assert(nb_workers is None or (ia.is_single_integer(nb_workers) and nb_workers >= 1),
+                     "Expected nb_workers to be None or an integer >= 1, got %s." % (nb_workers,))
+        self.nb_workers = nb_workers
+
     def _augment_images(self, images, random_state, parents, hooks):
         result = images
         nb_images = len(images)
         samples = self.compression.draw_samples((nb_images,), random_state=random_state)
 
+        qualities = []
         for i in sm.xrange(nb_images):
-            image = images[i].astype(np.float32)
-            nb_channels = image.shape[-1]
-            is_single_channel = (nb_channels == 1)
-            if is_single_channel:
-                image = image[..., 0]
             sample = int(samples[i])
             ia.do_assert(100 >= sample >= 0)
-            img = Image.fromarray(image.astype(np.uint8))
-            with tempfile.NamedTemporaryFile(mode="wb", suffix=".jpg") as f:
-                # Map from compression to quality used by PIL
-                # We have valid compressions from 0 to 100, i.e. 101 possible values
-                quality = int(np.clip(np.round(
-                    self.minimum_quality + (self.maximum_quality - self.minimum_quality) * (1.0 - (sample / 101))
-                ), self.minimum_quality, self.maximum_quality))
-
-                img.save(f, quality=quality)
-                if nb_channels == 1:
-                    image = imageio.imread(f.name, pilmode="L")
-                else:
-                    image = imageio.imread(f.name, pilmode="RGB")
-            if is_single_channel:
-                image = image[..., np.newaxis]
-            result[i] = image
+            # Map from compression to quality used by PIL
+            # We have valid compressions from 0 to 100, i.e. 101 possible values
+            quality = int(np.clip(np.round(
+                self.minimum_quality + (self.maximum_quality - self.minimum_quality) * (1.0 - (sample / 101))
+            ), self.minimum_quality, self.maximum_quality))
+            qualities.append(quality)
+
+        nb_workers = self.nb_workers if self.nb_workers is not None else multiprocessing.cpu_count()
+        nb_workers = min(nb_workers, nb_images)
+        if nb_workers > 1:
+            pool = ThreadPool(nb_workers)
+            try:
+                images_aug = pool.map(self._compress_image, zip(images, qualities))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            images_aug = [self._compress_image(args) for args in zip(images, qualities)]
+
+        for i, image_aug in enumerate(images_aug):
+            result[i] = image_aug
         return result
 
+    @classmethod
+    def _compress_image(cls, args):
+        # args is a tuple (image, quality), as ThreadPool.map() only accepts functions with one argument
+        image, quality = args
+        image = image.astype(np.uint8, copy=False)
+        is_single_channel = (image.shape[-1] == 1)
+        if is_single_channel:
+            image = image[..., 0]
+
+        buf = BytesIO()
+        Image.fromarray(image).save(buf, format="JPEG", quality=quality)
+        buf.seek(0)
+        image_aug = np.array(Image.open(buf).convert("L" if is_single_channel else "RGB"))
+
+        if is_single_channel:
+            image_aug = image_aug[..., np.newaxis]
+        return image_aug
+
     def _augment_heatmaps(self, heatmaps, random_state, parents, hooks):
         return heatmaps
 
@@ -97,16 +97,17 @@ class WithColorspace(meta.Augmenter):
             result = ChangeColorspace(
                 to_colorspace=self.to_colorspace,
                 from_colorspace=self.from_colorspace,
-            ).augment_images(images=result)
+            ).augment_images(images=result, copy=False)
             result = self.children.augment_images(
                 images=result,
                 parents=parents + [self],
                 hooks=hooks,
+                copy=False,
             )
             result = ChangeColorspace(
                 to_colorspace=self.from_colorspace,
                 from_colorspace=self.to_colorspace,
-            ).augment_images(images=result)
+            ).augment_images(images=result, copy=False)
         return result
 
     def _augment_heatmaps(self, heatmaps, random_state, parents, hooks):
@@ -116,6 +117,7 @@ class WithColorspace(meta.Augmenter):
                 result,
                 parents=parents + [self],
                 hooks=hooks,
+                copy=False,
             )
         return result
 
@@ -126,6 +128,7 @@ class WithColorspace(meta.Augmenter):
                 result,
                 parents=parents + [self],
                 hooks=hooks,
+                copy=False,
             )
         return result
 
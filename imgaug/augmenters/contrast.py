@@ -246,13 +246,12 @@ class _ContrastFuncWrapper(meta.Augmenter):
             nb_channels = 1 if per_channel_i <= 0.5 else image.shape[2]
             samples_i = [param.draw_samples((nb_channels,), random_state=rs) for param in self.params1d]
             if per_channel_i > 0.5:
-                input_dtype = image.dtype
-                image_aug = image.astype(np.float64)
+                # the contrast functions return images of the input dtype
+                image_aug = np.empty_like(image)
                 for c in sm.xrange(nb_channels):
                     samples_i_c = [sample_i[c] for sample_i in samples_i]
                     args = tuple([image[..., c]] + samples_i_c)
                     image_aug[..., c] = self.func(*args)
-                image_aug = image_aug.astype(input_dtype)
             else:
                 args = tuple([image] + samples_i)
                 image_aug = self.func(*args)
@@ -268,6 +267,9 @@ class _ContrastFuncWrapper(meta.Augmenter):
     def get_parameters(self):
         return self.params1d
 
+    def _is_pointwise(self):
+        return True
+
 
 class _PreserveDtype(object):
     def __init__(self, func, adjust_value_range=False):
@@ -289,6 +291,12 @@ class _PreserveDtype(object):
 
 def _adjust_linear(image, alpha):
     input_dtype = image.dtype
+    if input_dtype.type == np.uint8:
+        # compute the adjustment only for the 256 possible values and apply
+        # it via a lookup table instead of upcasting the image to float64
+        lut = 128 + alpha * (np.arange(256, dtype=np.float64)-128)
+        lut = meta.clip_augmented_image_(lut, 0, 255).astype(np.uint8)
+        return meta.apply_luts_uint8_([image], [lut])[0]
     image_aug = 128 + alpha * (image.astype(np.float64)-128)
     if input_dtype.type == np.uint8:
         image_aug = meta.clip_augmented_image_(image_aug, 0, 255)
@@ -95,6 +95,21 @@ class Fliplr(meta.Augmenter):  # pylint: disable=locally-disabled, unused-variab
     def get_parameters(self):
         return [self.p]
 
+    def _is_geometric(self):
+        return True
+
+    def _draw_geometric_matrices(self, shapes, random_state):
+        nb_images = len(shapes)
+        samples = self.p.draw_samples((nb_images,), random_state=random_state)
+        matrices = []
+        for shape, sample in zip(shapes, samples):
+            matrix = np.eye(3, dtype=np.float64)
+            if sample == 1:
+                matrix[0, 0] = -1
+                matrix[0, 2] = shape[1] - 1
+            matrices.append(matrix)
+        return matrices, shapes, [None] * nb_images, [None] * nb_images, matrices
+
 
 class Flipud(meta.Augmenter):  # pylint: disable=locally-disabled, unused-variable, line-too-long
     """
@@ -161,3 +176,18 @@ class Flipud(meta.Augmenter):  # pylint: disable=locally-disabled, unused-variab
 
     def get_parameters(self):
         return [self.p]
+
+    def _is_geometric(self):
+        return True
+
+    def _draw_geometric_matrices(self, shapes, random_state):
+        nb_images = len(shapes)
+        samples = self.p.draw_samples((nb_images,), random_state=random_state)
+        matrices = []
+        for shape, sample in zip(shapes, samples):
+            matrix = np.eye(3, dtype=np.float64)
+            if sample == 1:
+                matrix[1, 1] = -1
+                matrix[1, 2] = shape[0] - 1
+            matrices.append(matrix)
+        return matrices, shapes, [None] * nb_images, [None] * nb_images, matrices
@@ -489,15 +489,8 @@ class Affine(meta.Augmenter):
         for i in sm.xrange(nb_images):
             image = images[i]
             scale_x, scale_y = scale_samples[0][i], scale_samples[1][i]
-            translate_x, translate_y = translate_samples[0][i], translate_samples[1][i]
-            if ia.is_single_float(translate_y):
-                translate_y_px = int(np.round(translate_y * images[i].shape[0]))
-            else:
-                translate_y_px = translate_y
-            if ia.is_single_float(translate_x):
-                translate_x_px = int(np.round(translate_x * images[i].shape[1]))
-            else:
-                translate_x_px = translate_x
+            translate_x_px, translate_y_px = self._compute_translation_px(
+                translate_samples[0][i], translate_samples[1][i], images[i].shape)
             rotate = rotate_samples[i]
             shear = shear_samples[i]
             cval = cval_samples[i]
@@ -555,8 +548,11 @@ class Affine(meta.Augmenter):
 
     def _augment_heatmaps(self, heatmaps, random_state, parents, hooks):
         nb_heatmaps = len(heatmaps)
-        scale_samples, translate_samples, rotate_samples, shear_samples, \
-            cval_samples, mode_samples, order_samples = self._draw_samples(nb_heatmaps, random_state)
+        samples = self._draw_samples(nb_heatmaps, random_state)
+        return self._augment_heatmaps_by_samples(heatmaps, *samples)
+
+    def _augment_heatmaps_by_samples(self, heatmaps, scale_samples, translate_samples, rotate_samples, shear_samples,
+                                     cval_samples, mode_samples, order_samples):
         cval_samples = np.zeros((cval_samples.shape[0], 1), dtype=np.float32)
         mode_samples = ["constant"] * len(mode_samples)
 
@@ -566,47 +562,31 @@ class Affine(meta.Augmenter):
                                                              return_matrices=True)
         for heatmaps_i, arr_aug, matrix in zip(heatmaps, arrs_aug, matrices):
             heatmaps_i.arr_0to1 = arr_aug
-            _, output_shape_i = self._tf_to_fit_output(heatmaps_i.shape, matrix)
-            heatmaps_i.shape = output_shape_i
+            # no matrix is created for heatmaps that were not transformed
+            if matrix is not None:
+                _, output_shape_i = self._tf_to_fit_output(heatmaps_i.shape, matrix)
+                heatmaps_i.shape = output_shape_i
         return heatmaps
 
     def _augment_keypoints(self, keypoints_on_images, random_state, parents, hooks):
-        result = []
         nb_images = len(keypoints_on_images)
-        scale_samples, translate_samples, rotate_samples, shear_samples, \
-            _cval_samples, _mode_samples, _order_samples = self._draw_samples(nb_images, random_state)
+        samples = self._draw_samples(nb_images, random_state)
+        return self._augment_keypoints_by_samples(keypoints_on_images, *samples)
 
+    def _augment_keypoints_by_samples(self, keypoints_on_images, scale_samples, translate_samples, rotate_samples,
+                                      shear_samples, _cval_samples, _mode_samples, _order_samples):
+        result = []
         for i, keypoints_on_image in enumerate(keypoints_on_images):
-            height, width = keypoints_on_image.height, keypoints_on_image.width
-            shift_x = width / 2.0 - 0.5
-            shift_y = height / 2.0 - 0.5
             scale_x, scale_y = scale_samples[0][i], scale_samples[1][i]
-            translate_x, translate_y = translate_samples[0][i], translate_samples[1][i]
-            if ia.is_single_float(translate_y):
-                translate_y_px = int(np.round(translate_y * keypoints_on_image.shape[0]))
-            else:
-                translate_y_px = translate_y
-            if ia.is_single_float(translate_x):
-                translate_x_px = int(np.round(translate_x * keypoints_on_image.shape[1]))
-            else:
-                translate_x_px = translate_x
+            translate_x_px, translate_y_px = self._compute_translation_px(
+                translate_samples[0][i], translate_samples[1][i], keypoints_on_image.shape)
             rotate = rotate_samples[i]
             shear = shear_samples[i]
             if scale_x != 1.0 or scale_y != 1.0 or translate_x_px != 0 or translate_y_px != 0 or rotate != 0 \
                     or shear != 0:
-                matrix_to_topleft = tf.SimilarityTransform(translation=[-shift_x, -shift_y])
-                matrix_transforms = tf.AffineTransform(
-                    scale=(scale_x, scale_y),
-                    translation=(translate_x_px, translate_y_px),
-                    rotation=math.radians(rotate),
-                    shear=math.radians(shear)
-                )
-                matrix_to_center = tf.SimilarityTransform(translation=[shift_x, shift_y])
-                matrix = (matrix_to_topleft + matrix_transforms + matrix_to_center)
-                if self.fit_output:
-                    matrix, output_shape = self._tf_to_fit_output(keypoints_on_image.shape, matrix)
-                else:
-                    output_shape = keypoints_on_image.shape
+                matrix, output_shape = self._create_matrix(keypoints_on_image.shape, scale_x, scale_y,
+                                                           translate_x_px, translate_y_px, rotate, shear,
+                                                           self.fit_output)
 
                 coords = keypoints_on_image.get_coords_array()
                 coords_aug = tf.matrix_transform(coords, matrix.params)
@@ -615,6 +595,16 @@ class Affine(meta.Augmenter):
                 result.append(keypoints_on_image)
         return result
 
+    def _augment_columns(self, columns, random_state, parents):
+        # the transformations are sampled only once for all modalities
+        samples = self._draw_samples(len(columns[0][1]), random_state)
+        augment_funcs = {
+            "images": self._augment_images_by_samples,
+            "heatmaps": self._augment_heatmaps_by_samples,
+            "keypoints": self._augment_keypoints_by_samples
+        }
+        return [(kind, augment_funcs[kind](data, *samples)) for kind, data in columns]
+
     def get_parameters(self):
         return [self.scale, self.translate, self.rotate, self.shear, self.order, self.cval, self.mode, self.backend,
                 self.fit_output]
@@ -653,6 +643,62 @@ class Affine(meta.Augmenter):
         return scale_samples, translate_samples, rotate_samples, shear_samples, cval_samples, mode_samples, \
             order_samples
 
+    def _is_geometric(self):
+        mode_is_constant = isinstance(self.mode, iap.Deterministic) and self.mode.value == "constant"
+        return self.backend != "skimage" and mode_is_constant
+
+    def _draw_geometric_matrices(self, shapes, random_state):
+        nb_images = len(shapes)
+        scale_samples, translate_samples, rotate_samples, shear_samples, \
+            cval_samples, _mode_samples, order_samples = self._draw_samples(nb_images, random_state)
+
+        matrices = []
+        output_shapes = []
+        for i, shape in enumerate(shapes):
+            translate_x_px, translate_y_px = self._compute_translation_px(
+                translate_samples[0][i], translate_samples[1][i], shape)
+            matrix, output_shape = self._create_matrix(shape, scale_samples[0][i], scale_samples[1][i],
+                                                       translate_x_px, translate_y_px, rotate_samples[i],
+                                                       shear_samples[i], self.fit_output)
+            matrices.append(matrix.params)
+            output_shapes.append(output_shape)
+        orders = [self.order_map_skimage_cv2[order] for order in order_samples]
+        cvals = [tuple([float(v) for v in cval]) for cval in cval_samples]
+        return matrices, output_shapes, orders, cvals, matrices
+
+    @classmethod
+    def _compute_translation_px(cls, translate_x, translate_y, shape):
+        if ia.is_single_float(translate_y):
+            translate_y_px = int(np.round(translate_y * shape[0]))
+        else:
+            translate_y_px = translate_y
+        if ia.is_single_float(translate_x):
+            translate_x_px = int(np.round(translate_x * shape[1]))
+        else:
+            translate_x_px = translate_x
+        return translate_x_px, translate_y_px
+
+    @classmethod
+    def _create_matrix(cls, shape, scale_x, scale_y, translate_x_px, translate_y_px, rotate, shear, fit_output):
+        height, width = shape[0], shape[1]
+        shift_x = width / 2.0 - 0.5
+        shift_y = height / 2.0 - 0.5
+
+        matrix_to_topleft = tf.SimilarityTransform(translation=[-shift_x, -shift_y])
+        matrix_transforms = tf.AffineTransform(
+            scale=(scale_x, scale_y),
+            translation=(translate_x_px, translate_y_px),
+            rotation=math.radians(rotate),
+            shear=math.radians(shear)
+        )
+        matrix_to_center = tf.SimilarityTransform(translation=[shift_x, shift_y])
+        matrix = (matrix_to_topleft + matrix_transforms + matrix_to_center)
+
+        output_shape = shape
+        if fit_output:
+            matrix, output_shape = cls._tf_to_fit_output(shape, matrix)
+        return matrix, output_shape
+
     @classmethod
     def _tf_to_fit_output(cls, input_shape, matrix):
         height, width = input_shape[:2]
@@ -683,23 +729,10 @@ class Affine(meta.Augmenter):
 
     def _warp_skimage(self, image, scale_x, scale_y, translate_x_px, translate_y_px, rotate, shear, cval, mode, order,
                       fit_output, return_matrix=False):
-        height, width = image.shape[0], image.shape[1]
-        shift_x = width / 2.0 - 0.5
-        shift_y = height / 2.0 - 0.5
-
-        matrix_to_topleft = tf.SimilarityTransform(translation=[-shift_x, -shift_y])
-        matrix_transforms = tf.AffineTransform(
-            scale=(scale_x, scale_y),
-            translation=(translate_x_px, translate_y_px),
-            rotation=math.radians(rotate),
-            shear=math.radians(shear)
-        )
-        matrix_to_center = tf.SimilarityTransform(translation=[shift_x, shift_y])
-        matrix = (matrix_to_topleft + matrix_transforms + matrix_to_center)
-
-        output_shape = None
-        if fit_output:
-            matrix, output_shape = self._tf_to_fit_output(image.shape, matrix)
+        matrix, output_shape = self._create_matrix(image.shape, scale_x, scale_y, translate_x_px, translate_y_px,
+                                                   rotate, shear, fit_output)
+        if not fit_output:
+            output_shape = None
 
         image_warped = tf.warp(
             image,
@@ -720,24 +753,9 @@ class Affine(meta.Augmenter):
 
     def _warp_cv2(self, image, scale_x, scale_y, translate_x_px, translate_y_px, rotate, shear, cval, mode, order,
                   fit_output, return_matrix=False):
-        height, width = image.shape[0], image.shape[1]
-        shift_x = width / 2.0 - 0.5
-        shift_y = height / 2.0 - 0.5
-
-        matrix_to_topleft = tf.SimilarityTransform(translation=[-shift_x, -shift_y])
-        matrix_transforms = tf.AffineTransform(
-            scale=(scale_x, scale_y),
-            translation=(translate_x_px, translate_y_px),
-            rotation=math.radians(rotate),
-            shear=math.radians(shear)
-        )
-        matrix_to_center = tf.SimilarityTransform(translation=[shift_x, shift_y])
-        matrix = (matrix_to_topleft + matrix_transforms + matrix_to_center)
-
-        dsize = (width, height)
-        if fit_output:
-            matrix, output_shape = self._tf_to_fit_output(image.shape, matrix)
-            dsize = (int(np.round(output_shape[1])), int(np.round(output_shape[0])))
+        matrix, output_shape = self._create_matrix(image.shape, scale_x, scale_y, translate_x_px, translate_y_px,
+                                                   rotate, shear, fit_output)
+        dsize = (int(np.round(output_shape[1])), int(np.round(output_shape[0])))
 
         image_warped = cv2.warpAffine(
             image,
@@ -1930,6 +1948,32 @@ class PerspectiveTransform(meta.Augmenter):
     def get_parameters(self):
         return [self.jitter, self.keep_size]
 
+    def _is_geometric(self):
+        return True
+
+    def _draw_geometric_matrices(self, shapes, random_state):
+        matrices, max_heights, max_widths = self._create_matrices(shapes, random_state)
+
+        result = []
+        output_shapes = []
+        keypoint_matrices = []
+        for shape, M, max_height, max_width in zip(shapes, matrices, max_heights, max_widths):
+            matrix = np.float64(M)
+            keypoint_matrix = matrix
+            if self.keep_size:
+                matrix = np.dot(meta._compute_resize_matrix((max_height, max_width), shape), matrix)
+                keypoint_matrix = np.dot(
+                    meta._compute_keypoint_resize_matrix((max_height, max_width), shape), keypoint_matrix)
+                output_shapes.append(shape)
+            else:
+                output_shapes.append((max_height, max_width) + tuple(shape[2:]))
+            result.append(matrix)
+            keypoint_matrices.append(keypoint_matrix)
+        # the warp uses linear interpolation, the resize to the original size cubic interpolation
+        order = cv2.INTER_CUBIC if self.keep_size else cv2.INTER_LINEAR
+        nb_images = len(shapes)
+        return result, output_shapes, [order] * nb_images, [0] * nb_images, keypoint_matrices
+
 
 # code partially from https://gist.github.com/chsasank/4d8f68caf01f041a6453e67fb30f8f5a
 class ElasticTransformation(meta.Augmenter):
@@ -2465,3 +2509,44 @@ class Rot90(meta.Augmenter):
 
     def get_parameters(self):
         return [self.k, self.keep_size]
+
+    def _is_geometric(self):
+        return True
+
+    def _draw_geometric_matrices(self, shapes, random_state):
+        nb_images = len(shapes)
+        ks = self._draw_samples(nb_images, random_state)
+
+        matrices = []
+        output_shapes = []
+        orders = []
+        keypoint_matrices = []
+        for shape, k_i in zip(shapes, ks):
+            # np.rot90() rotates counter-clockwise, i.e. (x, y) -> (y, W-1-x)
+            # per rotation, where W is the width before the rotation.
+            # Keypoints are rotated via (x, y) -> (y, W-x) instead.
+            matrix = np.eye(3, dtype=np.float64)
+            keypoint_matrix = np.eye(3, dtype=np.float64)
+            shape_aug = tuple(shape)
+            for _ in sm.xrange(k_i % 4):
+                matrix_rot = np.float64([
+                    [0, 1, 0],
+                    [-1, 0, shape_aug[1] - 1],
+                    [0, 0, 1]
+                ])
+                matrix = np.dot(matrix_rot, matrix)
+                matrix_rot[1, 2] = shape_aug[1]
+                keypoint_matrix = np.dot(matrix_rot, keypoint_matrix)
+                shape_aug = (shape_aug[1], shape_aug[0]) + tuple(shape_aug[2:])
+
+            if self.keep_size and shape_aug[0:2] != tuple(shape[0:2]):
+                matrix = np.dot(meta._compute_resize_matrix(shape_aug, shape), matrix)
+                keypoint_matrix = np.dot(meta._compute_keypoint_resize_matrix(shape_aug, shape), keypoint_matrix)
+                shape_aug = tuple(shape)
+                orders.append(cv2.INTER_CUBIC)
+            else:
+                orders.append(None)
+            matrices.append(matrix)
+            keypoint_matrices.append(keypoint_matrix)
+            output_shapes.append(shape_aug)
+        return matrices, output_shapes, orders, [None] * nb_images, keypoint_matrices
@@ -37,6 +37,7 @@ import itertools
 import numpy as np
 import six
 import six.moves as sm
+import cv2
 
 from .. import imgaug as ia
 from .. import parameters as iap
@@ -98,6 +99,103 @@ def clip_augmented_images(images, min_value, max_value):
     return clip_augmented_images_(images, min_value, max_value)
 
 
+def apply_luts_uint8_(images, luts):
+    """
+    Map uint8 images through one lookup table per image.
+
+    Pointwise changes of uint8 images (e.g. adding a value and clipping to
+    ``[0, 255]``) only depend on the 256 possible input values. Computing them
+    on a lookup table and applying that table is much faster and needs less
+    memory than upcasting the images to int32 or float.
+
+    Parameters
+    ----------
+    images : (N,H,W,C) ndarray or list of (H,W,C) ndarray
+        uint8 images. They are changed in-place.
+
+    luts : (N,256) ndarray or (N,256,C) ndarray or list of ndarray
+        uint8 lookup table per image. Each table either has shape ``(256,)``
+        (same table for all channels) or ``(256, C)`` (one column per channel).
+
+    Returns
+    -------
+    images : (N,H,W,C) ndarray or list of (H,W,C) ndarray
+        The changed images.
+
+    """
+    for i, lut in enumerate(luts):
+        images[i] = _apply_lut(images[i], lut)
+    return images
+
+
+def add_elementwise_uint8(image, values):
+    """
+    Add integer values to a uint8 image with saturation at 0 and 255.
+
+    This is equivalent to ``clip(image.astype(int32) + values, 0, 255)``, but
+    avoids the int32 copy of the image.
+
+    Parameters
+    ----------
+    image : (H,W,C) ndarray
+        uint8 image.
+
+    values : (H,W,C) ndarray or (H,W,1) ndarray
+        Integer values to add. Values of shape ``(H,W,1)`` are added to all
+        channels.
+
+    Returns
+    -------
+    (H,W,C) ndarray
+        New uint8 image.
+
+    """
+    ia.do_assert(image.dtype.type == np.uint8, "Expected uint8 image, got dtype %s." % (image.dtype,))
+    if values.dtype.type != np.int16:
+        # values beyond +/-255 saturate anyways
+        values = np.clip(values, -255, 255).astype(np.int16)
+    nb_channels = image.shape[2]
+    if image.size == 0:
+        return np.copy(image)
+    elif nb_channels > 512:
+        # cv2 supports at most 512 channels
+        result = image.astype(np.int16)
+        result += values
+        np.clip(result, 0, 255, out=result)
+        return result.astype(np.uint8)
+    elif values.shape[2] != nb_channels:
+        # merge() is much faster than numpy's broadcasting over the channel axis
+        values = cv2.merge([values] * nb_channels)
+    return cv2.add(np.ascontiguousarray(image), np.ascontiguousarray(values), dtype=cv2.CV_8U).reshape(image.shape)
+
+
+def multiply_elementwise_uint8(images, values):
+    """
+    Multiply uint8 images with float values and clip the results to ``[0, 255]``.
+
+    The multiplication happens in float32 in one buffer, which is clipped
+    in-place and then truncated to uint8.
+
+    Parameters
+    ----------
+    images : ndarray
+        uint8 image or images.
+
+    values : ndarray
+        Factors, broadcastable to the shape of `images`.
+
+    Returns
+    -------
+    ndarray
+        New uint8 image or images.
+
+    """
+    ia.do_assert(images.dtype.type == np.uint8, "Expected uint8 images, got dtype %s." % (images.dtype,))
+    result = np.multiply(images, values.astype(np.float32, copy=False), dtype=np.float32)
+    np.clip(result, 0, 255, out=result)
+    return result.astype(np.uint8)
+
+
 def handle_children_list(lst, augmenter_name, lst_name):
     if lst is None:
         return Sequential([], name="%s-%s" % (augmenter_name, lst_name))
@@ -133,6 +231,568 @@ def invert_reduce_to_nonempty(objs, ids, objs_reduced):
     return objs_inv
 
 
+def _segmaps_to_heatmaps(segmaps):
+    heatmaps_with_nonempty = [segmap.to_heatmaps(only_nonempty=True, not_none_if_no_nonempty=True)
+                              for segmap in segmaps]
+    heatmaps = [heatmaps_i for heatmaps_i, nonempty_class_indices_i in heatmaps_with_nonempty]
+    nonempty_class_indices = [nonempty_class_indices_i
+                              for heatmaps_i, nonempty_class_indices_i in heatmaps_with_nonempty]
+    return heatmaps, nonempty_class_indices
+
+
+def _heatmaps_to_segmaps(heatmaps, nonempty_class_indices, segmaps_orig):
+    segmaps = []
+    for segmap, heatmaps_i, nonempty_class_indices_i in zip(segmaps_orig, heatmaps, nonempty_class_indices):
+        segmap_aug = ia.SegmentationMapOnImage.from_heatmaps(heatmaps_i,
+                                                             class_indices=nonempty_class_indices_i,
+                                                             nb_classes=segmap.nb_classes)
+        segmap_aug.input_was = segmap.input_was
+        segmaps.append(segmap_aug)
+    return segmaps
+
+
+def _bounding_boxes_to_keypoints(bounding_boxes_on_images):
+    kps_ois = []
+    for bbs_oi in bounding_boxes_on_images:
+        kps = []
+        for bb in bbs_oi.bounding_boxes:
+            kps.extend(bb.to_keypoints())
+        kps_ois.append(ia.KeypointsOnImage(kps, shape=bbs_oi.shape))
+    return kps_ois
+
+
+def _keypoints_to_bounding_boxes(keypoints_on_images, bounding_boxes_on_images_orig):
+    result = []
+    for img_idx, kps_oi_aug in enumerate(keypoints_on_images):
+        bbs_aug = []
+        for i in sm.xrange(len(kps_oi_aug.keypoints) // 4):
+            bb_kps = kps_oi_aug.keypoints[i*4:i*4+4]
+            x1 = min([kp.x for kp in bb_kps])
+            x2 = max([kp.x for kp in bb_kps])
+            y1 = min([kp.y for kp in bb_kps])
+            y2 = max([kp.y for kp in bb_kps])
+            bbs_aug.append(
+                bounding_boxes_on_images_orig[img_idx].bounding_boxes[i].copy(
+                    x1=x1,
+                    y1=y1,
+                    x2=x2,
+                    y2=y2
+                )
+            )
+        result.append(
+            ia.BoundingBoxesOnImage(
+                bbs_aug,
+                shape=kps_oi_aug.shape
+            )
+        )
+    return result
+
+
+def _subset_column(data, indices):
+    if ia.is_np_array(data):
+        return data[indices]
+    return [data[idx] for idx in indices]
+
+
+def _merge_column(data, indices, data_subset):
+    # Augmenters may change the shapes or dtypes of images, in which case an
+    # array can no longer hold all images and has to be converted to a list.
+    if ia.is_np_array(data):
+        if all([item.shape == data.shape[1:] and item.dtype == data.dtype for item in data_subset]):
+            for idx, item in zip(indices, data_subset):
+                data[idx] = item
+            return data
+        data = list(data)
+    for idx, item in zip(indices, data_subset):
+        data[idx] = item
+    return data
+
+
+def _has_default_hooks(hooks):
+    # Only hooks that were created without any callbacks are guaranteed to not
+    # interfere with child augmenters, e.g. by deactivating them.
+    return (
+        type(hooks) in [ia.HooksImages, ia.HooksHeatmaps, ia.HooksKeypoints]
+        and hooks.activator is None
+        and hooks.propagator is None
+        and hooks.preprocessor is None
+        and hooks.postprocessor is None
+    )
+
+
+def _is_lut_fusable(images, hooks):
+    if len(images) == 0 or not _has_default_hooks(hooks):
+        return False
+    if ia.is_np_array(images):
+        return images.dtype.type == np.uint8
+    return all([image.dtype.type == np.uint8 for image in images])
+
+
+def _augment_images_by_lut(augmenters, images, parents, hooks):
+    """
+    Apply a run of pointwise augmenters to uint8 images via one lookup table.
+
+    Instead of executing each augmenter on the full images, every augmenter is
+    executed on a ``(1, 256, C)`` ramp image per input image that contains all
+    possible uint8 values. Each augmenter samples the same values as it would
+    for the full images (as sampling of pointwise augmenters only depends on
+    the number of images and channels) and the augmenters' random states are
+    advanced in the same way as in ``augment_images()``. The augmented ramps
+    are then the composed per-image, per-channel lookup tables and are applied
+    once to the images.
+
+    Parameters
+    ----------
+    augmenters : list of imgaug.augmenters.meta.Augmenter
+        Pointwise augmenters to apply, in order of execution.
+
+    images : (N,H,W,C) ndarray or list of (H,W,C) ndarray
+        uint8 images to augment. They may be changed in-place.
+
+    parents : list of imgaug.augmenters.meta.Augmenter
+        See :func:`imgaug.augmenters.meta.Augmenter.augment_images`.
+
+    hooks : imgaug.HooksImages
+        See :func:`imgaug.augmenters.meta.Augmenter.augment_images`.
+
+    Returns
+    -------
+    images : (N,H,W,C) ndarray or list of (H,W,C) ndarray
+        The augmented images.
+
+    """
+    ramp = np.arange(256, dtype=np.uint8)
+    if ia.is_np_array(images):
+        luts = np.tile(ramp.reshape((1, 1, 256, 1)), (len(images), 1, 1, images.shape[3]))
+    else:
+        luts = [np.tile(ramp.reshape((1, 256, 1)), (1, 1, image.shape[2])) for image in images]
+
+    for augmenter in augmenters:
+        luts = augmenter._augment_images(
+            luts,
+            random_state=augmenter._copy_random_state_for_call(),
+            parents=parents,
+            hooks=hooks
+        )
+        # deterministic augmenters reuse their random state in every call,
+        # so only non-deterministic ones are moved forward
+        if not augmenter.deterministic:
+            ia.forward_random_state(augmenter.random_state)
+
+    return apply_luts_uint8_(images, [lut[0] for lut in luts])
+
+
+def _apply_lut(image, lut):
+    ia.do_assert(lut.dtype.type == np.uint8,
+                 "Expected lookup table to be uint8, got dtype %s." % (lut.dtype,))
+    if image.size == 0:
+        return image
+    elif lut.ndim == 1:
+        # same table for all channels, also supports 2D images
+        if image.ndim == 2 or image.shape[2] <= 512:
+            return cv2.LUT(np.ascontiguousarray(image), lut).reshape(image.shape)
+        return lut[image]
+    nb_channels = image.shape[2]
+    if nb_channels == 1:
+        return cv2.LUT(np.ascontiguousarray(image), lut[:, 0])[..., np.newaxis]
+    elif nb_channels <= 512:
+        # cv2.LUT() supports at most 512 channels
+        return cv2.LUT(np.ascontiguousarray(image), np.ascontiguousarray(lut).reshape((256, 1, nb_channels)))
+    return lut[image, np.arange(nb_channels)]
+
+
+def _find_run_end(augmenters, start, is_member):
+    end = start
+    while end < len(augmenters) and augmenters[end].activated and is_member(augmenters[end]):
+        end += 1
+    return end
+
+
+def _is_warp_fusable(images, hooks):
+    # dtypes that are supported by cv2.warpAffine() and cv2.warpPerspective()
+    dtypes = [np.uint8, np.uint16, np.int16, np.float32, np.float64]
+    if len(images) == 0 or not _has_default_hooks(hooks):
+        return False
+    if ia.is_np_array(images):
+        return images.dtype.type in dtypes
+    return all([image.dtype.type in dtypes for image in images])
+
+
+def _compute_resize_matrix(from_shape, to_shape):
+    """
+    Compute the 3x3 matrix that resizes an image from one shape to another.
+
+    The matrix is defined for pixel centers at integer coordinates, i.e.
+    it matches the projection performed by ``cv2.resize()``.
+
+    Parameters
+    ----------
+    from_shape : tuple of int
+        Shape of the image before resizing. Only height and width are used.
+
+    to_shape : tuple of int
+        Shape of the image after resizing. Only height and width are used.
+
+    Returns
+    -------
+    (3,3) ndarray
+        Resize matrix.
+
+    """
+    scale_y = to_shape[0] / from_shape[0]
+    scale_x = to_shape[1] / from_shape[1]
+    return np.float64([
+        [scale_x, 0, 0.5 * scale_x - 0.5],
+        [0, scale_y, 0.5 * scale_y - 0.5],
+        [0, 0, 1]
+    ])
+
+
+def _compute_keypoint_resize_matrix(from_shape, to_shape):
+    """
+    Compute the 3x3 matrix that projects keypoints from one image shape to another.
+
+    In contrast to :func:`imgaug.augmenters.meta._compute_resize_matrix`, the
+    coordinates are scaled by the ratio of the shapes, i.e. the matrix matches
+    the projection performed by ``KeypointsOnImage.on()``.
+
+    Parameters
+    ----------
+    from_shape : tuple of int
+        Shape of the image before resizing. Only height and width are used.
+
+    to_shape : tuple of int
+        Shape of the image after resizing. Only height and width are used.
+
+    Returns
+    -------
+    (3,3) ndarray
+        Resize matrix for keypoint coordinates.
+
+    """
+    scale_y = to_shape[0] / from_shape[0]
+    scale_x = to_shape[1] / from_shape[1]
+    return np.float64([
+        [scale_x, 0, 0],
+        [0, scale_y, 0],
+        [0, 0, 1]
+    ])
+
+
+def _compose_geometric_matrices(augmenters, shapes):
+    """
+    Sample and compose the transformation matrices of geometric augmenters.
+
+    Each augmenter samples its matrices with a copy of its random state,
+    which is afterwards moved forward in the same way as in
+    ``augment_images()``, ``augment_heatmaps()`` and ``augment_keypoints()``.
+    Hence the sampled transformations are the same as when executing the
+    augmenters one by one.
+
+    Parameters
+    ----------
+    augmenters : list of imgaug.augmenters.meta.Augmenter
+        Geometric augmenters, in order of execution.
+
+    shapes : list of tuple of int
+        Shapes of the images to augment.
+
+    Returns
+    -------
+    matrices : list of (3,3) ndarray
+        Composed matrix per image, projecting input to output coordinates.
+
+    output_shapes : list of tuple of int
+        Shape of each image after all transformations.
+
+    orders : list of int
+        cv2 interpolation flag to use per image. This is the highest-quality
+        interpolation requested by any of the augmenters.
+
+    cvals : list of None or number or tuple of number
+        Value to use for newly created pixels per image. This is the value
+        requested by the last augmenter that creates new pixels.
+
+    keypoint_matrices : list of (3,3) ndarray
+        Composed matrix per image, projecting keypoint coordinates of the
+        input to the output in the same way as ``augment_keypoints()``.
+
+    """
+    nb_images = len(shapes)
+    matrices = [np.eye(3, dtype=np.float64) for _ in sm.xrange(nb_images)]
+    keypoint_matrices = [np.eye(3, dtype=np.float64) for _ in sm.xrange(nb_images)]
+    output_shapes = [tuple(shape) for shape in shapes]
+    orders = [None] * nb_images
+    cvals = [None] * nb_images
+
+    for augmenter in augmenters:
+        matrices_aug, output_shapes_aug, orders_aug, cvals_aug, keypoint_matrices_aug = \
+            augmenter._draw_geometric_matrices(output_shapes, augmenter._copy_random_state_for_call())
+        if not augmenter.deterministic:
+            ia.forward_random_state(augmenter.random_state)
+
+        for i in sm.xrange(nb_images):
+            matrices[i] = np.dot(matrices_aug[i], matrices[i])
+            keypoint_matrices[i] = np.dot(keypoint_matrices_aug[i], keypoint_matrices[i])
+            output_shapes[i] = tuple(output_shapes_aug[i][0:2]) + tuple(output_shapes[i][2:])
+            if orders_aug[i] is not None:
+                orders[i] = orders_aug[i] if orders[i] is None else max(orders[i], orders_aug[i])
+            if cvals_aug[i] is not None:
+                cvals[i] = cvals_aug[i]
+
+    # flips and rotations by multiples of 90 degrees do not need interpolation
+    orders = [cv2.INTER_NEAREST if order is None else order for order in orders]
+    cvals = [0 if cval is None else cval for cval in cvals]
+
+    return matrices, output_shapes, orders, cvals, keypoint_matrices
+
+
+def _warp_by_matrix(arr, matrix, output_shape, order, cval):
+    height, width = output_shape[0:2]
+    nb_channels = arr.shape[2]
+    if arr.size == 0:
+        return np.zeros((height, width, nb_channels), dtype=arr.dtype)
+
+    is_affine = np.allclose(matrix[2, :], [0, 0, 1])
+    cval = tuple(cval) if ia.is_iterable(cval) else (cval,)
+
+    # cv2 warps support at most 4 channels, hence larger channel counts are
+    # warped in chunks of 4 channels
+    arr_warped = []
+    for c_start in sm.xrange(0, nb_channels, 4):
+        c_end = min(c_start + 4, nb_channels)
+        arr_c = np.ascontiguousarray(arr[:, :, c_start:c_end])
+        border_value = tuple([cval[c % len(cval)] for c in sm.xrange(c_start, c_end)])
+        if is_affine:
+            arr_c_warped = cv2.warpAffine(arr_c, matrix[0:2, :], (width, height), flags=order,
+                                          borderMode=cv2.BORDER_CONSTANT, borderValue=border_value)
+        else:
+            arr_c_warped = cv2.warpPerspective(arr_c, matrix, (width, height), flags=order,
+                                               borderMode=cv2.BORDER_CONSTANT, borderValue=border_value)
+        # cv2 warps drop the last axis if shape is (H, W, 1)
+        if arr_c_warped.ndim == 2:
+            arr_c_warped = arr_c_warped[..., np.newaxis]
+        arr_warped.append(arr_c_warped)
+
+    if len(arr_warped) == 1:
+        return arr_warped[0]
+    return np.concatenate(arr_warped, axis=2)
+
+
+def _augment_images_by_matrices(augmenters, images):
+    """
+    Apply a run of geometric augmenters to images via one warp per image.
+
+    Parameters
+    ----------
+    augmenters : list of imgaug.augmenters.meta.Augmenter
+        Geometric augmenters to apply, in order of execution.
+
+    images : (N,H,W,C) ndarray or list of (H,W,C) ndarray
+        Images to augment.
+
+    Returns
+    -------
+    images : (N,H,W,C) ndarray or list of (H,W,C) ndarray
+        The augmented images. This is an array if the input was an array and
+        all augmented images have the same shape, otherwise a list.
+
+    """
+    matrices, output_shapes, orders, cvals, _keypoint_matrices = _compose_geometric_matrices(
+        augmenters, [image.shape for image in images])
+    return _apply_matrices_to_images(images, matrices, output_shapes, orders, cvals)
+
+
+def _apply_matrices_to_images(images, matrices, output_shapes, orders, cvals):
+    result = [_warp_by_matrix(image, matrix, output_shape, order, cval)
+              for image, matrix, output_shape, order, cval in zip(images, matrices, output_shapes, orders, cvals)]
+
+    if ia.is_np_array(images) and len(set([image.shape for image in result])) == 1:
+        result = np.array(result, dtype=images.dtype)
+    return result
+
+
+def _augment_heatmaps_by_matrices(augmenters, heatmaps):
+    """
+    Apply a run of geometric augmenters to heatmaps via one warp per heatmap.
+
+    The transformations are sampled for the shapes of the underlying images
+    and then adapted to the heatmap arrays, which may have a different size.
+
+    Parameters
+    ----------
+    augmenters : list of imgaug.augmenters.meta.Augmenter
+        Geometric augmenters to apply, in order of execution.
+
+    heatmaps : list of imgaug.HeatmapsOnImage
+        Heatmaps to augment. They may be changed in-place.
+
+    Returns
+    -------
+    heatmaps : list of imgaug.HeatmapsOnImage
+        The augmented heatmaps.
+
+    """
+    matrices, output_shapes, orders, _cvals, _keypoint_matrices = _compose_geometric_matrices(
+        augmenters, [heatmaps_i.shape for heatmaps_i in heatmaps])
+    return _apply_matrices_to_heatmaps(heatmaps, matrices, output_shapes, orders)
+
+
+def _apply_matrices_to_heatmaps(heatmaps, matrices, output_shapes, orders):
+    for heatmaps_i, matrix, output_shape, order in zip(heatmaps, matrices, output_shapes, orders):
+        height, width = heatmaps_i.shape[0:2]
+        height_arr, width_arr = heatmaps_i.arr_0to1.shape[0:2]
+        height_out, width_out = output_shape[0:2]
+        height_arr_out = max(int(np.round(height_arr * (height_out / height))), 1)
+        width_arr_out = max(int(np.round(width_arr * (width_out / width))), 1)
+
+        matrix_arr = np.dot(
+            _compute_resize_matrix((height_out, width_out), (height_arr_out, width_arr_out)),
+            np.dot(matrix, _compute_resize_matrix((height_arr, width_arr), (height, width)))
+        )
+        arr_aug = _warp_by_matrix(heatmaps_i.arr_0to1, matrix_arr, (height_arr_out, width_arr_out), order, 0)
+
+        # cubic interpolation can lead to values outside of the range [0.0, 1.0]
+        heatmaps_i.arr_0to1 = np.clip(arr_aug, 0.0, 1.0)
+        heatmaps_i.shape = output_shape
+    return heatmaps
+
+
+def _augment_keypoints_by_matrices(augmenters, keypoints_on_images):
+    """
+    Apply a run of geometric augmenters to keypoints via one matrix per image.
+
+    Parameters
+    ----------
+    augmenters : list of imgaug.augmenters.meta.Augmenter
+        Geometric augmenters to apply, in order of execution.
+
+    keypoints_on_images : list of imgaug.KeypointsOnImage
+        Keypoints to augment.
+
+    Returns
+    -------
+    keypoints_on_images : list of imgaug.KeypointsOnImage
+        The augmented keypoints.
+
+    """
+    _matrices, output_shapes, _orders, _cvals, keypoint_matrices = _compose_geometric_matrices(
+        augmenters, [keypoints_on_image.shape for keypoints_on_image in keypoints_on_images])
+    return _apply_matrices_to_keypoints(keypoints_on_images, keypoint_matrices, output_shapes)
+
+
+def _apply_matrices_to_keypoints(keypoints_on_images, matrices, output_shapes):
+    result = []
+    for keypoints_on_image, matrix, output_shape in zip(keypoints_on_images, matrices, output_shapes):
+        coords = keypoints_on_image.get_coords_array().astype(np.float64)
+        coords = np.hstack([coords, np.ones((coords.shape[0], 1), dtype=np.float64)])
+        coords_aug = np.dot(coords, matrix.T)
+        coords_aug = coords_aug[:, 0:2] / coords_aug[:, 2:3]
+        result.append(ia.KeypointsOnImage.from_coords_array(coords_aug, shape=output_shape))
+    return result
+
+
+def _is_columns_warp_fusable(columns):
+    # All modalities must belong to images of the same sizes, as the
+    # transformation matrices are sampled only once for all of them.
+    shapes = None
+    for kind, data in columns:
+        if kind == "images" and not _is_warp_fusable(data, ia.HooksImages()):
+            return False
+        shapes_kind = [item.shape[0:2] for item in data]
+        if shapes is None:
+            shapes = shapes_kind
+        elif shapes_kind != shapes:
+            return False
+    return shapes is not None and len(shapes) > 0
+
+
+def _augment_columns_by_matrices(augmenters, columns):
+    """
+    Apply a run of geometric augmenters jointly to several modalities.
+
+    The transformation matrices are sampled and composed only once and then
+    applied to the images, heatmaps and keypoints of the same images.
+
+    Parameters
+    ----------
+    augmenters : list of imgaug.augmenters.meta.Augmenter
+        Geometric augmenters to apply, in order of execution.
+
+    columns : list of tuple of str and list
+        Modalities to augment.
+        See :func:`imgaug.augmenters.meta.Augmenter._augment_columns`.
+
+    Returns
+    -------
+    list of tuple of str and list
+        The augmented modalities.
+
+    """
+    matrices, output_shapes, orders, cvals, keypoint_matrices = _compose_geometric_matrices(
+        augmenters, [item.shape for item in columns[0][1]])
+
+    result = []
+    for kind, data in columns:
+        # the channel axis of the shapes differs between modalities
+        output_shapes_kind = [tuple(output_shape[0:2]) + tuple(item.shape[2:])
+                              for output_shape, item in zip(output_shapes, data)]
+        if kind == "images":
+            data = _apply_matrices_to_images(data, matrices, output_shapes_kind, orders, cvals)
+        elif kind == "heatmaps":
+            data = _apply_matrices_to_heatmaps(data, matrices, output_shapes_kind, orders)
+        else:
+            data = _apply_matrices_to_keypoints(data, keypoint_matrices, output_shapes_kind)
+        result.append((kind, data))
+    return result
+
+
+def _compute_normalization_matrix(shape):
+    # projects pixel coordinates to coordinates relative to the image size,
+    # with (0, 0) being the top left corner and (1, 1) the bottom right one
+    height, width = shape[0:2]
+    return np.float64([
+        [1.0 / width, 0, 0.5 / width],
+        [0, 1.0 / height, 0.5 / height],
+        [0, 0, 1]
+    ])
+
+
+def _create_matrix_record(matrix, keypoint_matrix, input_shape, output_shape, order, cval):
+    matrix_relative = np.dot(
+        _compute_normalization_matrix(output_shape),
+        np.dot(matrix, np.linalg.inv(_compute_normalization_matrix(input_shape)))
+    )
+    keypoint_matrix_relative = np.dot(
+        _compute_normalization_matrix(output_shape),
+        np.dot(keypoint_matrix, np.linalg.inv(_compute_normalization_matrix(input_shape)))
+    )
+    return {
+        "matrix": matrix_relative.tolist(),
+        "keypoint_matrix": keypoint_matrix_relative.tolist(),
+        "size": [output_shape[0] / input_shape[0], output_shape[1] / input_shape[1]],
+        "order": int(cv2.INTER_NEAREST if order is None else order),
+        "cval": np.array(0 if cval is None else cval).tolist()
+    }
+
+
+def _convert_matrix_record_to_pixels(record, shape):
+    height, width = shape[0:2]
+    output_shape = (
+        max(int(np.round(record["size"][0] * height)), 1),
+        max(int(np.round(record["size"][1] * width)), 1)
+    ) + tuple(shape[2:])
+    matrix = np.dot(
+        np.linalg.inv(_compute_normalization_matrix(output_shape)),
+        np.dot(np.float64(record["matrix"]), _compute_normalization_matrix(shape))
+    )
+    keypoint_matrix = np.dot(
+        np.linalg.inv(_compute_normalization_matrix(output_shape)),
+        np.dot(np.float64(record["keypoint_matrix"]), _compute_normalization_matrix(shape))
+    )
+    return matrix, output_shape, keypoint_matrix
+
+
 @six.add_metaclass(ABCMeta)
 class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, line-too-long
     """
@@ -202,10 +862,29 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
         elif isinstance(random_state, np.random.RandomState):
             self.random_state = random_state
         else:
-            self.random_state = np.random.RandomState(random_state)
+            self.random_state = ia.new_random_state(random_state)
+        # buffer for the copies of the random state that are used by single
+        # augmentation calls, see _copy_random_state_for_call()
+        self._random_state_call = None
 
         self.activated = True
 
+    def __getstate__(self):
+        # the call random state is only a reusable buffer, there is no need
+        # to pickle or deepcopy it (e.g. in to_deterministic())
+        state = self.__dict__.copy()
+        state["_random_state_call"] = None
+        return state
+
+    def _copy_random_state_for_call(self):
+        # Each augmentation call works on a copy of the augmenter's random
+        # state, which is afterwards either forwarded (non-deterministic
+        # augmenters) or left unchanged (deterministic augmenters). Instead
+        # of creating a new RandomState for every call, the state is copied
+        # into a buffer RandomState that is reused across calls.
+        self._random_state_call = ia.copy_random_state_to(self.random_state, self._random_state_call)
+        return self._random_state_call
+
     def augment_batches(self, batches, hooks=None, background=False):
         """
         Augment multiple batches of images.
@@ -239,10 +918,14 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
         hooks : None or imgaug.HooksImages, optional
             HooksImages object to dynamically interfere with the augmentation process.
 
-        background : bool, optional
+        background : bool or imgaug.AugmentationPool, optional
             Whether to augment the batches in background processes.
             If true, hooks can currently not be used as that would require
             pickling functions.
+            If true, new background processes are started for this call. To
+            reuse the same processes for many calls (e.g. one per epoch),
+            provide an :class:`imgaug.AugmentationPool` that was created for
+            this augmenter instead.
 
         Yields
         -------
@@ -336,37 +1019,15 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
 
         if not background:
             for batch_normalized in batches_normalized:
-                batch_augment_images = batch_normalized.images is not None
-                batch_augment_heatmaps = batch_normalized.heatmaps is not None
-                batch_augment_segmaps = batch_normalized.segmentation_maps is not None
-                batch_augment_keypoints = batch_normalized.keypoints is not None
-                batch_augment_bounding_boxes = batch_normalized.bounding_boxes is not None
-
-                nb_to_aug = sum([1 if to_aug else 0
-                                 for to_aug in [batch_augment_images, batch_augment_heatmaps, batch_augment_segmaps,
-                                                batch_augment_keypoints, batch_augment_bounding_boxes]])
-
-                if nb_to_aug > 1:
-                    augseq = self.to_deterministic() if not self.deterministic else self
-                else:
-                    augseq = self
-
-                if batch_augment_images:
-                    batch_normalized.images_aug = augseq.augment_images(batch_normalized.images, hooks=hooks)
-                if batch_augment_heatmaps:
-                    batch_normalized.heatmaps_aug = augseq.augment_heatmaps(batch_normalized.heatmaps, hooks=hooks)
-                if batch_augment_segmaps:
-                    batch_normalized.segmentation_maps_aug = augseq.augment_segmentation_maps(
-                        batch_normalized.segmentation_maps, hooks=hooks)
-                if batch_augment_keypoints:
-                    batch_normalized.keypoints_aug = augseq.augment_keypoints(batch_normalized.keypoints, hooks=hooks)
-                if batch_augment_bounding_boxes:
-                    batch_normalized.bounding_boxes_aug = augseq.augment_bounding_boxes(
-                        batch_normalized.bounding_boxes, hooks=hooks)
-
+                batch_normalized = self.augment_batch(batch_normalized, hooks=hooks)
                 batch_unnormalized = unnormalize_batch(batch_normalized)
 
                 yield batch_unnormalized
+        elif isinstance(background, ia.AugmentationPool):
+            ia.do_assert(background.augseq is self,
+                         "Expected AugmentationPool to have been created for this augmenter.")
+            for batch_aug in background.imap(batches_normalized):
+                yield unnormalize_batch(batch_aug)
         else:
             def load_batches():
                 for batch in batches_normalized:
@@ -384,6 +1045,385 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
             batch_loader.terminate()
             bg_augmenter.terminate()
 
+    def augment_batch(self, batch, hooks=None):
+        """
+        Augment all data of a single batch.
+
+        All modalities of the batch (images, heatmaps, segmentation maps,
+        keypoints and bounding boxes) are augmented in the same way. The
+        augmenter tree is executed only once for all modalities: augmenters
+        with children (e.g. ``Sequential``, ``SomeOf``, ``Sometimes``) sample
+        the order and activation of their children once per batch and each
+        child is applied to all modalities at the same time. Hence, in contrast
+        to first calling ``to_deterministic()`` and then augmenting each
+        modality separately, no copy of the augmenter tree is created.
+
+        Parameters
+        ----------
+        batch : imgaug.Batch
+            The batch to augment. Its input attributes (e.g. ``images``) are
+            not changed.
+
+        hooks : None or imgaug.HooksImages, optional
+            HooksImages object to dynamically interfere with the augmentation process.
+            As hooks are defined per modality, the modalities are augmented
+            one by one with a deterministic copy of this augmenter if hooks
+            are provided.
+
+        Returns
+        -------
+        imgaug.Batch
+            The input batch with ``images_aug``, ``heatmaps_aug``,
+            ``segmentation_maps_aug``, ``keypoints_aug`` and ``bounding_boxes_aug``
+            set for all provided modalities.
+
+        """
+        augmentables = [batch.images, batch.heatmaps, batch.segmentation_maps, batch.keypoints,
+                        batch.bounding_boxes]
+        augmentables = [augmentable for augmentable in augmentables if augmentable is not None]
+        nb_rows = set([len(augmentable) for augmentable in augmentables])
+
+        if len(augmentables) > 1 and hooks is None and len(nb_rows) == 1:
+            return self._augment_batch_jointly(batch)
+
+        augseq = self
+        if len(augmentables) > 1 and not self.deterministic:
+            augseq = self.to_deterministic()
+
+        if batch.images is not None:
+            batch.images_aug = augseq.augment_images(batch.images, hooks=hooks)
+        if batch.heatmaps is not None:
+            batch.heatmaps_aug = augseq.augment_heatmaps(batch.heatmaps, hooks=hooks)
+        if batch.segmentation_maps is not None:
+            batch.segmentation_maps_aug = augseq.augment_segmentation_maps(batch.segmentation_maps, hooks=hooks)
+        if batch.keypoints is not None:
+            batch.keypoints_aug = augseq.augment_keypoints(batch.keypoints, hooks=hooks)
+        if batch.bounding_boxes is not None:
+            batch.bounding_boxes_aug = augseq.augment_bounding_boxes(batch.bounding_boxes, hooks=hooks)
+        return batch
+
+    def _augment_batch_jointly(self, batch):
+        columns = []
+        if batch.images is not None:
+            images = batch.images
+            if ia.is_np_array(images):
+                ia.do_assert(images.ndim in [3, 4],
+                             "Expected 3d/4d array of form (N, height, width) or (N, height, width, channels), "
+                             "got shape %s." % (images.shape,))
+                images_copy = np.copy(images) if images.ndim == 4 else np.copy(images)[..., np.newaxis]
+            else:
+                images_copy = [np.copy(image) if image.ndim == 3 else np.copy(image)[..., np.newaxis]
+                               for image in images]
+            columns.append(("images", images_copy))
+        if batch.heatmaps is not None:
+            columns.append(("heatmaps", [heatmaps_i.deepcopy() for heatmaps_i in batch.heatmaps]))
+        if batch.segmentation_maps is not None:
+            segmaps_heatmaps, nonempty_class_indices = _segmaps_to_heatmaps(batch.segmentation_maps)
+            columns.append(("heatmaps", segmaps_heatmaps))
+        if batch.keypoints is not None:
+            columns.append(("keypoints", [kps_oi.deepcopy() for kps_oi in batch.keypoints]))
+        if batch.bounding_boxes is not None:
+            columns.append(("keypoints", _bounding_boxes_to_keypoints(batch.bounding_boxes)))
+
+        columns_aug = iter([data for _kind, data in self._augment_jointly(columns, parents=[])])
+
+        if batch.images is not None:
+            images_aug = next(columns_aug)
+            # remove temporarily added channel axis for 2D input images
+            if ia.is_np_array(batch.images):
+                if batch.images.ndim == 3:
+                    if ia.is_np_array(images_aug):
+                        images_aug = np.squeeze(images_aug, axis=3)
+                    else:
+                        images_aug = [np.squeeze(image, axis=2) for image in images_aug]
+            else:
+                images_aug = [np.squeeze(image_aug, axis=2) if image.ndim == 2 else image_aug
+                              for image, image_aug in zip(batch.images, images_aug)]
+            batch.images_aug = images_aug
+        if batch.heatmaps is not None:
+            batch.heatmaps_aug = next(columns_aug)
+        if batch.segmentation_maps is not None:
+            batch.segmentation_maps_aug = _heatmaps_to_segmaps(next(columns_aug), nonempty_class_indices,
+                                                               batch.segmentation_maps)
+        if batch.keypoints is not None:
+            batch.keypoints_aug = next(columns_aug)
+        if batch.bounding_boxes is not None:
+            batch.bounding_boxes_aug = _keypoints_to_bounding_boxes(next(columns_aug), batch.bounding_boxes)
+        return batch
+
+    def _augment_jointly(self, columns, parents):
+        # This is the counterpart of augment_images(), augment_heatmaps() and
+        # augment_keypoints() for the joint augmentation of several modalities.
+        if not self.activated or len(columns) == 0 or len(columns[0][1]) == 0:
+            return columns
+
+        columns = self._augment_columns(
+            columns,
+            random_state=self._copy_random_state_for_call(),
+            parents=parents
+        )
+        # deterministic augmenters reuse their random state in every call,
+        # so only non-deterministic ones are moved forward
+        if not self.deterministic:
+            ia.forward_random_state(self.random_state)
+        return columns
+
+    def _augment_columns(self, columns, random_state, parents):
+        """
+        Augment several modalities belonging to the same images jointly.
+
+        This is the internal variation of ``augment_batch()``.
+        Augmenters with children may override this method to sample their
+        children's order and activation only once for all modalities. The
+        default implementation converts augmenters with children to
+        deterministic ones and augments each modality separately. Augmenters
+        without children are executed once per modality, each time with a copy
+        of `random_state`, hence all modalities are augmented with the same
+        sampled values. Pointwise augmenters are only executed on images, as
+        they do not change any other modality.
+
+        Parameters
+        ----------
+        columns : list of tuple of str and list
+            Modalities to augment, each one given as a tuple ``(kind, data)``.
+            ``kind`` is ``"images"`` (with data being an ``(N,H,W,C)`` ndarray or
+            a list of ``(H,W,C)`` ndarray), ``"heatmaps"`` (with data being a list
+            of imgaug.HeatmapsOnImage) or ``"keypoints"`` (with data being a list
+            of imgaug.KeypointsOnImage). Every data contains one entry per image.
+            They may be changed in-place.
+
+        random_state : numpy.random.RandomState
+            The random state to use for all sampling tasks during the augmentation.
+
+        parents : list of imgaug.augmenters.meta.Augmenter
+            See :func:`imgaug.augmenters.meta.Augmenter.augment_images`.
+
+        Returns
+        -------
+        list of tuple of str and list
+            The augmented modalities, in the same order as the input.
+
+        """
+        if len(self.get_children_lists()) > 0:
+            augmenter = self if self.deterministic else self.to_deterministic()
+            augment_funcs = {
+                "images": augmenter.augment_images,
+                "heatmaps": augmenter.augment_heatmaps,
+                "keypoints": augmenter.augment_keypoints
+            }
+            return [(kind, augment_funcs[kind](data, parents=parents, copy=False)) for kind, data in columns]
+
+        augment_funcs = {
+            "images": (self._augment_images, ia.HooksImages),
+            "heatmaps": (self._augment_heatmaps, ia.HooksHeatmaps),
+            "keypoints": (self._augment_keypoints, ia.HooksKeypoints)
+        }
+        result = []
+        for kind, data in columns:
+            if kind == "images" or not self._is_pointwise():
+                augment_func, hooks_class = augment_funcs[kind]
+                data = augment_func(
+                    data,
+                    random_state=ia.copy_random_state(random_state),
+                    parents=parents,
+                    hooks=hooks_class()
+                )
+            result.append((kind, data))
+        return result
+
+    def apply_records(self, images, records):
+        """
+        Re-apply previously recorded transformations to images.
+
+        The records are created via ``augment_images(..., return_records=True)``.
+        No random values are sampled by this method and the random states of
+        the augmenters are not changed. Geometric transformations are stored
+        relative to the image size, hence the records can be applied to images
+        of other resolutions, e.g. records sampled on downscaled previews to
+        the full-resolution originals.
+
+        Note that only transformations of geometric augmenters (e.g. ``Affine``,
+        ``Fliplr``, ``CropAndPad``) and pointwise augmenters on uint8 images
+        (e.g. ``Add``, ``Multiply``) as well as the decisions of ``Sequential``,
+        ``SomeOf`` and ``Sometimes`` are stored explicitly. All other
+        augmenters are recorded via a seed per image and are re-executed with
+        a random state derived from that seed, which may lead to different
+        results at other resolutions (e.g. for noise).
+
+        Parameters
+        ----------
+        images : (N,H,W,C) ndarray or (N,H,W) ndarray or list of (H,W,C) ndarray or list of (H,W) ndarray
+            Images to transform, one per record.
+
+        records : list of None or dict
+            Records as returned by ``augment_images(..., return_records=True)``.
+            This augmenter must be the one (or an exact copy of the one) that
+            created the records.
+
+        Returns
+        -------
+        ndarray or list
+            The transformed images. This is an array if the input was an
+            array and all transformed images have the same shape, otherwise
+            a list.
+
+        """
+        ia.do_assert(len(images) == len(records),
+                     "Expected one record per image, got %d images and %d records." % (len(images), len(records)))
+        result = []
+        for image, record in zip(images, records):
+            image_copy = np.copy(image)
+            if image.ndim == 2:
+                image_aug = self._apply_record_to_image(image_copy[..., np.newaxis], record)
+                image_aug = np.squeeze(image_aug, axis=2)
+            else:
+                image_aug = self._apply_record_to_image(image_copy, record)
+            result.append(image_aug)
+
+        if ia.is_np_array(images) and len(set([image.shape for image in result])) == 1:
+            result = np.array(result, dtype=images.dtype)
+        return result
+
+    def apply_records_to_keypoints(self, keypoints_on_images, records):
+        """
+        Re-apply previously recorded transformations to keypoints.
+
+        See :func:`imgaug.augmenters.meta.Augmenter.apply_records` for details.
+
+        Parameters
+        ----------
+        keypoints_on_images : list of imgaug.KeypointsOnImage
+            Keypoints to transform, one object per record. Their ``shape``
+            attributes must match the shapes of the corresponding images.
+
+        records : list of None or dict
+            Records as returned by ``augment_images(..., return_records=True)``.
+
+        Returns
+        -------
+        list of imgaug.KeypointsOnImage
+            The transformed keypoints.
+
+        """
+        ia.do_assert(len(keypoints_on_images) == len(records),
+                     "Expected one record per KeypointsOnImage, got %d objects and %d records." % (
+                         len(keypoints_on_images), len(records)))
+        return [self._apply_record_to_keypoints(keypoints_on_image.deepcopy(), record)
+                for keypoints_on_image, record in zip(keypoints_on_images, records)]
+
+    def _augment_images_with_records(self, images, parents):
+        # This is the counterpart of augment_images() for recording the
+        # sampled transformations.
+        if not self.activated or len(images) == 0:
+            return images, [None] * len(images)
+
+        images, records = self._record_images(
+            images,
+            random_state=self._copy_random_state_for_call(),
+            parents=parents
+        )
+        if not self.deterministic:
+            ia.forward_random_state(self.random_state)
+        return images, records
+
+    def _record_images(self, images, random_state, parents):
+        """
+        Augment images and return the sampled transformations as records.
+
+        Augmenters with children may override this method together with
+        ``_apply_record_to_image()`` and ``_apply_record_to_keypoints()`` to
+        store the decisions about their children in the records. By default,
+        records are sampled via ``_draw_records()`` and then applied to the
+        images, so that the returned images are exactly the ones that would
+        result from re-applying the records.
+
+        Parameters
+        ----------
+        images : (N,H,W,C) ndarray or list of (H,W,C) ndarray
+            Images to augment. They may be changed in-place.
+
+        random_state : numpy.random.RandomState
+            The random state to use for all sampling tasks during the augmentation.
+
+        parents : list of imgaug.augmenters.meta.Augmenter
+            See :func:`imgaug.augmenters.meta.Augmenter.augment_images`.
+
+        Returns
+        -------
+        images : (N,H,W,C) ndarray or list of (H,W,C) ndarray
+            The augmented images.
+
+        records : list of dict
+            One record per image.
+
+        """
+        records = self._draw_records(images, random_state)
+        result = [self._apply_record_to_image(image, record) for image, record in zip(images, records)]
+        if ia.is_np_array(images) and len(set([image.shape for image in result])) == 1:
+            result = np.array(result, dtype=images.dtype)
+        return result, records
+
+    def _draw_records(self, images, random_state):
+        nb_images = len(images)
+        if self._is_geometric() and _is_warp_fusable(images, ia.HooksImages()):
+            shapes = [image.shape for image in images]
+            matrices, output_shapes, orders, cvals, keypoint_matrices = self._draw_geometric_matrices(
+                shapes, random_state)
+            return [_create_matrix_record(matrix, keypoint_matrix, shape, output_shape, order, cval)
+                    for matrix, keypoint_matrix, shape, output_shape, order, cval
+                    in zip(matrices, keypoint_matrices, shapes, output_shapes, orders, cvals)]
+        elif self._is_pointwise() and _is_lut_fusable(images, ia.HooksImages()):
+            ramp = np.arange(256, dtype=np.uint8)
+            luts = [np.tile(ramp.reshape((1, 256, 1)), (1, 1, image.shape[2])) for image in images]
+            luts = self._augment_images(luts, random_state=random_state, parents=[], hooks=ia.HooksImages())
+            return [{"lut": lut[0].tolist()} for lut in luts]
+        seeds = random_state.randint(0, 10**6, (nb_images,))
+        return [{"seed": int(seed)} for seed in seeds]
+
+    def _apply_record_to_image(self, image, record):
+        if record is None:
+            return image
+        elif "matrix" in record:
+            matrix, output_shape, _keypoint_matrix = _convert_matrix_record_to_pixels(record, image.shape)
+            return _warp_by_matrix(image, matrix, output_shape, record["order"], record["cval"])
+        elif "lut" in record:
+            return _apply_lut(image, np.array(record["lut"], dtype=np.uint8))
+        elif len(self.get_children_lists()) > 0:
+            augmenter = self._create_seeded_copy(record["seed"])
+            return augmenter.augment_images([image], copy=False)[0]
+        return self._augment_images(
+            [image],
+            random_state=ia.new_random_state(record["seed"]),
+            parents=[],
+            hooks=ia.HooksImages()
+        )[0]
+
+    def _apply_record_to_keypoints(self, keypoints_on_image, record):
+        if record is None or "lut" in record:
+            return keypoints_on_image
+        elif "matrix" in record:
+            _matrix, output_shape, keypoint_matrix = _convert_matrix_record_to_pixels(
+                record, keypoints_on_image.shape)
+            return _apply_matrices_to_keypoints([keypoints_on_image], [keypoint_matrix], [output_shape])[0]
+        elif len(self.get_children_lists()) > 0:
+            augmenter = self._create_seeded_copy(record["seed"])
+            return augmenter.augment_keypoints([keypoints_on_image], copy=False)[0]
+        return self._augment_keypoints(
+            [keypoints_on_image],
+            random_state=ia.new_random_state(record["seed"]),
+            parents=[],
+            hooks=ia.HooksKeypoints()
+        )[0]
+
+    def _create_seeded_copy(self, seed):
+        # deterministic copy of this augmenter and its children, which always
+        # samples the same values for the same seed
+        augmenter = self.deepcopy()
+        augmenter.reseed(seed, deterministic_too=True)
+        for augmenter_i in [augmenter] + augmenter.get_all_children(flat=True):
+            augmenter_i.deterministic = True
+        return augmenter
+
     def augment_image(self, image, hooks=None):
         """
         Augment a single image.
@@ -406,7 +1446,7 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
                      "Expected image to have shape (height, width, [channels]), got shape %s." % (image.shape,))
         return self.augment_images([image], hooks=hooks)[0]
 
-    def augment_images(self, images, parents=None, hooks=None):
+    def augment_images(self, images, parents=None, hooks=None, copy=True, return_records=False):
         """
         Augment multiple images.
 
@@ -429,15 +1469,32 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
         hooks : None or imgaug.HooksImages, optional
             HooksImages object to dynamically interfere with the augmentation process.
 
+        copy : bool, optional
+            Whether to copy the input images before augmenting them.
+            If False, the input images may be changed in-place, which saves
+            one copy of the whole batch. Augmenters with children, such as
+            ``Sequential``, always call their children with ``copy=False``,
+            as they already operate on their own copy of the input. Hence,
+            only the topmost call copies the images.
+
+        return_records : bool, optional
+            Whether to also return the sampled transformations as one record
+            per image. The records can be stored (they only contain lists,
+            dicts and numbers, i.e. they may be pickled or saved as JSON) and
+            later be re-applied to the same or other images, e.g. of a higher
+            resolution, using :func:`imgaug.augmenters.meta.Augmenter.apply_records`.
+            Hooks can not be used when records are returned.
+
         Returns
         -------
         images_result : ndarray or list
             Corresponding augmented images.
 
-        """
-        if self.deterministic:
-            state_orig = self.random_state.get_state()
+        records : list of None or dict
+            The transformation records, one per image. Only returned if
+            `return_records` is True.
 
+        """
         if parents is None:
             parents = []
 
@@ -453,7 +1510,7 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
                          "got shape %s." % (images.shape,))
 
             # copy the input, we don't want to augment it in-place
-            images_copy = np.copy(images)
+            images_copy = np.copy(images) if copy else images
 
             if images_copy.ndim == 3 and images_copy.shape[-1] in [1, 3]:
                 warnings.warn("You provided a numpy array of shape %s as input to augment_images(), "
@@ -483,10 +1540,12 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
                 # copy images and add channel axis for 2D images (see above,
                 # as for list inputs each image can have different shape, it
                 # is done here on a per images basis)
+                # the list itself is always recreated, so that the input list
+                # is not changed even if copy is False
                 images_copy = []
                 input_added_axis = []
                 for image in images:
-                    image_copy = np.copy(image)
+                    image_copy = np.copy(image) if copy else image
                     if image.ndim == 2:
                         image_copy = image_copy[:, :, np.newaxis]
                         input_added_axis.append(True)
@@ -502,17 +1561,22 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
         # the is_activated() call allows to use hooks that selectively
         # deactivate specific augmenters in previously defined augmentation
         # sequences
-        if hooks.is_activated(images_copy, augmenter=self, parents=parents, default=self.activated):
+        if return_records:
+            ia.do_assert(_has_default_hooks(hooks), "Hooks can not be used when records are returned.")
+            images_result, records = self._augment_images_with_records(images_copy, parents)
+        elif hooks.is_activated(images_copy, augmenter=self, parents=parents, default=self.activated):
             if len(images) > 0:
                 images_result = self._augment_images(
                     images_copy,
-                    random_state=ia.copy_random_state(self.random_state),
+                    random_state=self._copy_random_state_for_call(),
                     parents=parents,
                     hooks=hooks
                 )
                 # move "forward" the random state, so that the next call to
-                # augment_images() will use different random values
-                ia.forward_random_state(self.random_state)
+                # augment_images() will use different random values,
+                # deterministic augmenters always reuse the same values
+                if not self.deterministic:
+                    ia.forward_random_state(self.random_state)
             else:
                 images_result = images_copy
         else:
@@ -545,9 +1609,8 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
                 if input_added_axis[i] is True:
                     images_result[i] = np.squeeze(images_result[i], axis=2)
 
-        if self.deterministic:
-            self.random_state.set_state(state_orig)
-
+        if return_records:
+            return images_result, records
         return images_result
 
     @abstractmethod
@@ -591,7 +1654,7 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
         """
         raise NotImplementedError()
 
-    def augment_heatmaps(self, heatmaps, parents=None, hooks=None):
+    def augment_heatmaps(self, heatmaps, parents=None, hooks=None, copy=True):
         """
         Augment a heatmap.
 
@@ -608,15 +1671,16 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
         hooks : None or imaug.HooksHeatmaps, optional
             HooksHeatmaps object to dynamically interfere with the augmentation process.
 
+        copy : bool, optional
+            Whether to copy the input heatmaps before augmenting them.
+            See :func:`imgaug.augmenters.meta.Augmenter.augment_images`.
+
         Returns
         -------
         heatmap_result : list of imgaug.HeatmapsOnImage
             Corresponding augmented heatmaps.
 
         """
-        if self.deterministic:
-            state_orig = self.random_state.get_state()
-
         if parents is None:
             parents = []
 
@@ -629,7 +1693,10 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
                      "Expected to get list of imgaug.HeatmapsOnImage() instances, got %s." % (
                          [type(el) for el in heatmaps],))
 
-        heatmaps_copy = [heatmaps_i.deepcopy() for heatmaps_i in heatmaps]
+        if copy:
+            heatmaps_copy = [heatmaps_i.deepcopy() for heatmaps_i in heatmaps]
+        else:
+            heatmaps_copy = list(heatmaps)
 
         heatmaps_copy = hooks.preprocess(heatmaps_copy, augmenter=self, parents=parents)
 
@@ -637,11 +1704,12 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
             if len(heatmaps_copy) > 0:
                 heatmaps_result = self._augment_heatmaps(
                     heatmaps_copy,
-                    random_state=ia.copy_random_state(self.random_state),
+                    random_state=self._copy_random_state_for_call(),
                     parents=parents,
                     hooks=hooks
                 )
-                ia.forward_random_state(self.random_state)
+                if not self.deterministic:
+                    ia.forward_random_state(self.random_state)
             else:
                 heatmaps_result = heatmaps_copy
         else:
@@ -649,9 +1717,6 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
 
         heatmaps_result = hooks.postprocess(heatmaps_result, augmenter=self, parents=parents)
 
-        if self.deterministic:
-            self.random_state.set_state(state_orig)
-
         return heatmaps_result
 
     @abstractmethod
@@ -729,22 +1794,12 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
             Corresponding augmented segmentation maps.
 
         """
-        heatmaps_with_nonempty = [segmap.to_heatmaps(only_nonempty=True, not_none_if_no_nonempty=True)
-                                  for segmap in segmaps]
-        heatmaps = [heatmaps_i for heatmaps_i, nonempty_class_indices_i in heatmaps_with_nonempty]
-        nonempty_class_indices = [nonempty_class_indices_i
-                                  for heatmaps_i, nonempty_class_indices_i in heatmaps_with_nonempty]
-        heatmaps_aug = self.augment_heatmaps(heatmaps, parents=parents, hooks=hooks)
-        segmaps_aug = []
-        for segmap, heatmaps_aug_i, nonempty_class_indices_i in zip(segmaps, heatmaps_aug, nonempty_class_indices):
-            segmap_aug = ia.SegmentationMapOnImage.from_heatmaps(heatmaps_aug_i,
-                                                                 class_indices=nonempty_class_indices_i,
-                                                                 nb_classes=segmap.nb_classes)
-            segmap_aug.input_was = segmap.input_was
-            segmaps_aug.append(segmap_aug)
-        return segmaps_aug
+        heatmaps, nonempty_class_indices = _segmaps_to_heatmaps(segmaps)
+        # the heatmaps were just created from the segmentation maps, hence they don't have to be copied
+        heatmaps_aug = self.augment_heatmaps(heatmaps, parents=parents, hooks=hooks, copy=False)
+        return _heatmaps_to_segmaps(heatmaps_aug, nonempty_class_indices, segmaps)
 
-    def augment_keypoints(self, keypoints_on_images, parents=None, hooks=None):
+    def augment_keypoints(self, keypoints_on_images, parents=None, hooks=None, copy=True):
         """
         Augment image keypoints.
 
@@ -786,15 +1841,16 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
         hooks : None or imgaug.HooksKeypoints, optional
             HooksKeypoints object to dynamically interfere with the augmentation process.
 
+        copy : bool, optional
+            Whether to copy the input keypoints before augmenting them.
+            See :func:`imgaug.augmenters.meta.Augmenter.augment_images`.
+
         Returns
         -------
         keypoints_on_images_result : list of imgaug.KeypointsOnImage
             Augmented keypoints.
 
         """
-        if self.deterministic:
-            state_orig = self.random_state.get_state()
-
         if parents is None:
             parents = []
 
@@ -805,7 +1861,10 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
         ia.do_assert(all([isinstance(keypoints_on_image, ia.KeypointsOnImage)
                           for keypoints_on_image in keypoints_on_images]))
 
-        keypoints_on_images_copy = [keypoints_on_image.deepcopy() for keypoints_on_image in keypoints_on_images]
+        if copy:
+            keypoints_on_images_copy = [keypoints_on_image.deepcopy() for keypoints_on_image in keypoints_on_images]
+        else:
+            keypoints_on_images_copy = list(keypoints_on_images)
 
         keypoints_on_images_copy = hooks.preprocess(keypoints_on_images_copy, augmenter=self, parents=parents)
 
@@ -820,7 +1879,7 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
                 if len(nonempty_idx) > 0:
                     keypoints_on_images_result = self._augment_keypoints(
                         keypoints_on_images_to_aug,
-                        random_state=ia.copy_random_state(self.random_state),
+                        random_state=self._copy_random_state_for_call(),
                         parents=parents,
                         hooks=hooks
                     )
@@ -830,7 +1889,8 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
                 keypoints_on_images_result = invert_reduce_to_nonempty(keypoints_on_images_copy, nonempty_idx,
                                                                        keypoints_on_images_result)
 
-                ia.forward_random_state(self.random_state)
+                if not self.deterministic:
+                    ia.forward_random_state(self.random_state)
             else:
                 keypoints_on_images_result = keypoints_on_images_copy
         else:
@@ -838,9 +1898,6 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
 
         keypoints_on_images_result = hooks.postprocess(keypoints_on_images_result, augmenter=self, parents=parents)
 
-        if self.deterministic:
-            self.random_state.set_state(state_orig)
-
         return keypoints_on_images_result
 
     @abstractmethod
@@ -922,39 +1979,10 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
             Augmented bounding boxes.
 
         """
-        kps_ois = []
-        for bbs_oi in bounding_boxes_on_images:
-            kps = []
-            for bb in bbs_oi.bounding_boxes:
-                kps.extend(bb.to_keypoints())
-            kps_ois.append(ia.KeypointsOnImage(kps, shape=bbs_oi.shape))
-
-        kps_ois_aug = self.augment_keypoints(kps_ois, hooks=hooks)
-
-        result = []
-        for img_idx, kps_oi_aug in enumerate(kps_ois_aug):
-            bbs_aug = []
-            for i in sm.xrange(len(kps_oi_aug.keypoints) // 4):
-                bb_kps = kps_oi_aug.keypoints[i*4:i*4+4]
-                x1 = min([kp.x for kp in bb_kps])
-                x2 = max([kp.x for kp in bb_kps])
-                y1 = min([kp.y for kp in bb_kps])
-                y2 = max([kp.y for kp in bb_kps])
-                bbs_aug.append(
-                    bounding_boxes_on_images[img_idx].bounding_boxes[i].copy(
-                        x1=x1,
-                        y1=y1,
-                        x2=x2,
-                        y2=y2
-                    )
-                )
-            result.append(
-                ia.BoundingBoxesOnImage(
-                    bbs_aug,
-                    shape=kps_oi_aug.shape
-                )
-            )
-        return result
+        kps_ois = _bounding_boxes_to_keypoints(bounding_boxes_on_images)
+        # the keypoints were just created from the bounding boxes, hence they don't have to be copied
+        kps_ois_aug = self.augment_keypoints(kps_ois, hooks=hooks, copy=False)
+        return _keypoints_to_bounding_boxes(kps_ois_aug, bounding_boxes_on_images)
 
     # TODO most of the code of this function could be replaced with ia.draw_grid()
     # TODO add parameter for handling multiple images ((a) next to each other in each row or (b) multiply row count
@@ -1183,8 +2211,7 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
             random_state = ia.new_random_state(random_state)
 
         if not self.deterministic or deterministic_too:
-            seed = random_state.randint(0, 10**6, 1)[0]
-            self.random_state = ia.new_random_state(seed)
+            self.random_state = ia.derive_random_state(random_state)
 
         for lst in self.get_children_lists():
             for aug in lst:
@@ -1421,6 +2448,87 @@ class Augmenter(object):  # pylint: disable=locally-disabled, unused-variable, l
         """
         return []
 
+    def _is_pointwise(self):
+        """
+        Get whether this augmenter is a pointwise intensity augmenter.
+
+        An augmenter is pointwise if each augmented uint8 pixel value depends
+        only on the input value of the same pixel and channel, and if its
+        sampling depends only on the number of images and their channels
+        (not on their height, width or content).
+        Runs of such augmenters may be fused into a single lookup table by
+        :class:`imgaug.augmenters.meta.Sequential`.
+
+        Returns
+        -------
+        bool
+            Whether the augmenter is pointwise. False by default.
+
+        """
+        return False
+
+    def _is_geometric(self):
+        """
+        Get whether this augmenter's transformations can be expressed as 3x3 matrices.
+
+        Geometric augmenters implement
+        :func:`imgaug.augmenters.meta.Augmenter._draw_geometric_matrices`.
+        Runs of such augmenters may be fused into a single warp by
+        :class:`imgaug.augmenters.meta.Sequential`.
+
+        Returns
+        -------
+        bool
+            Whether the augmenter is geometric. False by default.
+
+        """
+        return False
+
+    def _draw_geometric_matrices(self, shapes, random_state):
+        """
+        Sample the transformation matrices of a geometric augmenter.
+
+        The random state must be used in the same way as in the augmenter's
+        ``_augment_images()``, so that fused and non-fused executions sample
+        the same transformations.
+
+        Parameters
+        ----------
+        shapes : list of tuple of int
+            Shapes of the images to augment.
+
+        random_state : numpy.random.RandomState
+            The random state to use for all sampling tasks.
+
+        Returns
+        -------
+        matrices : list of (3,3) ndarray
+            Per image a matrix that projects pixel coordinates (with pixel
+            centers at integer coordinates) of the input image to the output
+            image.
+
+        output_shapes : list of tuple of int
+            Per image the shape after the transformation.
+
+        orders : list of None or int
+            Per image the cv2 interpolation flag (``cv2.INTER_NEAREST``,
+            ``cv2.INTER_LINEAR`` or ``cv2.INTER_CUBIC``) or None if any
+            interpolation is acceptable.
+
+        cvals : list of None or number or tuple of number
+            Per image the value of newly created pixels or None if the
+            transformation does not create new pixels.
+
+        keypoint_matrices : list of (3,3) ndarray
+            Per image a matrix that projects keypoint coordinates in the same
+            way as the augmenter's ``_augment_keypoints()``. This usually
+            equals ``matrices``, but differs for resizes, as keypoints are
+            projected between image sizes by the ratio of the sizes, see
+            :func:`imgaug.augmenters.meta._compute_keypoint_resize_matrix`.
+
+        """
+        raise NotImplementedError()
+
     def get_all_children(self, flat=False):
         """
         Returns all children of this augmenter as a list.
@@ -1722,6 +2830,16 @@ class Sequential(Augmenter, list):
         Whether to apply the child augmenters in random order per image.
         The order is resampled for each image.
 
+    fuse_geometric : bool, optional
+        Whether to fuse runs of adjacent geometric child augmenters (e.g.
+        ``Fliplr``, ``Flipud``, ``Affine``, ``Rot90``, ``PerspectiveTransform``,
+        ``Scale`` and ``CropAndPad`` with constant padding) into one
+        transformation matrix per image. Images and heatmaps are then warped
+        only once and keypoints are projected only once. This is usually
+        faster and avoids repeated interpolation, but the results may slightly
+        differ from executing the augmenters one by one. The sampled
+        transformations are the same in both cases.
+
     name : None or str, optional
         See :func:`imgaug.augmenters.meta.Augmenter.__init__`.
 
@@ -1751,9 +2869,19 @@ class Sequential(Augmenter, list):
     Calls sometimes first the horizontal flip augmenter and sometimes first the
     vertical flip augmenter (each again with 50 percent probability to be used).
 
+    >>> seq = iaa.Sequential([
+    >>>     iaa.Fliplr(0.5),
+    >>>     iaa.Affine(rotate=(-20, 20)),
+    >>>     iaa.Scale(0.5)
+    >>> ], fuse_geometric=True)
+    >>> imgs_aug = seq.augment_images(imgs)
+
+    Flips, rotates and scales images using a single warp per image.
+
     """
 
-    def __init__(self, children=None, random_order=False, name=None, deterministic=False, random_state=None):
+    def __init__(self, children=None, random_order=False, fuse_geometric=False, name=None, deterministic=False,
+                 random_state=None):
         Augmenter.__init__(self, name=name, deterministic=deterministic, random_state=random_state)
         if children is None:
             list.__init__(self, [])
@@ -1773,60 +2901,157 @@ class Sequential(Augmenter, list):
                      "Expected random_order to be boolean, got %s." % (type(random_order),))
         self.random_order = random_order
 
+        ia.do_assert(ia.is_single_bool(fuse_geometric),
+                     "Expected fuse_geometric to be boolean, got %s." % (type(fuse_geometric),))
+        self.fuse_geometric = fuse_geometric
+
     def _augment_images(self, images, random_state, parents, hooks):
         if hooks.is_propagating(images, augmenter=self, parents=parents, default=True):
-            if self.random_order:
-                for index in random_state.permutation(len(self)):
-                    images = self[index].augment_images(
-                        images=images,
-                        parents=parents + [self],
-                        hooks=hooks
-                    )
-            else:
-                for augmenter in self:
-                    images = augmenter.augment_images(
-                        images=images,
-                        parents=parents + [self],
-                        hooks=hooks
-                    )
+            augmenters = self._get_augmenters_in_order(random_state)
+            i = 0
+            while i < len(augmenters):
+                # runs of adjacent pointwise augmenters on uint8 images are
+                # fused into one lookup table per image and channel
+                run_end = i
+                if _is_lut_fusable(images, hooks):
+                    run_end = _find_run_end(augmenters, i, lambda augmenter: augmenter._is_pointwise())
+                if run_end - i >= 2:
+                    images = _augment_images_by_lut(augmenters[i:run_end], images, parents + [self], hooks)
+                    i = run_end
+                    continue
+
+                run_end = i
+                if self.fuse_geometric and _is_warp_fusable(images, hooks):
+                    run_end = _find_run_end(augmenters, i, lambda augmenter: augmenter._is_geometric())
+                if run_end - i >= 2:
+                    images = _augment_images_by_matrices(augmenters[i:run_end], images)
+                    i = run_end
+                    continue
+
+                images = augmenters[i].augment_images(
+                    images=images,
+                    parents=parents + [self],
+                    hooks=hooks,
+                    copy=False
+                )
+                i += 1
         return images
 
     def _augment_heatmaps(self, heatmaps, random_state, parents, hooks):
         if hooks.is_propagating(heatmaps, augmenter=self, parents=parents, default=True):
-            if self.random_order:
-                for index in random_state.permutation(len(self)):
-                    heatmaps = self[index].augment_heatmaps(
-                        heatmaps=heatmaps,
-                        parents=parents + [self],
-                        hooks=hooks
-                    )
-            else:
-                for augmenter in self:
-                    heatmaps = augmenter.augment_heatmaps(
-                        heatmaps=heatmaps,
-                        parents=parents + [self],
-                        hooks=hooks
-                    )
+            augmenters = self._get_augmenters_in_order(random_state)
+            i = 0
+            while i < len(augmenters):
+                run_end = i
+                if self.fuse_geometric and len(heatmaps) > 0 and _has_default_hooks(hooks):
+                    run_end = _find_run_end(augmenters, i, lambda augmenter: augmenter._is_geometric())
+                if run_end - i >= 2:
+                    heatmaps = _augment_heatmaps_by_matrices(augmenters[i:run_end], heatmaps)
+                    i = run_end
+                    continue
+
+                heatmaps = augmenters[i].augment_heatmaps(
+                    heatmaps=heatmaps,
+                    parents=parents + [self],
+                    hooks=hooks,
+                    copy=False
+                )
+                i += 1
         return heatmaps
 
     def _augment_keypoints(self, keypoints_on_images, random_state, parents, hooks):
         if hooks.is_propagating(keypoints_on_images, augmenter=self, parents=parents, default=True):
-            if self.random_order:
-                for index in random_state.permutation(len(self)):
-                    keypoints_on_images = self[index].augment_keypoints(
-                        keypoints_on_images=keypoints_on_images,
-                        parents=parents + [self],
-                        hooks=hooks
-                    )
-            else:
-                for augmenter in self:
-                    keypoints_on_images = augmenter.augment_keypoints(
-                        keypoints_on_images=keypoints_on_images,
-                        parents=parents + [self],
-                        hooks=hooks
-                    )
+            augmenters = self._get_augmenters_in_order(random_state)
+            i = 0
+            while i < len(augmenters):
+                run_end = i
+                if self.fuse_geometric and len(keypoints_on_images) > 0 and _has_default_hooks(hooks):
+                    run_end = _find_run_end(augmenters, i, lambda augmenter: augmenter._is_geometric())
+                if run_end - i >= 2:
+                    keypoints_on_images = _augment_keypoints_by_matrices(augmenters[i:run_end], keypoints_on_images)
+                    i = run_end
+                    continue
+
+                keypoints_on_images = augmenters[i].augment_keypoints(
+                    keypoints_on_images=keypoints_on_images,
+                    parents=parents + [self],
+                    hooks=hooks,
+                    copy=False
+                )
+                i += 1
         return keypoints_on_images
 
+    def _augment_columns(self, columns, random_state, parents):
+        augmenters = self._get_augmenters_in_order(random_state)
+        i = 0
+        while i < len(augmenters):
+            # pointwise augmenters only change images, hence runs of them can
+            # be fused into one lookup table as in _augment_images()
+            run_end = i
+            images = [data for kind, data in columns if kind == "images"]
+            if len(images) == 1 and _is_lut_fusable(images[0], ia.HooksImages()):
+                run_end = _find_run_end(augmenters, i, lambda augmenter: augmenter._is_pointwise())
+            if run_end - i >= 2:
+                columns = [
+                    (kind, _augment_images_by_lut(augmenters[i:run_end], data, parents + [self], ia.HooksImages())
+                     if kind == "images" else data)
+                    for kind, data in columns
+                ]
+                i = run_end
+                continue
+
+            run_end = i
+            if self.fuse_geometric and _is_columns_warp_fusable(columns):
+                run_end = _find_run_end(augmenters, i, lambda augmenter: augmenter._is_geometric())
+            if run_end - i >= 2:
+                columns = _augment_columns_by_matrices(augmenters[i:run_end], columns)
+                i = run_end
+                continue
+
+            columns = augmenters[i]._augment_jointly(columns, parents + [self])
+            i += 1
+        return columns
+
+    def _record_images(self, images, random_state, parents):
+        nb_images = len(images)
+        if self.random_order:
+            augmenter_order = random_state.permutation(len(self))
+        else:
+            augmenter_order = np.arange(len(self))
+
+        records_children = []
+        for augmenter_index in augmenter_order:
+            images, records_child = self[augmenter_index]._augment_images_with_records(images, parents + [self])
+            records_children.append(records_child)
+
+        records = [
+            {
+                "order": [int(augmenter_index) for augmenter_index in augmenter_order],
+                "children": [records_child[i] for records_child in records_children]
+            }
+            for i in sm.xrange(nb_images)
+        ]
+        return images, records
+
+    def _apply_record_to_image(self, image, record):
+        if record is None:
+            return image
+        for augmenter_index, record_child in zip(record["order"], record["children"]):
+            image = self[augmenter_index]._apply_record_to_image(image, record_child)
+        return image
+
+    def _apply_record_to_keypoints(self, keypoints_on_image, record):
+        if record is None:
+            return keypoints_on_image
+        for augmenter_index, record_child in zip(record["order"], record["children"]):
+            keypoints_on_image = self[augmenter_index]._apply_record_to_keypoints(keypoints_on_image, record_child)
+        return keypoints_on_image
+
+    def _get_augmenters_in_order(self, random_state):
+        if self.random_order:
+            return [self[index] for index in random_state.permutation(len(self))]
+        return list(self)
+
     def _to_deterministic(self):
         augs = [aug.to_deterministic() for aug in self]
         seq = self.copy()
@@ -2045,7 +3270,8 @@ class SomeOf(Augmenter, list):
                     images_to_aug = self[augmenter_index].augment_images(
                         images=images_to_aug,
                         parents=parents + [self],
-                        hooks=hooks
+                        hooks=hooks,
+                        copy=False
                     )
                     output_is_array = ia.is_np_array(images_to_aug)
                     output_all_same_shape = len(set([img.shape for img in images_to_aug])) == 1
@@ -2105,7 +3331,8 @@ class SomeOf(Augmenter, list):
                     heatmaps_aug = self[augmenter_index].augment_heatmaps(
                         heatmaps_to_aug,
                         parents=parents + [self],
-                        hooks=hooks
+                        hooks=hooks,
+                        copy=False
                     )
 
                     # Map them back to their position in the images array/list
@@ -2145,7 +3372,8 @@ class SomeOf(Augmenter, list):
                     koi_to_aug = self[augmenter_index].augment_keypoints(
                         keypoints_on_images=koi_to_aug,
                         parents=parents + [self],
-                        hooks=hooks
+                        hooks=hooks,
+                        copy=False
                     )
 
                     # map them back to their position in the images array/list
@@ -2154,6 +3382,61 @@ class SomeOf(Augmenter, list):
 
         return keypoints_on_images
 
+    def _augment_columns(self, columns, random_state, parents):
+        # the order has to be sampled first, see _augment_images()
+        augmenter_order = self._get_augmenter_order(random_state)
+        augmenter_active = self._get_augmenter_active(len(columns[0][1]), random_state)
+
+        for augmenter_index in augmenter_order:
+            active = augmenter_active[:, augmenter_index].nonzero()[0]
+            if len(active) > 0:
+                columns_to_aug = [(kind, _subset_column(data, active)) for kind, data in columns]
+                columns_to_aug = self[augmenter_index]._augment_jointly(columns_to_aug, parents + [self])
+                columns = [(kind, _merge_column(data, active, data_aug))
+                           for (kind, data), (_kind, data_aug) in zip(columns, columns_to_aug)]
+        return columns
+
+    def _record_images(self, images, random_state, parents):
+        nb_images = len(images)
+        # the order has to be sampled first, see _augment_images()
+        augmenter_order = self._get_augmenter_order(random_state)
+        augmenter_active = self._get_augmenter_active(nb_images, random_state)
+
+        records_children = []
+        for augmenter_index in augmenter_order:
+            active = augmenter_active[:, augmenter_index].nonzero()[0]
+            records_child = [None] * nb_images
+            if len(active) > 0:
+                images_to_aug, records_to_aug = self[augmenter_index]._augment_images_with_records(
+                    _subset_column(images, active), parents + [self])
+                images = _merge_column(images, active, images_to_aug)
+                for original_idx, record in zip(active, records_to_aug):
+                    records_child[original_idx] = record
+            records_children.append(records_child)
+
+        records = [
+            {
+                "order": [int(augmenter_index) for augmenter_index in augmenter_order],
+                "children": [records_child[i] for records_child in records_children]
+            }
+            for i in sm.xrange(nb_images)
+        ]
+        return images, records
+
+    def _apply_record_to_image(self, image, record):
+        if record is None:
+            return image
+        for augmenter_index, record_child in zip(record["order"], record["children"]):
+            image = self[augmenter_index]._apply_record_to_image(image, record_child)
+        return image
+
+    def _apply_record_to_keypoints(self, keypoints_on_image, record):
+        if record is None:
+            return keypoints_on_image
+        for augmenter_index, record_child in zip(record["order"], record["children"]):
+            keypoints_on_image = self[augmenter_index]._apply_record_to_keypoints(keypoints_on_image, record_child)
+        return keypoints_on_image
+
     def _to_deterministic(self):
         augs = [aug.to_deterministic() for aug in self]
         seq = self.copy()
@@ -2313,12 +3596,14 @@ class Sometimes(Augmenter):
             result_then_list = self.then_list.augment_images(
                 images=images_then_list,
                 parents=parents + [self],
-                hooks=hooks
+                hooks=hooks,
+                copy=False
             )
             result_else_list = self.else_list.augment_images(
                 images=images_else_list,
                 parents=parents + [self],
-                hooks=hooks
+                hooks=hooks,
+                copy=False
             )
 
             # map results of if/else lists back to their initial positions (in "images" variable)
@@ -2356,12 +3641,14 @@ class Sometimes(Augmenter):
             result_then_list = self.then_list.augment_heatmaps(
                 heatmaps_then_list,
                 parents=parents + [self],
-                hooks=hooks
+                hooks=hooks,
+                copy=False
             )
             result_else_list = self.else_list.augment_heatmaps(
                 heatmaps_else_list,
                 parents=parents + [self],
-                hooks=hooks
+                hooks=hooks,
+                copy=False
             )
 
             # map results of if/else lists back to their initial positions (in "heatmaps" variable)
@@ -2393,12 +3680,14 @@ class Sometimes(Augmenter):
             result_then_list = self.then_list.augment_keypoints(
                 keypoints_on_images=images_then_list,
                 parents=parents + [self],
-                hooks=hooks
+                hooks=hooks,
+                copy=False
             )
             result_else_list = self.else_list.augment_keypoints(
                 keypoints_on_images=images_else_list,
                 parents=parents + [self],
-                hooks=hooks
+                hooks=hooks,
+                copy=False
             )
 
             # map results of if/else lists back to their initial positions (in "images" variable)
@@ -2410,6 +3699,53 @@ class Sometimes(Augmenter):
 
         return result
 
+    def _augment_columns(self, columns, random_state, parents):
+        samples = self.p.draw_samples((len(columns[0][1]),), random_state=random_state)
+        indices_then_list = np.where(samples == 1)[0]
+        indices_else_list = np.where(samples == 0)[0]
+
+        columns_then_list = self.then_list._augment_jointly(
+            [(kind, _subset_column(data, indices_then_list)) for kind, data in columns],
+            parents + [self]
+        )
+        columns_else_list = self.else_list._augment_jointly(
+            [(kind, _subset_column(data, indices_else_list)) for kind, data in columns],
+            parents + [self]
+        )
+
+        result = []
+        for (kind, data), (_, data_then_list), (_, data_else_list) in zip(columns, columns_then_list,
+                                                                          columns_else_list):
+            data = _merge_column(data, indices_then_list, data_then_list)
+            data = _merge_column(data, indices_else_list, data_else_list)
+            result.append((kind, data))
+        return result
+
+    def _record_images(self, images, random_state, parents):
+        nb_images = len(images)
+        samples = self.p.draw_samples((nb_images,), random_state=random_state)
+        records = [None] * nb_images
+        for children, indices in [(self.then_list, np.where(samples == 1)[0]),
+                                  (self.else_list, np.where(samples == 0)[0])]:
+            images_to_aug, records_to_aug = children._augment_images_with_records(
+                _subset_column(images, indices), parents + [self])
+            images = _merge_column(images, indices, images_to_aug)
+            for original_idx, record in zip(indices, records_to_aug):
+                records[original_idx] = {"then": children is self.then_list, "children": record}
+        return images, records
+
+    def _apply_record_to_image(self, image, record):
+        if record is None:
+            return image
+        children = self.then_list if record["then"] else self.else_list
+        return children._apply_record_to_image(image, record["children"])
+
+    def _apply_record_to_keypoints(self, keypoints_on_image, record):
+        if record is None:
+            return keypoints_on_image
+        children = self.then_list if record["then"] else self.else_list
+        return children._apply_record_to_keypoints(keypoints_on_image, record["children"])
+
     def _to_deterministic(self):
         aug = self.copy()
         aug.then_list = aug.then_list.to_deterministic()
@@ -2495,7 +3831,8 @@ class WithChannels(Augmenter):
                 result = self.children.augment_images(
                     images=images,
                     parents=parents + [self],
-                    hooks=hooks
+                    hooks=hooks,
+                    copy=False
                 )
             elif len(self.channels) == 0:
                 pass
@@ -2508,7 +3845,8 @@ class WithChannels(Augmenter):
                 result_then_list = self.children.augment_images(
                     images=images_then_list,
                     parents=parents + [self],
-                    hooks=hooks
+                    hooks=hooks,
+                    copy=False
                 )
 
                 ia.do_assert(
@@ -2545,7 +3883,8 @@ class WithChannels(Augmenter):
                 heatmaps_aug = self.children.augment_heatmaps(
                     heatmaps_to_aug,
                     parents=parents + [self],
-                    hooks=hooks
+                    hooks=hooks,
+                    copy=False
                 )
 
                 for idx_orig, heatmaps_i_aug in zip(indices, heatmaps_aug):
@@ -2564,7 +3903,8 @@ class WithChannels(Augmenter):
                 result = self.children.augment_keypoints(
                     keypoints_on_images,
                     parents=parents + [self],
-                    hooks=hooks
+                    hooks=hooks,
+                    copy=False
                 )
 
         return result
@@ -156,7 +156,8 @@ class Alpha(meta.Augmenter):  # pylint: disable=locally-disabled, unused-variabl
     def _augment_images(self, images, random_state, parents, hooks):
         result = images
         nb_images = len(images)
-        seeds = random_state.randint(0, 10**6, (nb_images,))
+        samples, per_channel_mask = iap.draw_per_channel_samples(
+            self.factor, self.per_channel, [image.shape[2] for image in images], random_state)
 
         if hooks.is_propagating(images, augmenter=self, parents=parents, default=True):
             if self.first is None:
@@ -184,13 +185,10 @@ class Alpha(meta.Augmenter):  # pylint: disable=locally-disabled, unused-variabl
             image = images[i]
             image_first = images_first[i]
             image_second = images_second[i]
-            rs_image = ia.new_random_state(seeds[i])
-            per_channel = self.per_channel.draw_sample(random_state=rs_image)
             input_dtype = image.dtype
-            if per_channel == 1:
+            if per_channel_mask[i]:
                 nb_channels = image.shape[2]
-                samples = self.factor.draw_samples((nb_channels,), random_state=rs_image)
-                for c, sample in enumerate(samples):
+                for c, sample in enumerate(samples[i, 0:nb_channels]):
                     ia.do_assert(0 <= sample <= 1.0)
                     # if the value is nearly 1.0 or 0.0 skip the computation
                     # and just use only the first/second image
@@ -204,7 +202,7 @@ class Alpha(meta.Augmenter):  # pylint: disable=locally-disabled, unused-variabl
                 np.clip(image, 0, 255, out=image)
                 result[i] = image.astype(input_dtype)
             else:
-                sample = self.factor.draw_sample(random_state=rs_image)
+                sample = samples[i, 0]
                 ia.do_assert(0 <= sample <= 1.0)
                 # if the value is nearly 1.0 or 0.0 skip the computation
                 # and just use only the first/second image
@@ -222,7 +220,11 @@ class Alpha(meta.Augmenter):  # pylint: disable=locally-disabled, unused-variabl
     def _augment_heatmaps(self, heatmaps, random_state, parents, hooks):
         result = heatmaps
         nb_heatmaps = len(heatmaps)
-        seeds = random_state.randint(0, 10**6, (nb_heatmaps,))
+        # sample alphas channelwise if necessary and try to use the image's channel number
+        # values properly synchronized with the image augmentation
+        nb_channels = [heatmaps_i.shape[2] if len(heatmaps_i.shape) >= 3 else 1 for heatmaps_i in heatmaps]
+        samples, per_channel_mask = iap.draw_per_channel_samples(self.factor, self.per_channel, nb_channels,
+                                                                 random_state)
 
         if hooks.is_propagating(heatmaps, augmenter=self, parents=parents, default=True):
             if self.first is None:
@@ -249,16 +251,10 @@ class Alpha(meta.Augmenter):  # pylint: disable=locally-disabled, unused-variabl
         for i in sm.xrange(nb_heatmaps):
             heatmaps_first_i = heatmaps_first[i]
             heatmaps_second_i = heatmaps_second[i]
-            rs_image = ia.new_random_state(seeds[i])
-            # sample alphas channelwise if necessary and try to use the image's channel number
-            # values properly synchronized with the image augmentation
-            per_channel = self.per_channel.draw_sample(random_state=rs_image)
-            if per_channel == 1:
-                nb_channels = heatmaps[i].shape[2] if len(heatmaps[i].shape) >= 3 else 1
-                samples = self.factor.draw_samples((nb_channels,), random_state=rs_image)
-                sample = np.average(samples)
+            if per_channel_mask[i]:
+                sample = np.average(samples[i, 0:nb_channels[i]])
             else:
-                sample = self.factor.draw_sample(random_state=rs_image)
+                sample = samples[i, 0]
                 ia.do_assert(0 <= sample <= 1.0)
 
             mask = sample >= 0.5
@@ -271,7 +267,12 @@ class Alpha(meta.Augmenter):  # pylint: disable=locally-disabled, unused-variabl
     def _augment_keypoints(self, keypoints_on_images, random_state, parents, hooks):
         result = keypoints_on_images
         nb_images = len(keypoints_on_images)
-        seeds = random_state.randint(0, 10**6, (nb_images,))
+        # keypoint augmentation also works channel-wise, even though
+        # keypoints do not have channels, in order to keep the random
+        # values properly synchronized with the image augmentation
+        nb_channels = [kps_oi.shape[2] if len(kps_oi.shape) >= 3 else 1 for kps_oi in keypoints_on_images]
+        samples, per_channel_mask = iap.draw_per_channel_samples(self.factor, self.per_channel, nb_channels,
+                                                                 random_state)
 
         if hooks.is_propagating(keypoints_on_images, augmenter=self, parents=parents, default=True):
             if self.first is None:
@@ -298,17 +299,10 @@ class Alpha(meta.Augmenter):  # pylint: disable=locally-disabled, unused-variabl
         for i in sm.xrange(nb_images):
             kps_oi_first = kps_ois_first[i]
             kps_oi_second = kps_ois_second[i]
-            rs_image = ia.new_random_state(seeds[i])
-            # keypoint augmentation also works channel-wise, even though
-            # keypoints do not have channels, in order to keep the random
-            # values properly synchronized with the image augmentation
-            per_channel = self.per_channel.draw_sample(random_state=rs_image)
-            if per_channel == 1:
-                nb_channels = keypoints_on_images[i].shape[2]
-                samples = self.factor.draw_samples((nb_channels,), random_state=rs_image)
-                sample = np.average(samples)
+            if per_channel_mask[i]:
+                sample = np.average(samples[i, 0:nb_channels[i]])
             else:
-                sample = self.factor.draw_sample(random_state=rs_image)
+                sample = samples[i, 0]
                 ia.do_assert(0 <= sample <= 1.0)
 
             # We cant choose "just a bit" of one keypoint augmentation result
@@ -456,6 +450,7 @@ class AlphaElementwise(Alpha):  # pylint: disable=locally-disabled, unused-varia
         result = images
         nb_images = len(images)
         seeds = random_state.randint(0, 10**6, (nb_images,))
+        per_channel_mask = iap.draw_per_channel_mask(self.per_channel, nb_images, random_state)
 
         if hooks.is_propagating(images, augmenter=self, parents=parents, default=True):
             if self.first is None:
@@ -484,9 +479,8 @@ class AlphaElementwise(Alpha):  # pylint: disable=locally-disabled, unused-varia
             h, w, nb_channels = image.shape[0:3]
             image_first = images_first[i]
             image_second = images_second[i]
-            per_channel = self.per_channel.draw_sample(random_state=ia.new_random_state(seeds[i]))
             input_dtype = image.dtype
-            if per_channel == 1:
+            if per_channel_mask[i]:
                 for c in sm.xrange(nb_channels):
                     samples_c = self.factor.draw_samples((h, w), random_state=ia.new_random_state(seeds[i]+1+c))
                     ia.do_assert(0 <= samples_c.item(0) <= 1.0) # validate only first value
@@ -520,6 +514,7 @@ class AlphaElementwise(Alpha):  # pylint: disable=locally-disabled, unused-varia
         result = heatmaps
         nb_heatmaps = len(heatmaps)
         seeds = random_state.randint(0, 10**6, (nb_heatmaps,))
+        per_channel_mask = iap.draw_per_channel_mask(self.per_channel, nb_heatmaps, random_state)
 
         if hooks.is_propagating(heatmaps, augmenter=self, parents=parents, default=True):
             if self.first is None:
@@ -551,8 +546,7 @@ class AlphaElementwise(Alpha):  # pylint: disable=locally-disabled, unused-varia
             nb_channels_heatmaps = heatmaps_i.arr_0to1.shape[2]
             heatmaps_first_i = heatmaps_first[i]
             heatmaps_second_i = heatmaps_second[i]
-            per_channel = self.per_channel.draw_sample(random_state=ia.new_random_state(seeds[i]))
-            if per_channel == 1:
+            if per_channel_mask[i]:
                 samples = []
                 for c in sm.xrange(nb_channels_img):
                     # We sample here at the same size as the original image, as some effects
@@ -578,6 +572,7 @@ class AlphaElementwise(Alpha):  # pylint: disable=locally-disabled, unused-varia
         result = keypoints_on_images
         nb_images = len(keypoints_on_images)
         seeds = random_state.randint(0, 10**6, (nb_images,))
+        per_channel_mask = iap.draw_per_channel_mask(self.per_channel, nb_images, random_state)
 
         if hooks.is_propagating(keypoints_on_images, augmenter=self, parents=parents, default=True):
             if self.first is None:
@@ -617,8 +612,7 @@ class AlphaElementwise(Alpha):  # pylint: disable=locally-disabled, unused-varia
             # keypoint augmentation also works channel-wise, even though
             # keypoints do not have channels, in order to keep the random
             # values properly synchronized with the image augmentation
-            per_channel = self.per_channel.draw_sample(random_state=ia.new_random_state(seeds[i]))
-            if per_channel == 1:
+            if per_channel_mask[i]:
                 samples = np.zeros((h, w, nb_channels), dtype=np.float32)
                 for c in sm.xrange(nb_channels):
                     samples_c = self.factor.draw_samples((h, w), random_state=ia.new_random_state(seeds[i]+1+c))
@@ -643,7 +637,7 @@ class AlphaElementwise(Alpha):  # pylint: disable=locally-disabled, unused-varia
 
 def SimplexNoiseAlpha(first=None, second=None, per_channel=False, size_px_max=(2, 16), upscale_method=None,
                       iterations=(1, 3), aggregation_method="max", sigmoid=True, sigmoid_thresh=None,
-                      name=None, deterministic=False, random_state=None):
+                      texture_bank=None, name=None, deterministic=False, random_state=None):
     """
     Augmenter to overlay two image sources with each other using alpha values
     that follow noisy patterns.
@@ -759,6 +753,16 @@ def SimplexNoiseAlpha(first=None, second=None, per_channel=False, size_px_max=(2
             * If StochasticParameter, then a random value will be sampled from
               that parameter per image.
 
+    texture_bank : None or bool or imgaug.parameters.NoiseTextureBank, optional
+        Bank of cached low resolution noise planes to draw the masks from.
+        This is faster than generating a new plane per image, but results in
+        masks that are only statistically equivalent to freshly generated
+        ones. See :class:`imgaug.parameters.NoiseTextureBank`.
+
+            * If None or False, then a new noise plane is generated per image.
+            * If True, then a new bank with default settings will be used.
+            * If a NoiseTextureBank, then that bank will be used.
+
     name : None or str, optional
         See :func:`imgaug.augmenters.meta.Augmenter.__init__`.
 
@@ -797,7 +801,8 @@ def SimplexNoiseAlpha(first=None, second=None, per_channel=False, size_px_max=(2
 
     noise = iap.SimplexNoise(
         size_px_max=size_px_max,
-        upscale_method=upscale_method if upscale_method is not None else upscale_method_default
+        upscale_method=upscale_method if upscale_method is not None else upscale_method_default,
+        texture_bank=texture_bank
     )
 
     if iterations != 1:
@@ -826,7 +831,7 @@ def SimplexNoiseAlpha(first=None, second=None, per_channel=False, size_px_max=(2
 def FrequencyNoiseAlpha(exponent=(-4, 4), first=None, second=None, per_channel=False,
                         size_px_max=(4, 16), upscale_method=None,
                         iterations=(1, 3), aggregation_method=["avg", "max"],  # pylint: disable=locally-disabled, dangerous-default-value, line-too-long
-                        sigmoid=0.5, sigmoid_thresh=None,
+                        sigmoid=0.5, sigmoid_thresh=None, texture_bank=None,
                         name=None, deterministic=False, random_state=None):
     """
     Augmenter to overlay two image sources with each other using alpha values
@@ -959,6 +964,16 @@ def FrequencyNoiseAlpha(exponent=(-4, 4), first=None, second=None, per_channel=F
             * If StochasticParameter, then a random value will be sampled from
               that parameter per image.
 
+    texture_bank : None or bool or imgaug.parameters.NoiseTextureBank, optional
+        Bank of cached low resolution noise planes to draw the masks from.
+        This is faster than generating a new plane per image, but results in
+        masks that are only statistically equivalent to freshly generated
+        ones. See :class:`imgaug.parameters.NoiseTextureBank`.
+
+            * If None or False, then a new noise plane is generated per image.
+            * If True, then a new bank with default settings will be used.
+            * If a NoiseTextureBank, then that bank will be used.
+
     name : None or str, optional
         See :func:`imgaug.augmenters.meta.Augmenter.__init__`.
 
@@ -1005,7 +1020,8 @@ def FrequencyNoiseAlpha(exponent=(-4, 4), first=None, second=None, per_channel=F
     noise = iap.FrequencyNoise(
         exponent=exponent,
         size_px_max=size_px_max,
-        upscale_method=upscale_method if upscale_method is not None else upscale_method_default
+        upscale_method=upscale_method if upscale_method is not None else upscale_method_default,
+        texture_bank=texture_bank
     )
 
     if iterations != 1:
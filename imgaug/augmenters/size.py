@@ -26,6 +26,7 @@ List of augmenters:
 from __future__ import print_function, division, absolute_import
 
 import numpy as np
+import cv2
 import six.moves as sm
 
 from . import meta
@@ -385,6 +386,38 @@ class Scale(meta.Augmenter):
     def get_parameters(self):
         return [self.size, self.interpolation]
 
+    def _is_geometric(self):
+        return True
+
+    def _draw_geometric_matrices(self, shapes, random_state):
+        # warps do not support area interpolation, which is usually used for
+        # downscaling, hence linear interpolation is used instead
+        warp_flags = {
+            "nearest": cv2.INTER_NEAREST,
+            "linear": cv2.INTER_LINEAR,
+            "area": cv2.INTER_LINEAR,
+            "cubic": cv2.INTER_CUBIC,
+            cv2.INTER_NEAREST: cv2.INTER_NEAREST,
+            cv2.INTER_LINEAR: cv2.INTER_LINEAR,
+            cv2.INTER_AREA: cv2.INTER_LINEAR,
+            cv2.INTER_CUBIC: cv2.INTER_CUBIC
+        }
+
+        nb_images = len(shapes)
+        samples_h, samples_w, samples_ip = self._draw_samples(nb_images, random_state, do_sample_ip=True)
+        matrices = []
+        output_shapes = []
+        orders = []
+        keypoint_matrices = []
+        for i, shape in enumerate(shapes):
+            h, w = self._compute_height_width(shape, samples_h[i], samples_w[i])
+            output_shape = (h, w) + tuple(shape[2:])
+            matrices.append(meta._compute_resize_matrix(shape, output_shape))
+            keypoint_matrices.append(meta._compute_keypoint_resize_matrix(shape, output_shape))
+            output_shapes.append(output_shape)
+            orders.append(warp_flags.get(samples_ip[i], cv2.INTER_CUBIC))
+        return matrices, output_shapes, orders, [None] * nb_images, keypoint_matrices
+
 
 class CropAndPad(meta.Augmenter):
     """
@@ -859,6 +892,48 @@ class CropAndPad(meta.Augmenter):
     def get_parameters(self):
         return [self.all_sides, self.top, self.right, self.bottom, self.left, self.pad_mode, self.pad_cval]
 
+    def _is_geometric(self):
+        return isinstance(self.pad_mode, iap.Deterministic) and self.pad_mode.value == "constant"
+
+    def _draw_geometric_matrices(self, shapes, random_state):
+        nb_images = len(shapes)
+        seeds = random_state.randint(0, 10**6, (nb_images,))
+        matrices = []
+        output_shapes = []
+        orders = []
+        cvals = []
+        keypoint_matrices = []
+        for shape, seed in zip(shapes, seeds):
+            height, width = shape[0:2]
+            crop_top, crop_right, crop_bottom, crop_left, \
+                pad_top, pad_right, pad_bottom, pad_left, _pad_mode, \
+                pad_cval = self._draw_samples_image(seed, height, width)
+
+            matrix = np.float64([
+                [1, 0, pad_left - crop_left],
+                [0, 1, pad_top - crop_top],
+                [0, 0, 1]
+            ])
+            output_shape = (
+                height - crop_top - crop_bottom + pad_top + pad_bottom,
+                width - crop_left - crop_right + pad_left + pad_right
+            ) + tuple(shape[2:])
+
+            keypoint_matrix = matrix
+            if self.keep_size and output_shape[0:2] != tuple(shape[0:2]):
+                matrix = np.dot(meta._compute_resize_matrix(output_shape, shape), matrix)
+                keypoint_matrix = np.dot(meta._compute_keypoint_resize_matrix(output_shape, shape), keypoint_matrix)
+                output_shape = tuple(shape)
+                orders.append(cv2.INTER_LINEAR)
+            else:
+                orders.append(None)
+            matrices.append(matrix)
+            keypoint_matrices.append(keypoint_matrix)
+            output_shapes.append(output_shape)
+            is_padded = any([pad_top > 0, pad_right > 0, pad_bottom > 0, pad_left > 0])
+            cvals.append(int(pad_cval) if is_padded else None)
+        return matrices, output_shapes, orders, cvals, keypoint_matrices
+
 
 def Pad(px=None, percent=None, pad_mode="constant", pad_cval=0, keep_size=True, sample_independently=True,
         name=None, deterministic=False, random_state=None):
@@ -1,14 +1,24 @@
 """
 This is a copy of the OpenSimplex library,
 based on commit d861cb290531ad15825f21dc4cc35c5d4f407259 from 20.07.2017.
+
+Changes compared to the original library:
+
+    * The permutation arrays are cached per seed.
+    * Added ``OpenSimplex.noise2d_array()``, a numpy-vectorized version of
+      ``OpenSimplex.noise2d()``.
+
 """
 
 # Based on: https://gist.github.com/KdotJPG/b1270127455a94ac5d19
 
 import sys
+from collections import OrderedDict
 from ctypes import c_long
 from math import floor as _floor
 
+import numpy as np
+
 
 if sys.version_info[0] < 3:
     def floor(num):
@@ -30,6 +40,10 @@ NORM_CONSTANT_4D = 30
 
 DEFAULT_SEED = 0
 
+# Maximum number of seeds for which the permutation arrays are cached.
+PERMUTATION_CACHE_SIZE = 1024
+_PERMUTATION_CACHE = OrderedDict()
+
 
 # Gradients for 2D. They approximate the directions to the
 # vertices of an octagon from the center.
@@ -40,6 +54,8 @@ GRADIENTS_2D = (
     -5, -2,   -2, -5,
 )
 
+_GRADIENTS_2D_ARRAY = np.array(GRADIENTS_2D, dtype=np.int64)
+
 # Gradients for 3D. They approximate the directions to the
 # vertices of a rhombicuboctahedron from the center, skewed so
 # that the triangular and square facets can be inscribed inside
@@ -85,6 +101,41 @@ def overflow(x):
     return c_long(x).value
 
 
+def _generate_permutations(seed):
+    # Initializes the class using a permutation array generated from a 64-bit seed.
+    # Generates a proper permutation (i.e. doesn't merely perform N
+    # successive pair swaps on a base array)
+    perm = [0] * 256 # Have to zero fill so we can properly loop over it later
+    perm_grad_index_3D = [0] * 256
+    source = [i for i in range(0, 256)]
+    seed = overflow(seed * 6364136223846793005 + 1442695040888963407)
+    seed = overflow(seed * 6364136223846793005 + 1442695040888963407)
+    seed = overflow(seed * 6364136223846793005 + 1442695040888963407)
+    for i in range(255, -1, -1):
+        seed = overflow(seed * 6364136223846793005 + 1442695040888963407)
+        r = int((seed + 31) % (i + 1))
+        if r < 0:
+            r += i + 1
+        perm[i] = source[r]
+        perm_grad_index_3D[i] = int((perm[i] % (len(GRADIENTS_3D) / 3)) * 3)
+        source[r] = source[i]
+    return perm, perm_grad_index_3D
+
+
+def _get_permutations(seed):
+    # The permutation arrays are only read after their generation, hence
+    # they can be shared between all generators with the same seed.
+    permutations = _PERMUTATION_CACHE.pop(seed, None)
+    if permutations is None:
+        perm, perm_grad_index_3D = _generate_permutations(seed)
+        permutations = (perm, perm_grad_index_3D, np.array(perm, dtype=np.int64))
+        while len(_PERMUTATION_CACHE) >= PERMUTATION_CACHE_SIZE:
+            _PERMUTATION_CACHE.popitem(last=False)
+    # (re-)insert as the most recently used entry
+    _PERMUTATION_CACHE[seed] = permutations
+    return permutations
+
+
 class OpenSimplex(object):
     """
     OpenSimplex n-dimensional gradient noise functions.
@@ -94,23 +145,7 @@ class OpenSimplex(object):
         """
         Initiate the class and generate permutation arrays from a seed number.
         """
-        # Initializes the class using a permutation array generated from a 64-bit seed.
-        # Generates a proper permutation (i.e. doesn't merely perform N
-        # successive pair swaps on a base array)
-        perm = self._perm = [0] * 256 # Have to zero fill so we can properly loop over it later
-        perm_grad_index_3D = self._perm_grad_index_3D = [0] * 256
-        source = [i for i in range(0, 256)]
-        seed = overflow(seed * 6364136223846793005 + 1442695040888963407)
-        seed = overflow(seed * 6364136223846793005 + 1442695040888963407)
-        seed = overflow(seed * 6364136223846793005 + 1442695040888963407)
-        for i in range(255, -1, -1):
-            seed = overflow(seed * 6364136223846793005 + 1442695040888963407)
-            r = int((seed + 31) % (i + 1))
-            if r < 0:
-                r += i + 1
-            perm[i] = source[r]
-            perm_grad_index_3D[i] = int((perm[i] % (len(GRADIENTS_3D) / 3)) * 3)
-            source[r] = source[i]
+        self._perm, self._perm_grad_index_3D, self._perm_array = _get_permutations(seed)
 
     def _extrapolate2d(self, xsb, ysb, dx, dy):
         perm = self._perm
@@ -243,6 +278,97 @@ class OpenSimplex(object):
 
         return value / NORM_CONSTANT_2D
 
+    def _extrapolate2d_array(self, xsb, ysb, dx, dy):
+        perm = self._perm_array
+        index = perm[(perm[xsb & 0xFF] + ysb) & 0xFF] & 0x0E
+        return _GRADIENTS_2D_ARRAY[index] * dx + _GRADIENTS_2D_ARRAY[index + 1] * dy
+
+    def _contribution2d_array(self, xsb, ysb, dx, dy):
+        attn = 2 - dx * dx - dy * dy
+        mask = attn > 0
+        attn *= attn
+        return np.where(mask, attn * attn * self._extrapolate2d_array(xsb, ysb, dx, dy), 0)
+
+    def noise2d_array(self, xs, ys):
+        """
+        Generate 2D OpenSimplex noise for arrays of X,Y coordinates.
+
+        This is a vectorized version of noise2d(), i.e. ``noise2d_array(xs, ys)[i]``
+        is identical to ``noise2d(xs[i], ys[i])``. The coordinate arrays are
+        broadcasted against each other.
+        """
+        x, y = np.broadcast_arrays(np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64))
+
+        # Place input coordinates onto grid.
+        stretch_offset = (x + y) * STRETCH_CONSTANT_2D
+        xs = x + stretch_offset
+        ys = y + stretch_offset
+
+        # Floor to get grid coordinates of rhombus (stretched square) super-cell origin.
+        xsb = np.floor(xs).astype(np.int64)
+        ysb = np.floor(ys).astype(np.int64)
+
+        # Skew out to get actual coordinates of rhombus origin. We'll need these later.
+        squish_offset = (xsb + ysb) * SQUISH_CONSTANT_2D
+        xb = xsb + squish_offset
+        yb = ysb + squish_offset
+
+        # Compute grid coordinates relative to rhombus origin.
+        xins = xs - xsb
+        yins = ys - ysb
+
+        # Sum those together to get a value that determines which region we're in.
+        in_sum = xins + yins
+
+        # Positions relative to origin point.
+        dx0 = x - xb
+        dy0 = y - yb
+
+        value = np.zeros(x.shape, dtype=np.float64)
+
+        # Contribution (1,0)
+        dx1 = dx0 - 1 - SQUISH_CONSTANT_2D
+        dy1 = dy0 - 0 - SQUISH_CONSTANT_2D
+        value += self._contribution2d_array(xsb + 1, ysb + 0, dx1, dy1)
+
+        # Contribution (0,1)
+        dx2 = dx0 - 0 - SQUISH_CONSTANT_2D
+        dy2 = dy0 - 1 - SQUISH_CONSTANT_2D
+        value += self._contribution2d_array(xsb + 0, ysb + 1, dx2, dy2)
+
+        # Select the extra vertex for each of the six cases of noise2d()
+        inside = in_sum <= 1 # We're inside the triangle (2-Simplex) at (0,0)
+        zins = np.where(inside, 1 - in_sum, 2 - in_sum)
+        closest_00 = np.where(inside, (zins > xins) | (zins > yins), (zins < xins) | (zins < yins))
+        x_gt_y = xins > yins
+        cases = [
+            inside & closest_00 & x_gt_y,
+            inside & closest_00 & ~x_gt_y,
+            inside & ~closest_00,
+            ~inside & closest_00 & x_gt_y,
+            ~inside & closest_00 & ~x_gt_y,
+            ~inside & ~closest_00
+        ]
+        xsv_ext = np.select(cases, [xsb + 1, xsb - 1, xsb + 1, xsb + 2, xsb + 0, xsb])
+        ysv_ext = np.select(cases, [ysb - 1, ysb + 1, ysb + 1, ysb + 0, ysb + 2, ysb])
+        dx_ext = np.select(cases, [dx0 - 1, dx0 + 1, dx0 - 1 - 2 * SQUISH_CONSTANT_2D,
+                                   dx0 - 2 - 2 * SQUISH_CONSTANT_2D, dx0 + 0 - 2 * SQUISH_CONSTANT_2D, dx0])
+        dy_ext = np.select(cases, [dy0 + 1, dy0 - 1, dy0 - 1 - 2 * SQUISH_CONSTANT_2D,
+                                   dy0 + 0 - 2 * SQUISH_CONSTANT_2D, dy0 - 2 - 2 * SQUISH_CONSTANT_2D, dy0])
+
+        # We're inside the triangle (2-Simplex) at (1,1)
+        xsb = np.where(inside, xsb, xsb + 1)
+        ysb = np.where(inside, ysb, ysb + 1)
+        dx0 = np.where(inside, dx0, dx0 - 1 - 2 * SQUISH_CONSTANT_2D)
+        dy0 = np.where(inside, dy0, dy0 - 1 - 2 * SQUISH_CONSTANT_2D)
+
+        # Contribution (0,0) or (1,1)
+        value += self._contribution2d_array(xsb, ysb, dx0, dy0)
+
+        # Extra Vertex
+        value += self._contribution2d_array(xsv_ext, ysv_ext, dx_ext, dy_ext)
+
+        return value / NORM_CONSTANT_2D
 
     def noise3d(self, x, y, z):
         """
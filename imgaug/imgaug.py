@@ -34,6 +34,12 @@ elif sys.version_info[0] == 3:
     from queue import Empty as QueueEmpty, Full as QueueFull
     xrange = range
 
+try:
+    # only available in python 3.8+
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
 ALL = "ALL"
 
 FILE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -54,6 +60,15 @@ DEFAULT_FONT_FP = os.path.join(
 # here (and in all augmenters) instead of np.random.
 CURRENT_RANDOM_STATE = np.random.RandomState(42)
 
+# Bit generator used by all random states created via new_random_state() and
+# derive_random_states(). See set_rng_backend().
+RNG_BACKEND_MT19937 = "mt19937"
+RNG_BACKEND_PHILOX = "philox"
+RNG_BACKEND = RNG_BACKEND_MT19937
+
+# Upper bound (exclusive) of the keys sampled for Philox based random states.
+PHILOX_KEY_MAX_VALUE = 2**63 - 1
+
 
 NP_FLOAT_TYPES = set(np.sctypes["float"])
 NP_INT_TYPES = set(np.sctypes["int"])
@@ -294,6 +309,71 @@ def current_random_state():
     return CURRENT_RANDOM_STATE
 
 
+def set_rng_backend(backend):
+    """
+    Set the bit generator used for all newly created random states.
+
+    The default backend ``mt19937`` creates random states based on numpy's
+    Mersenne Twister, exactly as in previous versions of the library, i.e.
+    seeds stay reproducible. Creating such a random state is comparatively
+    expensive, as the 624 words of its internal state have to be initialized.
+
+    The backend ``philox`` instead creates ``numpy.random.RandomState``
+    objects on top of the counter-based ``numpy.random.Philox`` bit generator.
+    Its state consists only of a key and a counter, hence creating a new
+    random state from a seed or deriving child random states is much faster.
+    Child random states are derived by using the child index as the upper
+    word of a 128 bit key, so they do not collide with each other.
+    The sampled values differ from the ones of the ``mt19937`` backend.
+    This backend requires numpy 1.17 or later.
+
+    Note that the global random state (see :func:`imgaug.current_random_state`)
+    is not affected by this function.
+
+    Parameters
+    ----------
+    backend : {'mt19937', 'philox'}
+        The backend to use.
+
+    """
+    global RNG_BACKEND
+    do_assert(backend in [RNG_BACKEND_MT19937, RNG_BACKEND_PHILOX],
+              "Expected backend to be '%s' or '%s', got '%s'." % (RNG_BACKEND_MT19937, RNG_BACKEND_PHILOX, backend))
+    if backend == RNG_BACKEND_PHILOX:
+        do_assert(hasattr(np.random, "Philox"), "The philox backend requires numpy 1.17 or later.")
+    RNG_BACKEND = backend
+
+
+def get_rng_backend():
+    """
+    Returns the name of the bit generator used for newly created random states.
+
+    Returns
+    -------
+    str
+        See :func:`imgaug.set_rng_backend`.
+
+    """
+    return RNG_BACKEND
+
+
+def _new_philox_random_state(seed):
+    if seed is None:
+        # numpy samples the key from OS entropy via SeedSequence
+        return np.random.RandomState(np.random.Philox())
+    elif is_single_integer(seed):
+        # use integer seeds directly as the key, which skips the hashing of
+        # SeedSequence
+        return np.random.RandomState(np.random.Philox(key=int(seed)))
+    return np.random.RandomState(np.random.Philox(np.random.SeedSequence(seed)))
+
+
+def _is_mt19937_random_state(random_state):
+    # random states of numpy<1.17 have no bit generator and are always MT19937
+    bit_generator = getattr(random_state, "_bit_generator", None)
+    return bit_generator is None or isinstance(bit_generator, np.random.MT19937)
+
+
 def new_random_state(seed=None, fully_random=False):
     """
     Returns a new random state.
@@ -312,9 +392,15 @@ def new_random_state(seed=None, fully_random=False):
     Returns
     -------
     numpy.random.RandomState
-        The new random state.
+        The new random state. Its bit generator depends on the backend set
+        via :func:`imgaug.set_rng_backend`.
 
     """
+    if RNG_BACKEND == RNG_BACKEND_PHILOX:
+        if seed is None and not fully_random:
+            seed = CURRENT_RANDOM_STATE.randint(0, PHILOX_KEY_MAX_VALUE, dtype=np.int64)
+        return _new_philox_random_state(seed)
+
     if seed is None:
         if not fully_random:
             # sample manually a seed instead of just RandomState(),
@@ -359,11 +445,72 @@ def copy_random_state(random_state, force_copy=False):
     """
     if random_state == np.random and not force_copy:
         return random_state
-    else:
+    elif _is_mt19937_random_state(random_state):
         rs_copy = dummy_random_state()
         orig_state = random_state.get_state()
         rs_copy.set_state(orig_state)
         return rs_copy
+    else:
+        rs_copy = np.random.RandomState(random_state._bit_generator.__class__())
+        rs_copy.set_state(random_state.get_state(legacy=False))
+        return rs_copy
+
+
+def copy_random_state_to(random_state, target):
+    """
+    Copies the internal state of a random state into another random state.
+
+    This is equivalent to ``copy_random_state(random_state, force_copy=True)``,
+    but reuses an existing random state as the target instead of creating a
+    new one. That avoids the costly initialization of a new MT19937 state and
+    allows to reuse a buffer random state for many copies.
+
+    Parameters
+    ----------
+    random_state : numpy.random.RandomState
+        The random state to copy.
+
+    target : None or numpy.random.RandomState
+        The random state into which to copy the state. A new random state is
+        created instead if this is None or has a different bit generator
+        than `random_state` (see :func:`imgaug.set_rng_backend`).
+
+    Returns
+    -------
+    numpy.random.RandomState
+        `target` or a new random state, containing the copied state.
+
+    """
+    # random states of numpy<1.17 have no bit generator, for these the
+    # classes are both NoneType
+    bit_generator_class = getattr(random_state, "_bit_generator", None).__class__
+    if target is None or getattr(target, "_bit_generator", None).__class__ is not bit_generator_class:
+        return copy_random_state(random_state, force_copy=True)
+    target.set_state(get_random_state_state(random_state))
+    return target
+
+
+def get_random_state_state(random_state):
+    """
+    Returns the internal state of a random state.
+
+    In contrast to ``random_state.get_state()``, this works without warnings
+    for random states of all backends (see :func:`imgaug.set_rng_backend`).
+
+    Parameters
+    ----------
+    random_state : numpy.random.RandomState
+        The random state.
+
+    Returns
+    -------
+    tuple or dict
+        The internal state. May be restored via ``random_state.set_state()``.
+
+    """
+    if _is_mt19937_random_state(random_state):
+        return random_state.get_state()
+    return random_state.get_state(legacy=False)
 
 
 def derive_random_state(random_state):
@@ -403,6 +550,12 @@ def derive_random_states(random_state, n=1):
         Derived random states.
 
     """
+    if RNG_BACKEND == RNG_BACKEND_PHILOX:
+        # Philox keys have 128 bits, the child index is used as the upper
+        # 64 bits, so that children of different parents never share keys
+        # unless the parents sampled the same lower 64 bits
+        key = int(random_state.randint(0, PHILOX_KEY_MAX_VALUE, dtype=np.int64))
+        return [_new_philox_random_state(key + (i << 64)) for i in sm.xrange(n)]
     seed_ = random_state.randint(0, 10**6, 1)[0]
     return [new_random_state(seed_+i) for i in sm.xrange(n)]
 
@@ -5432,6 +5585,214 @@ class Batch(object):
         return batch
 
 
+class SharedMemoryTransport(object):
+    """
+    Transport for batches between processes via a ring of shared memory slots.
+
+    Without this class, batches are pickled as a whole and sent through a
+    ``multiprocessing.Queue``, which copies the image data several times.
+    This class instead allocates one shared memory block that is split into
+    ``nb_slots`` slots of ``slot_size`` bytes each. The sender writes the images
+    of a batch (``images`` and ``images_aug``) into a free slot and only the
+    remaining (small) data is pickled. The receiver reads the images directly
+    from the slot.
+
+    A slot stays occupied until it is released via
+    :func:`imgaug.SharedMemoryTransport.release`, which happens automatically
+    in :func:`imgaug.SharedMemoryTransport.decode` if ``copy=True``.
+    If shared memory is not available (python <3.8), no slot is free or the
+    images of a batch do not fit into a slot, the batch is pickled as a whole.
+    The encoded messages can therefore always be decoded.
+
+    Parameters
+    ----------
+    nb_slots : int
+        Number of slots, i.e. maximum number of batches that may be stored
+        in shared memory at the same time.
+
+    slot_size : None or int
+        Size of each slot in bytes. It should be large enough to contain all
+        images of a batch (including the augmented ones). If None, shared memory
+        is not used and all batches are pickled.
+
+    """
+
+    # offsets of arrays within slots are aligned to this number of bytes
+    ALIGNMENT = 64
+
+    def __init__(self, nb_slots, slot_size):
+        do_assert(nb_slots >= 1)
+        do_assert(slot_size is None or slot_size > 0)
+        self.nb_slots = nb_slots
+        self.slot_size = slot_size
+        self.free_slots = multiprocessing.Queue()
+        self.memory = None
+        if shared_memory is not None and slot_size is not None:
+            self.memory = shared_memory.SharedMemory(create=True, size=nb_slots * slot_size)
+            for slot in sm.xrange(nb_slots):
+                self.free_slots.put(slot)
+
+    @property
+    def available(self):
+        """
+        Get whether batches are sent via shared memory.
+
+        Returns
+        -------
+        bool
+            True if shared memory is used, otherwise False.
+
+        """
+        return self.memory is not None
+
+    def encode(self, batch):
+        """
+        Encode a batch to a message that can be sent through a queue.
+
+        Parameters
+        ----------
+        batch : None or imgaug.Batch
+            The batch to encode.
+
+        Returns
+        -------
+        bytes
+            The encoded batch.
+
+        """
+        if batch is None or self.memory is None:
+            return pickle.dumps(batch, protocol=-1)
+
+        arrays = self._get_arrays(batch)
+        nb_bytes = sum([self._align(arr.nbytes) for _, _, arr in arrays])
+        if len(arrays) == 0 or nb_bytes > self.slot_size:
+            return pickle.dumps(batch, protocol=-1)
+
+        try:
+            # released slots take a moment to show up in the queue, hence
+            # this waits shortly instead of failing immediately
+            slot = self.free_slots.get(timeout=0.1)
+        except QueueEmpty:
+            # all slots are occupied, e.g. because the receiver did not yet
+            # release them, fall back to sending the whole batch
+            return pickle.dumps(batch, protocol=-1)
+
+        # only the attributes holding images are replaced, hence a shallow
+        # copy suffices to not change the input batch
+        batch_meta = copy.copy(batch)
+        for attr_name in ["images", "images_aug"]:
+            if getattr(batch, attr_name) is not None and not is_np_array(getattr(batch, attr_name)):
+                setattr(batch_meta, attr_name, list(getattr(batch, attr_name)))
+
+        descriptors = []
+        offset = slot * self.slot_size
+        for attr_name, idx, arr in arrays:
+            arr_shared = np.ndarray(arr.shape, dtype=arr.dtype, buffer=self.memory.buf, offset=offset)
+            arr_shared[...] = arr
+            descriptors.append((attr_name, idx, arr.shape, arr.dtype.str, offset))
+            offset += self._align(arr.nbytes)
+            if idx is None:
+                setattr(batch_meta, attr_name, None)
+            else:
+                getattr(batch_meta, attr_name)[idx] = None
+        return pickle.dumps(("shared_memory", slot, batch_meta, descriptors), protocol=-1)
+
+    def decode(self, message, copy=True):
+        """
+        Decode a message created by :func:`imgaug.SharedMemoryTransport.encode`.
+
+        Parameters
+        ----------
+        message : bytes
+            The encoded batch.
+
+        copy : bool, optional
+            Whether to copy the images out of shared memory and release the
+            slot immediately. If False, the images of the returned batch are
+            views on the shared memory and the batch has to be released via
+            :func:`imgaug.SharedMemoryTransport.release` once it is not used
+            anymore. The images must not be accessed after the release.
+
+        Returns
+        -------
+        None or imgaug.Batch
+            The decoded batch.
+
+        """
+        obj = pickle.loads(message)
+        if not isinstance(obj, tuple):
+            return obj
+
+        _, slot, batch, descriptors = obj
+        for attr_name, idx, shape, dtype_str, offset in descriptors:
+            arr = np.ndarray(shape, dtype=np.dtype(dtype_str), buffer=self.memory.buf, offset=offset)
+            if copy:
+                arr = np.copy(arr)
+            if idx is None:
+                setattr(batch, attr_name, arr)
+            else:
+                getattr(batch, attr_name)[idx] = arr
+
+        if copy:
+            self.free_slots.put(slot)
+        else:
+            batch.shared_memory_slot = slot
+        return batch
+
+    def release(self, batch):
+        """
+        Release the shared memory slot of a batch decoded with ``copy=False``.
+
+        Calling this function multiple times for the same batch or for batches
+        that do not use a slot has no effect.
+
+        Parameters
+        ----------
+        batch : imgaug.Batch
+            The batch to release.
+
+        """
+        slot = getattr(batch, "shared_memory_slot", None)
+        if slot is not None:
+            batch.shared_memory_slot = None
+            self.free_slots.put(slot)
+
+    def close(self):
+        """
+        Free the shared memory.
+
+        This must only be called by the process that created this object and
+        only after all batches using shared memory were released.
+
+        """
+        if self.memory is not None:
+            memory = self.memory
+            self.memory = None
+            try:
+                memory.close()
+            except BufferError:
+                # some decoded batches still use the memory, it is unmapped
+                # once they are garbage collected
+                pass
+            memory.unlink()
+        self.free_slots.close()
+
+    @classmethod
+    def _get_arrays(cls, batch):
+        arrays = []
+        for attr_name in ["images", "images_aug"]:
+            value = getattr(batch, attr_name)
+            if is_np_array(value):
+                arrays.append((attr_name, None, value))
+            elif value is not None:
+                arrays.extend([(attr_name, idx, arr) for idx, arr in enumerate(value) if is_np_array(arr)])
+        return arrays
+
+    @classmethod
+    def _align(cls, nb_bytes):
+        return int(np.ceil(nb_bytes / cls.ALIGNMENT)) * cls.ALIGNMENT
+
+
 class BatchLoader(object):
     """
     Class to load batches in the background.
@@ -5455,12 +5816,20 @@ class BatchLoader(object):
         Whether to run the background processes using threads (true) or
         full processes (false).
 
+    shared_memory_slot_size : None or int, optional
+        If set, the images of loaded batches are sent via shared memory slots
+        of this size (in bytes) instead of being pickled.
+        See :class:`imgaug.SharedMemoryTransport`. The messages in ``queue``
+        must then be decoded via ``transport.decode()``.
+
     """
 
-    def __init__(self, load_batch_func, queue_size=50, nb_workers=1, threaded=True):
+    def __init__(self, load_batch_func, queue_size=50, nb_workers=1, threaded=True, shared_memory_slot_size=None):
         do_assert(queue_size > 0)
         do_assert(nb_workers >= 1)
         self.queue = multiprocessing.Queue(queue_size)
+        # each worker may occupy one slot while waiting for the queue
+        self.transport = SharedMemoryTransport(queue_size + nb_workers, shared_memory_slot_size)
         self.join_signal = multiprocessing.Event()
         self.finished_signals = []
         self.workers = []
@@ -5472,12 +5841,12 @@ class BatchLoader(object):
             if threaded:
                 worker = threading.Thread(
                     target=self._load_batches,
-                    args=(load_batch_func, self.queue, finished_signal, self.join_signal, None)
+                    args=(load_batch_func, self.queue, finished_signal, self.join_signal, None, self.transport)
                 )
             else:
                 worker = multiprocessing.Process(
                     target=self._load_batches,
-                    args=(load_batch_func, self.queue, finished_signal, self.join_signal, seeds[i])
+                    args=(load_batch_func, self.queue, finished_signal, self.join_signal, seeds[i], self.transport)
                 )
             worker.daemon = True
             worker.start()
@@ -5497,7 +5866,7 @@ class BatchLoader(object):
         # signal.is_set() would overlap
         return all([not worker.is_alive() for worker in self.workers])
 
-    def _load_batches(self, load_batch_func, queue, finished_signal, join_signal, seedval):
+    def _load_batches(self, load_batch_func, queue, finished_signal, join_signal, seedval, transport):
         if seedval is not None:
             random.seed(seedval)
             np.random.seed(seedval)
@@ -5508,7 +5877,7 @@ class BatchLoader(object):
                 do_assert(isinstance(batch, Batch),
                           "Expected batch returned by lambda function to be of class imgaug.Batch, got %s." % (
                               type(batch),))
-                batch_pickled = pickle.dumps(batch, protocol=-1)
+                batch_pickled = transport.encode(batch)
                 while not join_signal.is_set():
                     try:
                         queue.put(batch_pickled, timeout=0.001)
@@ -5534,7 +5903,7 @@ class BatchLoader(object):
         # clean the queue, this reportedly prevents hanging threads
         while True:
             try:
-                self.queue.get(timeout=0.005)
+                self.transport.decode(self.queue.get(timeout=0.005))
             except QueueEmpty:
                 break
 
@@ -5566,6 +5935,7 @@ class BatchLoader(object):
                     finished_signal.set()
 
         self.queue.close()
+        self.transport.close()
 
 
 class BackgroundAugmenter(object):
@@ -5595,12 +5965,19 @@ class BackgroundAugmenter(object):
         Number of background workers to spawn.
         If ``auto``, it will be set to ``C-1``, where ``C`` is the number of CPU cores.
 
+    shared_memory_slot_size : None or int, optional
+        If set, the images of augmented batches are sent via shared memory
+        slots of this size (in bytes) instead of being pickled. Note that each
+        augmented batch contains both the input and the augmented images.
+        See :class:`imgaug.SharedMemoryTransport`.
+
     """
-    def __init__(self, batch_loader, augseq, queue_size=50, nb_workers="auto"):
+    def __init__(self, batch_loader, augseq, queue_size=50, nb_workers="auto", shared_memory_slot_size=None):
         do_assert(queue_size > 0)
         self.augseq = augseq
         self.source_finished_signals = batch_loader.finished_signals
         self.queue_source = batch_loader.queue
+        self.transport_source = batch_loader.transport
         self.queue_result = multiprocessing.Queue(queue_size)
 
         if nb_workers == "auto":
@@ -5616,6 +5993,8 @@ class BackgroundAugmenter(object):
         self.nb_workers = nb_workers
         self.workers = []
         self.nb_workers_finished = 0
+        # each worker may occupy one slot while waiting for the queue
+        self.transport = SharedMemoryTransport(queue_size + nb_workers, shared_memory_slot_size)
 
         self.augment_images = True
         self.augment_keypoints = True
@@ -5624,19 +6003,29 @@ class BackgroundAugmenter(object):
         for i in range(nb_workers):
             worker = multiprocessing.Process(
                 target=self._augment_images_worker,
-                args=(augseq, self.queue_source, self.queue_result, self.source_finished_signals, seeds[i])
+                args=(augseq, self.queue_source, self.queue_result, self.source_finished_signals, seeds[i],
+                      self.transport_source, self.transport)
             )
             worker.daemon = True
             worker.start()
             self.workers.append(worker)
 
-    def get_batch(self):
+    def get_batch(self, copy=True):
         """
         Returns a batch from the queue of augmented batches.
 
         If workers are still running and there are no batches in the queue,
         it will automatically wait for the next batch.
 
+        Parameters
+        ----------
+        copy : bool, optional
+            Only relevant if shared memory is used.
+            If False, the images of the returned batch are views on shared
+            memory, which saves one copy per batch. The batch then has to be
+            released via :func:`imgaug.BackgroundAugmenter.release_batch` once
+            it is not used anymore.
+
         Returns
         -------
         out : None or imgaug.Batch
@@ -5644,7 +6033,7 @@ class BackgroundAugmenter(object):
 
         """
         batch_str = self.queue_result.get()
-        batch = pickle.loads(batch_str)
+        batch = self.transport.decode(batch_str, copy=copy)
         if batch is not None:
             return batch
         else:
@@ -5652,9 +6041,22 @@ class BackgroundAugmenter(object):
             if self.nb_workers_finished == self.nb_workers:
                 return None
             else:
-                return self.get_batch()
+                return self.get_batch(copy=copy)
 
-    def _augment_images_worker(self, augseq, queue_source, queue_result, source_finished_signals, seedval):
+    def release_batch(self, batch):
+        """
+        Release the shared memory used by a batch from ``get_batch(copy=False)``.
+
+        Parameters
+        ----------
+        batch : imgaug.Batch
+            The batch to release. Its images must not be accessed afterwards.
+
+        """
+        self.transport.release(batch)
+
+    def _augment_images_worker(self, augseq, queue_source, queue_result, source_finished_signals, seedval,
+                               transport_source, transport_result):
         """
         Augment endlessly images in the source queue.
 
@@ -5671,16 +6073,19 @@ class BackgroundAugmenter(object):
             # wait for a new batch in the source queue and load it
             try:
                 batch_str = queue_source.get(timeout=0.1)
-                batch = pickle.loads(batch_str)
+                batch = transport_source.decode(batch_str, copy=False)
 
+                # augment_batches() copies the input batch, hence its slot
+                # can be released directly afterwards
                 batch_aug = list(augseq.augment_batches([batch], background=False))[0]
+                transport_source.release(batch)
 
                 # send augmented batch to output queue
-                batch_str = pickle.dumps(batch_aug, protocol=-1)
+                batch_str = transport_result.encode(batch_aug)
                 queue_result.put(batch_str)
             except QueueEmpty:
                 if all([signal.is_set() for signal in source_finished_signals]):
-                    queue_result.put(pickle.dumps(None, protocol=-1))
+                    queue_result.put(transport_result.encode(None))
                     return
 
     def terminate(self):
@@ -5694,3 +6099,285 @@ class BackgroundAugmenter(object):
             worker.terminate()
 
         self.queue_result.close()
+        self.transport.close()
+
+
+# Augmentation sequence of the current AugmentationPool worker process.
+# Set once per worker by the pool's initializer, so that the augmenter is not
+# pickled again for every single job.
+_AUGMENTATION_POOL_AUGSEQ = None
+
+
+def _AugmentationPool_initialize_worker(augseq):
+    global _AUGMENTATION_POOL_AUGSEQ
+    _AUGMENTATION_POOL_AUGSEQ = augseq
+
+
+def _AugmentationPool_augment_batch(job):
+    key, batch, seedval = job
+    augseq = _AUGMENTATION_POOL_AUGSEQ
+    # reseed per job instead of per worker, so that the result of a batch
+    # does not depend on which worker happened to pick it up
+    augseq.reseed(new_random_state(seedval))
+    return key, list(augseq.augment_batches([batch], background=False))[0]
+
+
+_BATCH_ATTRIBUTES = ["images", "images_aug", "heatmaps", "heatmaps_aug", "segmentation_maps",
+                     "segmentation_maps_aug", "keypoints", "keypoints_aug", "bounding_boxes", "bounding_boxes_aug"]
+
+
+def _get_batch_length(batch):
+    if is_np_array(batch) or isinstance(batch, list):
+        return len(batch)
+    elif isinstance(batch, Batch):
+        lengths = set([len(getattr(batch, attr)) for attr in _BATCH_ATTRIBUTES if getattr(batch, attr) is not None])
+        if len(lengths) == 1:
+            return lengths.pop()
+    # no data or modalities of different lengths, the batch can't be split
+    return None
+
+
+def _split_batch(batch, shard_size):
+    nb_rows = _get_batch_length(batch)
+    if shard_size is None or nb_rows is None or nb_rows <= shard_size:
+        return [batch]
+
+    slices = [slice(i, i+shard_size) for i in sm.xrange(0, nb_rows, shard_size)]
+    if isinstance(batch, Batch):
+        shards = []
+        for slice_ in slices:
+            shard = Batch(data=batch.data)
+            for attr in _BATCH_ATTRIBUTES:
+                value = getattr(batch, attr)
+                setattr(shard, attr, value[slice_] if value is not None else None)
+            shards.append(shard)
+        return shards
+    return [batch[slice_] for slice_ in slices]
+
+
+def _merge_batch_shards(shards):
+    if len(shards) == 1:
+        return shards[0]
+    elif isinstance(shards[0], Batch):
+        batch = Batch(data=shards[0].data)
+        for attr in _BATCH_ATTRIBUTES:
+            if getattr(shards[0], attr) is not None:
+                setattr(batch, attr, _merge_batch_shards([getattr(shard, attr) for shard in shards]))
+        return batch
+    elif all([is_np_array(shard) for shard in shards]) \
+            and len(set([(shard.shape[1:], shard.dtype.name) for shard in shards])) == 1:
+        return np.concatenate(shards, axis=0)
+    # lists or arrays that can't be concatenated, e.g. due to different
+    # image sizes after augmentation
+    return [row for shard in shards for row in shard]
+
+
+class AugmentationPool(object):
+    """
+    Pool of persistent background workers to augment batches.
+
+    In contrast to :class:`imgaug.BackgroundAugmenter`, the worker processes
+    are started only once and stay alive until the pool is closed. Hence, the
+    same pool can be used for many calls (e.g. one per epoch) without paying
+    the cost of spawning processes and pickling the augmenter every time.
+
+    Every submitted batch is augmented with its own seed, which is derived
+    from the seed of the pool, a per-call counter and the index of the batch
+    within the call. The results are therefore reproducible for a fixed seed,
+    independent of the number of workers and of which worker processes
+    which batch.
+
+    Large batches may optionally be split into shards, which are augmented
+    on different workers and merged again afterwards. This keeps all workers
+    busy even if only few (but large) batches are augmented.
+
+    Parameters
+    ----------
+    augseq : Augmenter
+        An augmenter to apply to all batches.
+        This may be e.g. a Sequential to apply multiple augmenters.
+
+    nb_workers : 'auto' or int, optional
+        Number of background workers to spawn.
+        If ``auto``, it will be set to ``C-1``, where ``C`` is the number of CPU cores.
+
+    maxtasksperchild : None or int, optional
+        Number of jobs after which a worker process is replaced by a new one.
+        If None, workers live as long as the pool.
+
+    seed : None or int, optional
+        Seed from which the per-batch seeds are derived.
+        If None, it is sampled from the global random state.
+
+    shard_size : None or int, optional
+        If set, batches with more than this number of images (or other
+        augmentables) are split into shards of at most this size. Each shard
+        is augmented with a seed derived from the batch seed and the shard
+        index, i.e. the results still do not depend on the number of workers.
+        Batches whose modalities have different lengths are not split.
+
+    Examples
+    --------
+    >>> with ia.AugmentationPool(seq, nb_workers=4) as pool:
+    >>>     for epoch in range(10):
+    >>>         for batch_aug in pool.imap(batches):
+    >>>             train(batch_aug)
+
+    """
+    def __init__(self, augseq, nb_workers="auto", maxtasksperchild=None, seed=None, shard_size=None):
+        if nb_workers == "auto":
+            try:
+                nb_workers = multiprocessing.cpu_count()
+            except (ImportError, NotImplementedError):
+                nb_workers = 1
+            # try to reserve at least one core for the main process
+            nb_workers = max(1, nb_workers - 1)
+        else:
+            do_assert(nb_workers >= 1)
+
+        if seed is None:
+            seed = current_random_state().randint(0, 10**6)
+
+        self.augseq = augseq
+        self.nb_workers = nb_workers
+        do_assert(shard_size is None or shard_size >= 1)
+
+        self.seed = seed
+        self.shard_size = shard_size
+        self.nb_calls = 0
+        self.pool = multiprocessing.Pool(nb_workers,
+                                         initializer=_AugmentationPool_initialize_worker,
+                                         initargs=(augseq,),
+                                         maxtasksperchild=maxtasksperchild)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.terminate()
+
+    def map(self, batches, chunksize=None):
+        """
+        Augment batches in the background and wait for all results.
+
+        Parameters
+        ----------
+        batches : list
+            Batches to augment. Each batch may have any of the datatypes
+            accepted by :func:`imgaug.augmenters.meta.Augmenter.augment_batches`.
+
+        chunksize : None or int, optional
+            Number of batches that are sent to a worker at once.
+            If None, a value is chosen automatically.
+
+        Returns
+        -------
+        list
+            Augmented batches in the same order and of the same datatypes as
+            the input batches.
+
+        """
+        results = self.pool.map(_AugmentationPool_augment_batch, self._create_jobs(batches), chunksize=chunksize)
+        return list(self._merge_results(results))
+
+    def imap(self, batches, chunksize=1):
+        """
+        Augment batches in the background and lazily yield the results.
+
+        Parameters
+        ----------
+        batches : iterable
+            Batches to augment. May also be a generator, which is then
+            consumed lazily. See :func:`imgaug.AugmentationPool.map`.
+
+        chunksize : int, optional
+            Number of batches that are sent to a worker at once.
+
+        Returns
+        -------
+        iterator
+            Augmented batches in the same order as the input batches.
+
+        """
+        results = self.pool.imap(_AugmentationPool_augment_batch, self._create_jobs(batches), chunksize=chunksize)
+        return self._merge_results(results)
+
+    def imap_unordered(self, batches, chunksize=1):
+        """
+        Augment batches in the background and yield results as soon as they are finished.
+
+        Parameters
+        ----------
+        batches : iterable
+            Batches to augment. See :func:`imgaug.AugmentationPool.imap`.
+
+        chunksize : int, optional
+            Number of batches that are sent to a worker at once.
+
+        Returns
+        -------
+        iterator
+            Augmented batches in arbitrary order. Each batch is still
+            augmented with the same seed as in :func:`imgaug.AugmentationPool.imap`.
+
+        """
+        results = self.pool.imap_unordered(_AugmentationPool_augment_batch, self._create_jobs(batches),
+                                           chunksize=chunksize)
+        return self._merge_results(results)
+
+    def _create_jobs(self, batches):
+        # the seeds of a call only depend on the pool seed, the number of
+        # previous calls, the batch index and the shard index, not on the
+        # (lazy) consumption order of the batches
+        call_idx = self.nb_calls
+        self.nb_calls += 1
+        for batch_idx, batch in enumerate(batches):
+            shards = _split_batch(batch, self.shard_size)
+            nb_shards = len(shards)
+            for shard_idx, shard in enumerate(shards):
+                seedval = [self.seed, call_idx, batch_idx]
+                if nb_shards > 1:
+                    seedval.append(shard_idx)
+                yield (batch_idx, shard_idx, nb_shards), shard, seedval
+
+    @classmethod
+    def _merge_results(cls, results):
+        shards_by_batch = dict()
+        for (batch_idx, shard_idx, nb_shards), batch_aug in results:
+            if nb_shards == 1:
+                yield batch_aug
+            else:
+                shards = shards_by_batch.setdefault(batch_idx, dict())
+                shards[shard_idx] = batch_aug
+                if len(shards) == nb_shards:
+                    del shards_by_batch[batch_idx]
+                    yield _merge_batch_shards([shards[i] for i in sm.xrange(nb_shards)])
+
+    def close(self):
+        """
+        Prevent further jobs from being submitted to the pool.
+
+        Running jobs are finished, use :func:`imgaug.AugmentationPool.join`
+        to wait for them.
+
+        """
+        self.pool.close()
+
+    def terminate(self):
+        """
+        Terminates all background processes immediately.
+
+        This will also free their RAM.
+
+        """
+        self.pool.terminate()
+
+    def join(self):
+        """
+        Wait for the worker processes to exit.
+
+        :func:`imgaug.AugmentationPool.close` or
+        :func:`imgaug.AugmentationPool.terminate` must be called before.
+
+        """
+        self.pool.join()
@@ -1,7 +1,7 @@
 from __future__ import print_function, division, absolute_import
 
 import copy as copy_module
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from abc import ABCMeta, abstractmethod
 
 import numpy as np
@@ -188,6 +188,197 @@ def both_np_float_if_one_is_float(a, b):
         return a.astype(np.float64), b.astype(np.float64)
 
 
+def draw_per_channel_mask(per_channel, nb_images, random_state):
+    """
+    Decide for each image of a batch whether to sample values per channel.
+
+    Parameters
+    ----------
+    per_channel : StochasticParameter
+        Parameter as returned by ``handle_probability_param(per_channel, ...)``.
+
+    nb_images : int
+        Number of images in the batch.
+
+    random_state : numpy.random.RandomState
+        Random state to use for the sampling.
+
+    Returns
+    -------
+    (N,) ndarray
+        Boolean mask that is True for all images that use per-channel values.
+
+    """
+    return per_channel.draw_samples((nb_images,), random_state=random_state) > 0.5
+
+
+def draw_per_channel_samples(param, per_channel, nb_channels, random_state):
+    """
+    Sample values of a parameter for all images and channels of a batch.
+
+    For each image it is first decided via `per_channel` whether it uses
+    one value per channel or the same value for all of its channels. Then the
+    values of all images are sampled in a single call of `param`.
+
+    Parameters
+    ----------
+    param : StochasticParameter
+        Parameter from which to sample the values.
+
+    per_channel : StochasticParameter
+        Parameter as returned by ``handle_probability_param(per_channel, ...)``.
+
+    nb_channels : list of int
+        Number of channels of each image of the batch.
+
+    random_state : numpy.random.RandomState
+        Random state to use for the sampling.
+
+    Returns
+    -------
+    samples : (N,C) ndarray
+        Sampled values, where ``C`` is the maximum of `nb_channels`.
+        Images with less channels must only use the first values of their row.
+        Rows of images that do not use per-channel values contain the same
+        value in every column.
+
+    per_channel_mask : (N,) ndarray
+        Boolean mask that is True for all images that use per-channel values.
+
+    """
+    nb_images = len(nb_channels)
+    per_channel_mask = draw_per_channel_mask(per_channel, nb_images, random_state)
+    nb_channels_max = max(nb_channels) if nb_images > 0 else 1
+    samples = param.draw_samples((nb_images, nb_channels_max), random_state=random_state)
+    samples[~per_channel_mask, :] = samples[~per_channel_mask, 0:1]
+    return samples, per_channel_mask
+
+
+def draw_binomial_masks(p, size, random_state):
+    """
+    Sample boolean masks of independent Bernoulli trials for known probabilities.
+
+    This is the mask sampling of :func:`imgaug.parameters.Binomial.draw_mask`
+    and :func:`imgaug.parameters.Binomial.draw_samples_batch` for
+    probabilities that were already sampled.
+
+    Parameters
+    ----------
+    p : float or (N,) ndarray
+        Probability of each value to be True. If this is an array, it
+        contains one probability per entry of the first axis of `size`.
+
+    size : tuple of int
+        Shape of the masks.
+
+    random_state : numpy.random.RandomState
+        Random state to use for the sampling.
+
+    Returns
+    -------
+    ndarray
+        Boolean masks of shape `size`.
+
+    """
+    # Compare raw random 16 bit integers against thresholds, which is much faster than
+    # sampling from a binomial distribution. This limits the precision of p to 1/65536.
+    thresholds = np.round(np.float64(p) * 65536).astype(np.int32)
+    if np.all(thresholds >= 65536):
+        return np.ones(size, dtype=bool)
+    if thresholds.ndim > 0:
+        thresholds = thresholds.reshape((len(thresholds),) + (1,) * (len(size) - 1))
+    nb_values = int(np.prod(size))
+    values = np.frombuffer(random_state.bytes(2 * nb_values), dtype=np.uint16).reshape(size)
+    return values < thresholds
+
+
+def draw_sparse_mask_indices(nb_values, p, random_state):
+    """
+    Sample the flat indices at which a mask of independent Bernoulli trials is True.
+
+    The gaps between consecutive True values of such a mask follow a geometric
+    distribution, hence the indices are sampled as cumulative sums of geometric
+    samples. The result is distributed in the same way as
+    ``np.flatnonzero(Binomial(p).draw_mask(nb_values))``, but the cost scales
+    with ``p * nb_values`` instead of ``nb_values``, which makes this faster
+    for low `p`.
+
+    Parameters
+    ----------
+    nb_values : int
+        Number of values in the mask.
+
+    p : float
+        Probability of each value to be True.
+
+    random_state : numpy.random.RandomState
+        Random state to use for the sampling.
+
+    Returns
+    -------
+    (K,) ndarray
+        Sorted flat indices of the True values.
+
+    """
+    if p <= 0 or nb_values <= 0:
+        return np.zeros((0,), dtype=np.int64)
+
+    # sample enough gaps to reach the end of the mask in nearly all cases
+    nb_expected = nb_values * p
+    nb_gaps = int(nb_expected + 4 * np.sqrt(nb_expected) + 16)
+    indices = np.cumsum(random_state.geometric(p, size=(nb_gaps,))) - 1
+    while indices[-1] < nb_values:
+        indices_extra = indices[-1] + np.cumsum(random_state.geometric(p, size=(nb_gaps // 4 + 16,)))
+        indices = np.concatenate([indices, indices_extra])
+    return indices[indices < nb_values]
+
+
+def draw_per_channel_elementwise_samples(param, per_channel_mask, size, random_state, as_mask=False):
+    """
+    Sample elementwise values of a parameter for a batch of equally sized images.
+
+    The values of all images are sampled in a single call of
+    ``param.draw_samples_batch()``, i.e. values that `param` samples once per
+    call are still sampled once per image. Images that do not use per-channel
+    values receive the same values in all of their channels.
+
+    Parameters
+    ----------
+    param : StochasticParameter
+        Parameter from which to sample the values.
+
+    per_channel_mask : (N,) ndarray
+        Boolean mask that is True for all images that use per-channel values,
+        e.g. as returned by :func:`imgaug.parameters.draw_per_channel_mask`.
+
+    size : tuple of int
+        Shape ``(N, H, W, C)`` of the batch.
+
+    random_state : numpy.random.RandomState
+        Random state to use for the sampling.
+
+    as_mask : bool, optional
+        Whether to sample boolean masks (as in ``param.draw_mask()``) instead of
+        values.
+
+    Returns
+    -------
+    ndarray
+        Sampled values of shape ``(N, H, W, C)``. If no image uses per-channel
+        values, the shape is ``(N, H, W, 1)`` instead and the values have to be
+        broadcasted to all channels.
+
+    """
+    nb_images, height, width, nb_channels = size
+    if not np.any(per_channel_mask):
+        return param.draw_samples_batch(nb_images, (height, width, 1), random_state=random_state, as_mask=as_mask)
+    samples = param.draw_samples_batch(nb_images, (height, width, nb_channels), random_state=random_state,
+                                       as_mask=as_mask)
+    if not np.all(per_channel_mask):
+        samples[~per_channel_mask] = samples[~per_channel_mask][..., 0:1]
+    return samples
+
+
 def draw_distributions_grid(params, rows=None, cols=None, graph_sizes=(350, 350), sample_sizes=None, titles=None):
     if titles is None:
         titles = [None] * len(params)
@@ -252,7 +443,7 @@ class StochasticParameter(object): # pylint: disable=locally-disabled, unused-va
         """
         return self.draw_samples(1, random_state=random_state)[0]
 
-    def draw_samples(self, size, random_state=None):
+    def draw_samples(self, size, random_state=None, out=None):
         """
         Draws one or more sample values from the parameter.
 
@@ -265,12 +456,22 @@ class StochasticParameter(object): # pylint: disable=locally-disabled, unused-va
             A random state to use during the sampling process.
             If None, the libraries global random state will be used.
 
+        out : None or ndarray, optional
+            Array of shape `size` into which to write the sampled values.
+            The values are cast to the dtype of the array (in the same way as
+            ``astype()`` would cast them). Note that the values are still
+            sampled into a new array, which is then copied into `out`, as
+            numpy's random number generators cannot sample in-place. Hence,
+            `out` only saves the array that a subsequent ``astype()`` would
+            create, e.g. when many float samples have to be converted to
+            integers for images of the same size.
+
         Returns
         -------
         samples : iterable
             Sampled values. Usually a numpy ndarray of basically any dtype,
             though not strictly limited to numpy arrays. Its shape is expected to
-            match `size`.
+            match `size`. If `out` was provided, `out` is returned.
 
         """
         random_state = random_state if random_state is not None else ia.current_random_state()
@@ -279,12 +480,122 @@ class StochasticParameter(object): # pylint: disable=locally-disabled, unused-va
             random_state)
         ia.forward_random_state(random_state)
 
+        if out is not None:
+            ia.do_assert(out.shape == np.shape(samples),
+                         "Expected 'out' to have shape %s, got %s." % (np.shape(samples), out.shape))
+            if out is not samples:
+                np.copyto(out, samples, casting="unsafe")
+            return out
         return samples
 
     @abstractmethod
     def _draw_samples(self, size, random_state):
         raise NotImplementedError()
 
+    def draw_mask(self, size, random_state=None):
+        """
+        Draws a boolean mask that is True wherever a sample value is above 0.5.
+
+        This is equivalent to ``draw_samples(size, random_state) > 0.5``, but
+        some parameters (e.g. :class:`imgaug.parameters.Binomial`) generate
+        the mask faster without sampling intermediate values.
+
+        Parameters
+        ----------
+        size : tuple of int or int
+            Number of mask values by dimension.
+
+        random_state : None or np.random.RandomState, optional
+            A random state to use during the sampling process.
+            If None, the libraries global random state will be used.
+
+        Returns
+        -------
+        mask : ndarray
+            Boolean mask of shape `size`.
+
+        """
+        random_state = random_state if random_state is not None else ia.current_random_state()
+        mask = self._draw_mask(
+            size if not ia.is_single_integer(size) else tuple([size]),
+            random_state)
+        ia.forward_random_state(random_state)
+        return mask
+
+    def _draw_mask(self, size, random_state):
+        return np.asarray(self._draw_samples(size, random_state)) > 0.5
+
+    def draw_samples_batch(self, nb_samples, size, random_state=None, as_mask=False):
+        """
+        Draws the samples of several independent calls of ``draw_samples(size)`` at once.
+
+        Values that parameters sample once per call (e.g. the probability of
+        :class:`imgaug.parameters.Binomial`) are sampled once per entry of the
+        batch, i.e. the result follows the same distribution as stacking
+        `nb_samples` separate calls. Some parameters sample the whole batch
+        faster than via separate calls.
+
+        Parameters
+        ----------
+        nb_samples : int
+            Number of calls to draw samples for.
+
+        size : tuple of int
+            Number of sample values by dimension per call.
+
+        random_state : None or np.random.RandomState, optional
+            A random state to use during the sampling process.
+            If None, the libraries global random state will be used.
+
+        as_mask : bool, optional
+            Whether to draw boolean masks as in ``draw_mask(size)`` instead of
+            sample values.
+
+        Returns
+        -------
+        samples : ndarray
+            Sampled values or masks of shape ``(nb_samples,) + size``.
+
+        """
+        random_state = random_state if random_state is not None else ia.current_random_state()
+        samples = self._draw_samples_batch(nb_samples, tuple(size), random_state, as_mask)
+        ia.forward_random_state(random_state)
+        return samples
+
+    def _draw_samples_batch(self, nb_samples, size, random_state, as_mask):
+        draw_func = self._draw_mask if as_mask else self._draw_samples
+        result = None
+        for i in sm.xrange(nb_samples):
+            samples = draw_func(size, random_state)
+            if result is None:
+                result = np.zeros((nb_samples,) + size, dtype=np.asarray(samples).dtype)
+            result[i] = samples
+        if result is None:
+            result = np.zeros((0,) + size, dtype=bool if as_mask else np.float32)
+        return result
+
+    def compile(self):
+        """
+        Create a parameter that samples faster from chains of arithmetic parameters.
+
+        Chains of ``Add``, ``Subtract``, ``Multiply``, ``Divide``, ``Clip``
+        and ``Discretize`` (e.g. as created by ``Clip(Normal(0, 1) * 3 + 2, 0, 10)``)
+        are otherwise evaluated recursively, with each step allocating a new
+        array. The compiled parameter instead samples the innermost parameter
+        once and applies all other steps in-place to the resulting array.
+        The sampled values are identical to the ones of this parameter.
+
+        Returns
+        -------
+        imgaug.parameters.StochasticParameter
+            A :class:`imgaug.parameters.CompiledParameter` if this parameter
+            is such an arithmetic chain, otherwise this parameter itself.
+
+        """
+        if isinstance(self, CompiledParameter.ARITHMETIC_CLASSES):
+            return CompiledParameter(self)
+        return self
+
     def __add__(self, other):
         if ia.is_single_number(other) or isinstance(other, StochasticParameter):
             return Add(self, other)
@@ -507,6 +818,21 @@ class Binomial(StochasticParameter):
         ia.do_assert(0 <= p <= 1.0, "Expected probability p to be in range [0.0, 1.0], got %s." % (p,))
         return random_state.binomial(1, p, size)
 
+    def _draw_mask(self, size, random_state):
+        p = self.p.draw_sample(random_state=random_state)
+        ia.do_assert(0 <= p <= 1.0, "Expected probability p to be in range [0.0, 1.0], got %s." % (p,))
+        return draw_binomial_masks(p, size, random_state)
+
+    def _draw_samples_batch(self, nb_samples, size, random_state, as_mask):
+        # one probability per entry of the batch
+        p = self.p.draw_samples((nb_samples,), random_state=random_state)
+        ia.do_assert(np.all(np.logical_and(0 <= p, p <= 1.0)),
+                     "Expected probability p to be in range [0.0, 1.0], got %s." % (p,))
+        size_batch = (nb_samples,) + size
+        if not as_mask:
+            return random_state.binomial(1, np.reshape(p, (nb_samples,) + (1,) * len(size)), size_batch)
+        return draw_binomial_masks(p, size_batch, random_state)
+
     def __repr__(self):
         return self.__str__()
 
@@ -554,40 +880,40 @@ class Choice(StochasticParameter):
     def _draw_samples(self, size, random_state):
         if any([isinstance(a_i, StochasticParameter) for a_i in self.a]):
             seed = random_state.randint(0, 10**6, 1)[0]
-            samples = ia.new_random_state(seed).choice(self.a, np.prod(size), replace=self.replace, p=self.p)
-
-            # collect the sampled parameters and how many samples must be taken
-            # from each of them
-            params_counter = defaultdict(lambda: 0)
-            for sample in samples:
-                if isinstance(sample, StochasticParameter):
-                    key = str(sample)
-                    params_counter[key] += 1
-
-            # collect per parameter once the required number of samples
-            # iterate here over self.a to always use the same seed for
-            # the same parameter
-            # TODO this might fail if the same parameter is added multiple times to self.a?
+            indices = ia.new_random_state(seed).choice(len(self.a), np.prod(size), replace=self.replace, p=self.p)
+
+            # collect per option the mask of the sampled locations and the values to place there
+            # parameters are identified by object identity and sampled once for all of their
+            # locations, even if they were added multiple times to self.a
+            # the seed of a parameter is always derived from its first index in self.a
             # TODO this will fail if a parameter cant handle size=(N,)
-            param_to_samples = dict()
-            for i, param in enumerate(self.a):
-                key = str(param)
-                if key in params_counter:
-                    param_to_samples[key] = param.draw_samples(
-                        size=(params_counter[key],),
-                        random_state=ia.new_random_state(seed+1+i)
-                    )
-
-            # assign the values sampled from the parameters to the `samples`
-            # array by replacing the respective parameter
-            param_to_readcount = defaultdict(lambda: 0)
-            for i, sample in enumerate(samples):
-                if isinstance(sample, StochasticParameter):
-                    key = str(sample)
-                    readcount = param_to_readcount[key]
-                    samples[i] = param_to_samples[key][readcount]
-                    param_to_readcount[key] += 1
+            masks_and_values = []
+            for i, option in enumerate(self.a):
+                if isinstance(option, StochasticParameter):
+                    option_indices = [j for j, other in enumerate(self.a) if other is option]
+                    if option_indices[0] != i:
+                        continue
+                    mask = np.isin(indices, option_indices) if len(option_indices) > 1 else (indices == i)
+                    count = int(np.sum(mask))
+                    if count > 0:
+                        values = option.draw_samples((count,), random_state=ia.new_random_state(seed+1+i))
+                        masks_and_values.append((mask, np.asarray(values)))
+                else:
+                    mask = (indices == i)
+                    if np.any(mask):
+                        masks_and_values.append((mask, np.array([option])))
+
+            dtypes = [values.dtype for _mask, values in masks_and_values]
+            if len(dtypes) > 0 and all([dtype.kind in "biuf" for dtype in dtypes]):
+                dtype = np.result_type(*dtypes)
+            elif len(dtypes) > 0 and all([dtype.kind in "U" for dtype in dtypes]):
+                dtype = np.result_type(*dtypes)
+            else:
+                dtype = object
 
+            samples = np.empty(indices.shape, dtype=dtype)
+            for mask, values in masks_and_values:
+                samples[mask] = values
             samples = samples.reshape(size)
         else:
             samples = random_state.choice(self.a, size, replace=self.replace, p=self.p)
@@ -1032,6 +1358,10 @@ class Deterministic(StochasticParameter):
     def _draw_samples(self, size, random_state):
         return np.tile(np.array([self.value]), size)
 
+    def _draw_samples_batch(self, nb_samples, size, random_state, as_mask):
+        samples = self._draw_samples((nb_samples,) + size, random_state)
+        return samples > 0.5 if as_mask else samples
+
     def __repr__(self):
         return self.__str__()
 
@@ -1165,27 +1495,49 @@ class FromLowerResolution(StochasticParameter):
             hw_pxs = self.size_px.draw_samples((n, 2), random_state=random_state)
 
         methods = self.method.draw_samples((n,), random_state=random_state)
-        result = None
+
+        # Group the samples by their low resolution size and upscaling method, so that
+        # each group can be drawn in one call and upscaled in one batch.
+        groups = defaultdict(list)
         for i, (hw_px, method) in enumerate(zip(hw_pxs, methods)):
             h_small = max(hw_px[0], self.min_size)
             w_small = max(hw_px[1], self.min_size)
-            samples = self.other_param.draw_samples((1, h_small, w_small, c), random_state=random_state)
+            groups[(h_small, w_small, method)].append(i)
+
+        samples_groups = []
+        for (h_small, w_small, method), indices in groups.items():
+            samples = self.other_param.draw_samples_batch(len(indices), (h_small, w_small, c),
+                                                          random_state=random_state)
             if method != "nearest":
                 # hacky cast because opencv resize seems to be unable to handle non-nearest
                 # interpolation methods in combination with large ints
                 # also, using lower ints with interpolation!=nearest seems to not result in the
                 # expected "gradual" values, but rather still behave like nearest
                 samples = samples.astype(np.float32)
-            samples_upscaled = ia.imresize_many_images(samples, (h, w), interpolation=method)
-            if result is None:
-                result = np.zeros((n, h, w, c), dtype=samples_upscaled.dtype)
-            result[i] = samples_upscaled
+            samples_groups.append((indices, method, samples))
+
+        # the first sample determines the output dtype
+        dtype = [samples.dtype for indices, _method, samples in samples_groups if indices[0] == 0][0]
+        result = np.zeros((n, h, w, c), dtype=dtype)
+        for indices, method, samples in samples_groups:
+            h_small, w_small = samples.shape[1:3]
+            if method == "nearest" and h % h_small == 0 and w % w_small == 0:
+                # same result as nearest neighbour interpolation, but without per-sample resizing
+                samples_upscaled = np.repeat(np.repeat(samples, h // h_small, axis=1), w // w_small, axis=2)
+            else:
+                samples_upscaled = ia.imresize_many_images(samples, (h, w), interpolation=method)
+            result[indices] = samples_upscaled
 
         if len(size) == 3:
             return result[0]
         else:
             return result
 
+    def _draw_samples_batch(self, nb_samples, size, random_state, as_mask):
+        # samples of shape (N, H, W, C) are already drawn independently per entry of N
+        samples = self._draw_samples((nb_samples,) + size, random_state)
+        return samples > 0.5 if as_mask else samples
+
     def __repr__(self):
         return self.__str__()
 
@@ -1556,6 +1908,131 @@ class Subtract(StochasticParameter):
         return "Subtract(%s, %s, %s)" % (str(self.other_param), str(self.val), self.elementwise)
 
 
+class CompiledParameter(StochasticParameter):
+    """
+    Parameter that evaluates a chain of arithmetic parameters in-place.
+
+    Use :func:`imgaug.parameters.StochasticParameter.compile` to create
+    instances of this class.
+
+    The chain is followed from the given parameter down via the
+    ``other_param`` attributes of ``Add``, ``Subtract``, ``Multiply``,
+    ``Divide``, ``Clip`` and ``Discretize``. The first other parameter is the
+    source of the chain. Its values are sampled once and all steps of the
+    chain are then applied to that array via in-place numpy operations.
+    A new array is only created if a step changes the dtype (e.g. when
+    discretizing float values or multiplying integers with floats).
+
+    The random states of all steps are derived in the same way as during the
+    recursive evaluation, hence the sampled values are identical to the ones
+    of the original parameter.
+
+    Parameters
+    ----------
+    other_param : imgaug.parameters.StochasticParameter
+        The parameter to compile.
+
+    Examples
+    --------
+    >>> param = Clip(Discretize(Normal(0, 1) * 3 + 2), 0, 10).compile()
+
+    """
+    ARITHMETIC_CLASSES = (Add, Subtract, Multiply, Divide, Clip, Discretize)
+
+    def __init__(self, other_param):
+        super(CompiledParameter, self).__init__()
+
+        ia.do_assert(isinstance(other_param, StochasticParameter))
+        self.other_param = other_param
+
+        self.chain = []
+        node = other_param
+        while isinstance(node, CompiledParameter.ARITHMETIC_CLASSES):
+            self.chain.append(node)
+            node = node.other_param
+        self.source = node
+
+    def _draw_samples(self, size, random_state):
+        # Derive the random states in the same order as the recursive
+        # evaluation: each arithmetic step samples a seed from its random
+        # state and uses seed and seed+1 for the other parameter and the
+        # operand. Clip and Discretize pass their random state through.
+        rs = random_state
+        nb_forwards = -1  # the root's draw_samples() forwards random_state
+        operand_seeds = []
+        for node in self.chain:
+            if rs is random_state:
+                nb_forwards += 1
+            if isinstance(node, (Clip, Discretize)):
+                operand_seeds.append(None)
+            else:
+                seed = rs.randint(0, 10**6, 1)[0]
+                operand_seeds.append(seed + 1)
+                rs = ia.new_random_state(seed)
+
+        samples = self.source.draw_samples(size, random_state=rs)
+        for _ in sm.xrange(nb_forwards):
+            ia.forward_random_state(random_state)
+
+        for node, operand_seed in zip(self.chain[::-1], operand_seeds[::-1]):
+            samples = self._apply_step(node, samples, size, operand_seed)
+        return samples
+
+    @classmethod
+    def _apply_step(cls, node, samples, size, operand_seed):
+        if isinstance(node, Clip):
+            if node.minval is not None and node.maxval is not None:
+                np.clip(samples, node.minval, node.maxval, out=samples)
+            elif node.minval is not None:
+                np.clip(samples, node.minval, np.max(samples), out=samples)
+            elif node.maxval is not None:
+                np.clip(samples, np.min(samples), node.maxval, out=samples)
+            return samples
+        elif isinstance(node, Discretize):
+            if ia.is_integer_array(samples):
+                return samples
+            np.round(samples, out=samples)
+            return samples.astype(np.int32)
+
+        elementwise = node.elementwise and not isinstance(node.val, Deterministic)
+        random_state = ia.new_random_state(operand_seed)
+        if elementwise:
+            operand = node.val.draw_samples(size, random_state=random_state)
+        else:
+            operand = node.val.draw_sample(random_state=random_state)
+
+        if isinstance(node, Add):
+            return cls._apply_ufunc(np.add, samples, operand)
+        elif isinstance(node, Subtract):
+            return cls._apply_ufunc(np.subtract, samples, operand)
+        elif isinstance(node, Multiply):
+            return cls._apply_ufunc(np.multiply, samples, operand)
+        else:
+            ia.do_assert(isinstance(node, Divide))
+            # prevent division by zero
+            samples = force_np_float_dtype(samples)
+            if elementwise:
+                operand[operand == 0] = 1
+                return cls._apply_ufunc(np.divide, samples, force_np_float_dtype(operand))
+            if operand == 0:
+                operand = 1
+            return cls._apply_ufunc(np.divide, samples, float(operand))
+
+    @classmethod
+    def _apply_ufunc(cls, func, samples, operand):
+        # work in-place if that leads to the same dtype as a normal call of func
+        if ia.is_np_array(samples) and np.result_type(samples, operand) == samples.dtype \
+                and np.shape(operand) in [tuple(), samples.shape]:
+            return func(samples, operand, out=samples)
+        return func(samples, operand)
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        return "Compiled(%s)" % (str(self.other_param),)
+
+
 class Power(StochasticParameter):
     """
     Parameter to exponentiate another parameter's results with.
@@ -1976,25 +2453,25 @@ class IterativeNoiseAggregator(StochasticParameter):
         aggregation_method = self.aggregation_method.draw_sample(random_state=ia.new_random_state(seed))
         iterations = self.iterations.draw_sample(random_state=ia.new_random_state(seed+1))
         ia.do_assert(iterations > 0)
-
-        result = np.zeros(size, dtype=np.float32)
-        for i in sm.xrange(iterations):
-            noise_iter = self.other_param.draw_samples(size, random_state=ia.new_random_state(seed+2+i))
-            if aggregation_method == "avg":
-                result += noise_iter
-            elif aggregation_method == "min":
-                if i == 0:
-                    result = noise_iter
-                else:
-                    result = np.minimum(result, noise_iter)
-            else: # self.aggregation_method == "max"
-                if i == 0:
-                    result = noise_iter
-                else:
-                    result = np.maximum(result, noise_iter)
+        random_state_iterations = ia.new_random_state(seed+2)
 
         if aggregation_method == "avg":
-            result = result / iterations
+            aggregation_func = np.add
+        elif aggregation_method == "min":
+            aggregation_func = np.minimum
+        else: # self.aggregation_method == "max"
+            aggregation_func = np.maximum
+
+        # The samples of all further iterations are aggregated in-place into the
+        # float32 result. Each iteration's samples are passed directly to the ufunc,
+        # so that they are freed before the next iteration is drawn.
+        result = self.other_param.draw_samples(size, random_state=random_state_iterations).astype(np.float32)
+        for _ in sm.xrange(iterations - 1):
+            aggregation_func(result, self.other_param.draw_samples(size, random_state=random_state_iterations),
+                             out=result, casting="unsafe")
+
+        if aggregation_method == "avg" and iterations > 1:
+            np.multiply(result, 1.0 / iterations, out=result)
 
         return result
 
@@ -2119,6 +2596,189 @@ class Sigmoid(StochasticParameter):
         return "Sigmoid(%s, %s, %s, %s, %s)" % (opstr, str(self.threshold), str(self.activated), str(self.mul), str(self.add))
 
 
+def _handle_texture_bank_param(texture_bank):
+    if texture_bank is None or texture_bank is False:
+        return None
+    elif texture_bank is True:
+        return NoiseTextureBank()
+    elif isinstance(texture_bank, NoiseTextureBank):
+        return texture_bank
+    raise Exception("Expected texture_bank to be None or bool or NoiseTextureBank, got %s." % (type(texture_bank),))
+
+
+class NoiseTextureBank(object):
+    """
+    Cache of precomputed low resolution noise textures.
+
+    Generating a new noise plane for every image is the most expensive part
+    of :class:`imgaug.parameters.SimplexNoise` and
+    :class:`imgaug.parameters.FrequencyNoise`. If one of these parameters
+    is given a texture bank, it instead picks one of `nb_textures` cached
+    textures (per low resolution shape and, for frequency noise, per exponent
+    bucket) and applies a random crop or circular shift as well as random
+    flips (and transposition for square planes) to it. The resulting noise
+    maps are statistically equivalent, but not identical, to freshly
+    generated ones.
+
+    Note that the cached textures depend on the history of previous calls,
+    i.e. the same random state will not necessarily lead to the same noise map
+    if the bank was used in between.
+
+    Parameters
+    ----------
+    nb_textures : int, optional
+        Number of textures to cache per key.
+
+    max_bytes : int, optional
+        Upper bound on the memory used by the cached textures. If it is
+        exceeded, the least recently used keys are dropped from the bank.
+        The textures of the currently requested key are always kept.
+
+    refresh_after : None or int, optional
+        Number of times that a texture may be used before it is replaced by
+        a freshly generated one. If None, textures are never refreshed.
+
+    exponent_bucket_size : number, optional
+        Width of the buckets into which exponents of frequency noise are
+        grouped. All exponents within a bucket share the same textures, which
+        are generated with the bucket's center exponent.
+
+    Examples
+    --------
+    >>> param = SimplexNoise(texture_bank=NoiseTextureBank(nb_textures=8))
+
+    Creates simplex noise that reuses eight cached textures per low resolution
+    plane size.
+
+    """
+    def __init__(self, nb_textures=16, max_bytes=64*1024**2, refresh_after=256, exponent_bucket_size=0.5):
+        ia.do_assert(nb_textures >= 1, "Expected nb_textures to be at least 1, got %d." % (nb_textures,))
+        ia.do_assert(refresh_after is None or refresh_after >= 1,
+                     "Expected refresh_after to be None or at least 1, got %s." % (refresh_after,))
+        ia.do_assert(exponent_bucket_size > 0,
+                     "Expected exponent_bucket_size to be above zero, got %s." % (exponent_bucket_size,))
+        self.nb_textures = nb_textures
+        self.max_bytes = max_bytes
+        self.refresh_after = refresh_after
+        self.exponent_bucket_size = exponent_bucket_size
+
+        # key -> [textures, usage counters]
+        self._textures = OrderedDict()
+        self.nb_bytes = 0
+
+    def get_exponent_bucket(self, exponent):
+        """
+        Get the center value of the bucket that an exponent falls into.
+
+        Parameters
+        ----------
+        exponent : number
+            Exponent of frequency noise.
+
+        Returns
+        -------
+        float
+            Center exponent of the bucket.
+
+        """
+        return float(np.round(exponent / self.exponent_bucket_size) * self.exponent_bucket_size)
+
+    def draw(self, key, shape, generate_func, random_state, periodic=False):
+        """
+        Draw a randomly transformed copy of one of the textures of a key.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the textures. Textures of different keys are never mixed.
+
+        shape : tuple of int
+            Shape ``(H, W)`` of the requested noise plane.
+
+        generate_func : callable
+            Function that generates a new texture. It receives the shape of the
+            texture and an integer seed and must return a float array of that
+            shape.
+
+        random_state : numpy.random.RandomState
+            Random state to use to select and transform the texture and to
+            derive seeds of newly generated textures.
+
+        periodic : bool, optional
+            Whether the generated textures wrap around at their borders.
+            Periodic textures are generated in the requested shape and shifted
+            circularly. Other textures are generated at twice the requested
+            size and a random window of the requested shape is cropped from
+            them.
+
+        Returns
+        -------
+        numpy.ndarray
+            Noise plane of the requested shape. The array is always a copy,
+            i.e. it may be changed in-place by the caller.
+
+        """
+        h, w = shape
+        texture_shape = (h, w) if periodic else (2*h, 2*w)
+
+        entry = self._textures.pop(key, None)
+        if entry is None:
+            entry = [[None] * self.nb_textures, [0] * self.nb_textures]
+        self._textures[key] = entry
+        textures, counters = entry
+
+        idx = random_state.randint(0, self.nb_textures)
+        texture = textures[idx]
+        if texture is None or (self.refresh_after is not None and counters[idx] >= self.refresh_after):
+            if texture is not None:
+                self.nb_bytes -= texture.nbytes
+            texture = generate_func(texture_shape, random_state.randint(0, 10**6))
+            textures[idx] = texture
+            counters[idx] = 0
+            self.nb_bytes += texture.nbytes
+            self._evict(keep=key)
+        counters[idx] += 1
+
+        if periodic:
+            shift_y, shift_x = random_state.randint(0, h), random_state.randint(0, w)
+            result = np.roll(np.roll(texture, shift_y, axis=0), shift_x, axis=1)
+        else:
+            y1, x1 = random_state.randint(0, h+1), random_state.randint(0, w+1)
+            result = texture[y1:y1+h, x1:x1+w]
+
+        flip_y, flip_x, transpose = random_state.randint(0, 2, size=(3,))
+        if flip_y:
+            result = result[::-1, :]
+        if flip_x:
+            result = result[:, ::-1]
+        if transpose and h == w:
+            result = result.T
+
+        return np.array(result, copy=True)
+
+    def _evict(self, keep):
+        while self.nb_bytes > self.max_bytes and len(self._textures) > 1:
+            key = next(iter(self._textures))
+            if key == keep:
+                break
+            textures, _counters = self._textures.pop(key)
+            self.nb_bytes -= sum([texture.nbytes for texture in textures if texture is not None])
+
+    def clear(self):
+        """
+        Remove all cached textures from the bank.
+        """
+        self._textures = OrderedDict()
+        self.nb_bytes = 0
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        return "NoiseTextureBank(nb_textures=%d, max_bytes=%d, refresh_after=%s, exponent_bucket_size=%s)" % (
+            self.nb_textures, self.max_bytes, str(self.refresh_after), str(self.exponent_bucket_size))
+
+
 class SimplexNoise(StochasticParameter):
     """
     A parameter that generates simplex noise of varying resolutions.
@@ -2152,6 +2812,16 @@ class SimplexNoise(StochasticParameter):
         edges. The method may be provided as a StochasticParameter, which
         will be queried per call to ``_draw_samples()``.
 
+    texture_bank : None or bool or imgaug.parameters.NoiseTextureBank, optional
+        Bank of cached low resolution noise planes to draw from instead of
+        generating a new plane for every call.
+
+            * If None or False, then a new plane is generated for every call.
+            * If True, then a new :class:`imgaug.parameters.NoiseTextureBank`
+              with default settings will be used.
+            * If a NoiseTextureBank, then that bank will be used. It may be
+              shared between several parameters.
+
     Examples
     --------
     >>> param = SimplexNoise(upscale_method="linear")
@@ -2163,8 +2833,9 @@ class SimplexNoise(StochasticParameter):
     Results in rectangular simplex noise of rather high detail.
 
     """
-    def __init__(self, size_px_max=(2, 16), upscale_method=["linear", "nearest"]): # pylint: disable=locally-disabled, dangerous-default-value, line-too-long
+    def __init__(self, size_px_max=(2, 16), upscale_method=["linear", "nearest"], texture_bank=None): # pylint: disable=locally-disabled, dangerous-default-value, line-too-long
         super(SimplexNoise, self).__init__()
+        self.texture_bank = _handle_texture_bank_param(texture_bank)
         self.size_px_max = handle_discrete_param(size_px_max, "size_px_max", value_range=(1, 10000))
 
         if upscale_method == ia.ALL:
@@ -2224,12 +2895,12 @@ class SimplexNoise(StochasticParameter):
         h_small = max(h_small, 1)
         w_small = max(w_small, 1)
 
-        generator = OpenSimplex(seed=seed)
-        noise = np.zeros((h_small, w_small), dtype=np.float32)
-        for y in sm.xrange(h_small):
-            for x in sm.xrange(w_small):
-                noise[y, x] = generator.noise2d(y=y, x=x)
-        noise_0to1 = (noise + 0.5) / 2
+        if self.texture_bank is not None:
+            noise_0to1 = self.texture_bank.draw(
+                ("simplex", h_small, w_small), (h_small, w_small), self._generate_noise,
+                ia.new_random_state(seed+1))
+        else:
+            noise_0to1 = self._generate_noise((h_small, w_small), seed)
 
         if noise_0to1.shape != (h, w):
             noise_0to1_uint8 = (noise_0to1 * 255).astype(np.uint8)
@@ -2239,23 +2910,42 @@ class SimplexNoise(StochasticParameter):
 
         return noise_0to1
 
+    @classmethod
+    def _generate_noise(cls, shape, seed):
+        h, w = shape
+        generator = OpenSimplex(seed=seed)
+        ys, xs = np.mgrid[0:h, 0:w]
+        noise = generator.noise2d_array(xs=xs, ys=ys).astype(np.float32)
+        return (noise + 0.5) / 2
+
     def __repr__(self):
         return self.__str__()
 
     def __str__(self):
-        return "SimplexNoise(%s, %s)" % (
+        return "SimplexNoise(%s, %s, texture_bank=%s)" % (
             str(self.size_px_max),
-            str(self.upscale_method)
+            str(self.upscale_method),
+            str(self.texture_bank)
         )
 
 
+def _irfft2(spectrum, shape):
+    # scipy.fft keeps float32 precision, numpy.fft always computes in float64
+    try:
+        import scipy.fft
+        return scipy.fft.irfft2(spectrum, s=shape, axes=(-2, -1))
+    except ImportError:  # scipy < 1.4
+        return np.fft.irfft2(spectrum, s=shape, axes=(-2, -1)).astype(np.float32)
+
+
 class FrequencyNoise(StochasticParameter):
     """
     Parameter to generate noise of varying frequencies.
 
     This parameter expects to sample noise for 2d planes, i.e. for
     sizes ``(H, W)`` and will return a value in the range ``[0.0, 1.0]`` per location
-    in that plane.
+    in that plane. Stacks of ``N`` independent planes may be sampled at once via
+    sizes ``(N, H, W)``, which is faster than sampling them one by one.
 
     The exponent controls the frequencies and therefore noise patterns.
     Low values (around -4.0) will result in large blobs. High values (around
@@ -2315,6 +3005,17 @@ class FrequencyNoise(StochasticParameter):
             * If StochasticParameter, then a random value will be sampled
               from that parameter per iteration.
 
+    texture_bank : None or bool or imgaug.parameters.NoiseTextureBank, optional
+        Bank of cached low resolution noise planes to draw from instead of
+        generating a new plane for every call. Exponents are grouped into
+        buckets, see :class:`imgaug.parameters.NoiseTextureBank`.
+
+            * If None or False, then a new plane is generated for every call.
+            * If True, then a new :class:`imgaug.parameters.NoiseTextureBank`
+              with default settings will be used.
+            * If a NoiseTextureBank, then that bank will be used. It may be
+              shared between several parameters.
+
     Examples
     --------
     >>> param = FrequencyNoise(exponent=-2, size_px_max=(16, 32), upscale_method="linear")
@@ -2322,8 +3023,12 @@ class FrequencyNoise(StochasticParameter):
     Generates noise with cloud-like patterns.
 
     """
-    def __init__(self, exponent=(-4, 4), size_px_max=(4, 32), upscale_method=["linear", "nearest"]): # pylint: disable=locally-disabled, dangerous-default-value, line-too-long
+    # cache of distance matrices per plane shape, shared by all instances
+    _DISTANCE_MATRICES = dict()
+
+    def __init__(self, exponent=(-4, 4), size_px_max=(4, 32), upscale_method=["linear", "nearest"], texture_bank=None): # pylint: disable=locally-disabled, dangerous-default-value, line-too-long
         super(FrequencyNoise, self).__init__()
+        self.texture_bank = _handle_texture_bank_param(texture_bank)
         self.exponent = handle_continuous_param(exponent, "exponent")
         self.size_px_max = handle_discrete_param(size_px_max, "size_px_max", value_range=(1, 10000))
 
@@ -2346,13 +3051,55 @@ class FrequencyNoise(StochasticParameter):
         #   http://www.redblobgames.com/articles/noise/2d/
         #   http://www.redblobgames.com/articles/noise/2d/2d-noise.js
 
-        ia.do_assert(len(size) == 2, "Expected requested noise to have shape (H, W), got shape %s." % (size,))
+        ia.do_assert(len(size) in [2, 3],
+                     "Expected requested noise to have shape (H, W) or (N, H, W), got shape %s." % (size,))
+        if len(size) == 2:
+            return self._draw_samples((1,) + tuple(size), random_state)[0]
 
+        nb_fields, h, w = size
         seed = random_state.randint(0, 10**6)
+        sizes_px_max = self.size_px_max.draw_samples((nb_fields,), random_state=ia.new_random_state(seed))
+        upscale_methods = self.upscale_method.draw_samples((nb_fields,), random_state=ia.new_random_state(seed+1))
+        random_state_noise = ia.new_random_state(seed+2)
+        exponents = self.exponent.draw_samples((nb_fields,), random_state=ia.new_random_state(seed+3))
+
+        # Sample the low resolution planes. Planes of the same shape are generated
+        # together using one batched inverse FFT.
+        noises_small = [None] * nb_fields
+        groups = defaultdict(list)
+        for i, (size_px_max, exponent) in enumerate(zip(sizes_px_max, exponents)):
+            h_small, w_small = self._get_small_shape((h, w), size_px_max)
+            if self.texture_bank is not None:
+                exponent = self.texture_bank.get_exponent_bucket(exponent)
+                noises_small[i] = self.texture_bank.draw(
+                    ("frequency", h_small, w_small, exponent), (h_small, w_small),
+                    lambda shape, seed_texture: self._generate_noise(shape, exponent, seed_texture),
+                    random_state_noise, periodic=True)
+            else:
+                groups[(h_small, w_small)].append((i, exponent))
+
+        for shape_small, group in groups.items():
+            indices, exponents_group = zip(*group)
+            noises_group = self._generate_noises(shape_small, exponents_group, random_state_noise)
+            for i, noise_small in zip(indices, noises_group):
+                noises_small[i] = noise_small
+
+        # upscale from low resolution to image size
+        result = np.zeros((nb_fields, h, w), dtype=np.float32)
+        for i, (upscale_method, noise_small) in enumerate(zip(upscale_methods, noises_small)):
+            if noise_small.shape != (h, w):
+                noise = ia.imresize_single_image(noise_small[..., np.newaxis], (h, w), interpolation=upscale_method)
+                # cubic interpolation can overshoot
+                np.clip(noise[..., 0], 0.0, 1.0, out=result[i])
+            else:
+                result[i] = noise_small
 
+        return result
+
+    @classmethod
+    def _get_small_shape(cls, size, size_px_max):
         h, w = size
         maxlen = max(h, w)
-        size_px_max = self.size_px_max.draw_sample(random_state=ia.new_random_state(seed))
         if maxlen > size_px_max:
             downscale_factor = size_px_max / maxlen
             h_small = int(h * downscale_factor)
@@ -2364,60 +3111,72 @@ class FrequencyNoise(StochasticParameter):
         # don't go below Hx4 or 4xW
         h_small = max(h_small, 4)
         w_small = max(w_small, 4)
+        return h_small, w_small
+
+    def _generate_noise(self, shape, exponent, seed):
+        return self._generate_noises(shape, [exponent], ia.new_random_state(seed))[0]
 
-        # generate random base matrix
-        wn_r = ia.new_random_state(seed+1).rand(h_small, w_small)
-        wn_a = ia.new_random_state(seed+2).rand(h_small, w_small)
+    def _generate_noises(self, shape, exponents, random_state):
+        # Only the non-redundant half of the spectrum of a real signal is generated,
+        # the inverse transformation is then a real-valued one (irfft2).
+        h_small, w_small = shape
+        shape_spectrum = (h_small, w_small // 2 + 1)
+        nb_noises = len(exponents)
 
-        wn_r = wn_r * (max(h_small, w_small) ** 2)
-        wn_a = wn_a * 2 * np.pi
+        # generate random base matrices
+        wn_r = random_state.rand(nb_noises, *shape_spectrum).astype(np.float32)
+        wn_a = random_state.rand(nb_noises, *shape_spectrum).astype(np.float32)
 
-        wn_r = wn_r * np.cos(wn_a)
+        wn_r *= max(h_small, w_small) ** 2
+        wn_a *= 2 * np.pi
+
+        wn_r *= np.cos(wn_a)
         wn_a = wn_r * np.sin(wn_a)
 
         # pronounce some frequencies
-        exponent = self.exponent.draw_sample(random_state=ia.new_random_state(seed+3))
         # this has some similarity with a distance map from the center, but looks a bit more like a cross
-        f = self._create_distance_matrix((h_small, w_small))
-        f[0, 0] = 1 # necessary to prevent -inf from appearing
-        scale = f ** exponent
-        scale[0, 0] = 0
-        tr = wn_r * scale
-        ti = wn_a * scale
+        f = self._get_distance_matrix(shape_spectrum, h_small, w_small)
+        scale = np.power(f[np.newaxis, ...], np.float32(exponents).reshape((nb_noises, 1, 1)))
+        scale[:, 0, 0] = 0
 
-        wn_freqs_mul = np.zeros(tr.shape, dtype=np.complex)
-        wn_freqs_mul.real = tr
-        wn_freqs_mul.imag = ti
+        wn_freqs_mul = np.zeros(wn_r.shape, dtype=np.complex64)
+        wn_freqs_mul.real = wn_r * scale
+        wn_freqs_mul.imag = wn_a * scale
 
-        wn_inv = np.fft.ifft2(wn_freqs_mul).real
+        wn_inv = _irfft2(wn_freqs_mul, (h_small, w_small))
 
         # normalize to 0 to 1
-        wn_inv_min = np.min(wn_inv)
-        wn_inv_max = np.max(wn_inv)
-        noise_0to1 = (wn_inv - wn_inv_min) / (wn_inv_max - wn_inv_min)
-
-        # upscale from low resolution to image size
-        upscale_method = self.upscale_method.draw_sample(random_state=ia.new_random_state(seed+1))
-        if noise_0to1.shape != (size[0], size[1]):
-            noise_0to1_uint8 = (noise_0to1 * 255).astype(np.uint8)
-            noise_0to1_3d = np.tile(noise_0to1_uint8[..., np.newaxis], (1, 1, 3))
-            noise_0to1 = ia.imresize_single_image(noise_0to1_3d, (size[0], size[1]), interpolation=upscale_method)
-            noise_0to1 = (noise_0to1[..., 0] / 255.0).astype(np.float32)
-
-        return noise_0to1
-
-    def _create_distance_matrix(self, size):
-        h, w = size
-
-        def _freq(yy, xx):
-            f1 = np.minimum(yy, h-yy)
-            f2 = np.minimum(xx, w-xx)
-            return np.sqrt(f1**2 + f2**2)
-
-        return scipy.fromfunction(_freq, (h, w))
+        wn_inv_min = np.min(wn_inv, axis=(1, 2), keepdims=True)
+        wn_inv_max = np.max(wn_inv, axis=(1, 2), keepdims=True)
+        return ((wn_inv - wn_inv_min) / (wn_inv_max - wn_inv_min)).astype(np.float32)
+
+    @classmethod
+    def _get_distance_matrix(cls, size, h, w):
+        # Distance matrices only depend on the plane shape and are hence cached.
+        # The value at (0, 0) is set to 1 to prevent -inf from appearing.
+        key = (size, h, w)
+        f = cls._DISTANCE_MATRICES.get(key)
+        if f is None:
+            if len(cls._DISTANCE_MATRICES) >= 256:
+                cls._DISTANCE_MATRICES.clear()
+            f = cls._create_distance_matrix(size, h, w).astype(np.float32)
+            f[0, 0] = 1
+            cls._DISTANCE_MATRICES[key] = f
+        return f
+
+    @classmethod
+    def _create_distance_matrix(cls, size, h=None, w=None):
+        # (h, w) is the shape of the full plane, size may be the shape of only a part of it
+        h = size[0] if h is None else h
+        w = size[1] if w is None else w
+        yy, xx = np.ogrid[0:size[0], 0:size[1]]
+        f1 = np.minimum(yy, h-yy)
+        f2 = np.minimum(xx, w-xx)
+        return np.sqrt(f1**2 + f2**2)
 
     def __repr__(self):
         return self.__str__()
 
     def __str__(self):
-        return "FrequencyNoise(%s, %s, %s)" % (str(self.exponent), str(self.size_px_max), str(self.upscale_method))
+        return "FrequencyNoise(%s, %s, %s, texture_bank=%s)" % (
+            str(self.exponent), str(self.size_px_max), str(self.upscale_method), str(self.texture_bank))
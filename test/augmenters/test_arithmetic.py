@@ -32,6 +32,7 @@ def main():
     test_ReplaceElementwise()
     test_Invert()
     test_ContrastNormalization()
+    test_JpegCompression()
 
     time_end = time.time()
     print("<%s> Finished without errors in %.4fs." % (__file__, time_end - time_start,))
@@ -187,6 +188,50 @@ def test_AdditiveGaussianNoise():
     assert 75 < seen[0] < 125
     assert 75 < seen[1] < 125
 
+    # distribution of the noise in multi-channel images
+    images = np.ones((4, 64, 64, 3), dtype=np.uint8) * 128
+    for per_channel in [False, True]:
+        aug = iaa.AdditiveGaussianNoise(loc=5, scale=20, per_channel=per_channel)
+        observed = aug.augment_images(images)
+        assert observed.shape == images.shape
+        assert observed.dtype.type == np.uint8
+        noise = observed.astype(np.int32) - 128
+        assert 4 < np.average(noise) < 6
+        assert 19 < np.std(noise) < 21
+        for i in sm.xrange(len(images)):
+            same_channels = np.array_equal(noise[i, :, :, 0], noise[i, :, :, 1])
+            assert same_channels != per_channel
+        # noise differs between images
+        assert not np.array_equal(noise[0], noise[1])
+
+    # single-channel images keep their shape
+    aug = iaa.AdditiveGaussianNoise(loc=0, scale=20)
+    observed = aug.augment_image(np.ones((8, 8, 1), dtype=np.uint8) * 128)
+    assert observed.shape == (8, 8, 1)
+
+    # additions saturate at 0 and 255
+    aug = iaa.AdditiveGaussianNoise(loc=20, scale=1)
+    observed = aug.augment_image(np.ones((8, 8, 3), dtype=np.uint8) * 250)
+    assert np.all(observed == 255)
+    aug = iaa.AdditiveGaussianNoise(loc=-20, scale=1)
+    observed = aug.augment_image(np.ones((8, 8, 3), dtype=np.uint8) * 5)
+    assert np.all(observed == 0)
+
+    # the same seed leads to the same noise, independent of previously augmented images
+    images = np.ones((2, 64, 64, 3), dtype=np.uint8) * 128
+    observed1 = iaa.AdditiveGaussianNoise(scale=10, random_state=1).augment_images(images)
+    _ = iaa.AdditiveGaussianNoise(scale=10, per_channel=True).augment_image(
+        np.ones((1024, 1024, 3), dtype=np.uint8) * 128)
+    observed2 = iaa.AdditiveGaussianNoise(scale=10, random_state=1).augment_images(images)
+    assert np.array_equal(observed1, observed2)
+
+    # very large scales do not overflow
+    aug = iaa.AdditiveGaussianNoise(loc=0, scale=10**6)
+    observed = aug.augment_image(np.ones((32, 32, 3), dtype=np.uint8) * 128)
+    nb_saturated = np.sum(observed == 0) + np.sum(observed == 255)
+    assert nb_saturated == observed.size
+    assert 0.4 < np.average(observed == 255) < 0.6
+
     # test exceptions for wrong parameter types
     got_exception = False
     try:
@@ -378,6 +423,27 @@ def test_CoarseDropout():
     assert 150 < seen[0] < 250
     assert 150 < seen[1] < 250
 
+    # batches given as arrays are sampled at once, lists per image
+    aug = iaa.CoarseDropout(p=0.5, size_px=4, per_channel=0.5, random_state=1)
+    images = np.ones((20, 16, 16, 3), dtype=np.uint8) * 100
+    for images_in in [images, list(images)]:
+        observed = aug.augment_images(images_in)
+        assert len(observed) == 20
+        for image in observed:
+            assert image.shape == (16, 16, 3)
+            assert image.dtype.type == np.uint8
+            assert np.all(np.logical_or(image == 0, image == 100))
+            assert 0.0 <= np.mean(image == 0) <= 1.0
+        per_channel = [not np.array_equal(image[..., 0], image[..., 1]) for image in observed]
+        assert 0 < sum(per_channel) < 20
+
+    # p is sampled per image, also for batches given as arrays
+    aug = iaa.CoarseDropout(p=iap.Binomial(iap.Choice([0.0, 1.0])), size_px=4, random_state=1)
+    observed = aug.augment_images(np.ones((50, 16, 16, 3), dtype=np.uint8) * 100)
+    fractions = np.average(observed == 0, axis=(1, 2, 3))
+    assert np.all(np.logical_or(fractions == 0, fractions == 1))
+    assert 0 < np.sum(fractions) < 50
+
     # test exception for bad parameters
     got_exception = False
     try:
@@ -521,6 +587,16 @@ def test_Multiply():
     assert 150 < seen[0] < 250
     assert 150 < seen[1] < 250
 
+    # test that the batch-vectorized path for arrays matches the per-image path for lists
+    aug = iaa.Multiply(mul=(0.5, 1.5), per_channel=0.5)
+    aug_det = aug.to_deterministic()
+    images = np.random.RandomState(1).randint(0, 255, size=(20, 4, 4, 3)).astype(np.uint8)
+    observed_array = aug_det.augment_images(images)
+    observed_list = aug_det.augment_images(list(images))
+    assert ia.is_np_array(observed_array)
+    assert observed_array.dtype.type == np.uint8
+    assert array_equal_lists(list(observed_array), observed_list)
+
     # test exceptions for wrong parameter types
     got_exception = False
     try:
@@ -885,6 +961,116 @@ def test_ReplaceElementwise():
     assert params[1].value == 2
     assert params[2].value == 0
 
+    # uint8 images are changed in-place, other dtypes via float32
+    for dtype in [np.uint8, np.float32, np.int32]:
+        images = np.full((4, 8, 8, 3), 100, dtype=dtype)
+        for images_in in [images, list(images)]:
+            aug = iaa.ReplaceElementwise(mask=0.5, replacement=iap.Choice([-50, 300]), per_channel=0.5)
+            observed = aug.augment_images(images_in)
+            for image in observed:
+                assert image.dtype.type == dtype
+                assert np.all(np.logical_or(np.logical_or(image == 0, image == 100), image == 255))
+                assert 0.1 < np.mean(image != 100) < 0.9
+
+    # sparse and dense mode lead to the same distribution of outputs
+    # (the sparse mode is only used for images with enough mask values)
+    images = np.full((2, 384, 384, 3), 100, dtype=np.uint8)
+    for per_channel in [False, True]:
+        fractions = []
+        for sparse_threshold in [None, 1.0]:
+            aug = iaa.ReplaceElementwise(mask=0.1, replacement=iap.Choice([0, 255]), per_channel=per_channel,
+                                         sparse_threshold=sparse_threshold, random_state=1)
+            observed = aug.augment_images(images)
+            assert observed.dtype.type == np.uint8
+            assert np.all(np.logical_or(np.logical_or(observed == 0, observed == 100), observed == 255))
+            if not per_channel:
+                assert np.array_equal(observed[..., 0], observed[..., 1])
+                assert np.array_equal(observed[..., 0], observed[..., 2])
+            fractions.append([np.mean(observed == 0), np.mean(observed == 255)])
+        assert np.allclose(fractions[0], fractions[1], atol=0.01)
+        assert np.allclose(fractions[0], [0.05, 0.05], atol=0.01)
+
+    # in batches, images with probabilities above the threshold receive dense masks
+    # for their already sampled probabilities
+    images = np.full((12, 384, 384, 1), 100, dtype=np.uint8)
+    aug = iaa.ReplaceElementwise(mask=iap.Binomial(iap.Choice([0.01, 0.5])), replacement=255,
+                                 sparse_threshold=0.05, random_state=1)
+    fractions = np.mean(aug.augment_images(images) == 255, axis=(1, 2, 3))
+    assert np.all(np.logical_or(np.isclose(fractions, 0.01, atol=0.005), np.isclose(fractions, 0.5, atol=0.01)))
+    assert 0 < np.sum(fractions < 0.1) < 12
+
+    # small images are never augmented sparsely
+    images = np.full((4, 32, 32, 3), 100, dtype=np.uint8)
+    aug = iaa.ReplaceElementwise(mask=0.01, replacement=255, sparse_threshold=1.0)
+    aug._replace_sparse = None
+    observed = aug.augment_images(images)
+    assert np.all(np.logical_or(observed == 100, observed == 255))
+
+    # masked and full sampling of replacement values lead to the same distribution of outputs
+    images = np.full((20, 32, 32, 3), 100, dtype=np.uint8)
+    for images_in in [images, list(images)]:
+        for per_channel in [False, True]:
+            fractions = []
+            for replacement_sampling in ["masked", "full"]:
+                aug = iaa.ReplaceElementwise(mask=0.5, replacement=iap.Choice([0, 255]), per_channel=per_channel,
+                                             sparse_threshold=None, replacement_sampling=replacement_sampling,
+                                             random_state=1)
+                observed = np.array(aug.augment_images(images_in))
+                assert np.all(np.logical_or(np.logical_or(observed == 0, observed == 100), observed == 255))
+                if not per_channel:
+                    assert np.array_equal(observed[..., 0], observed[..., 1])
+                    assert np.array_equal(observed[..., 0], observed[..., 2])
+                fractions.append([np.mean(observed == 0), np.mean(observed == 255)])
+            assert np.allclose(fractions[0], fractions[1], atol=0.02)
+            assert np.allclose(fractions[0], [0.25, 0.25], atol=0.02)
+
+    # full sampling reproduces the outputs of imgaug 0.2.6
+    aug = iaa.ReplaceElementwise(mask=0.5, replacement=iap.Choice([0, 255]), per_channel=0.5,
+                                 replacement_sampling="full", random_state=1)
+    observed = aug.augment_images(np.full((2, 3, 4, 2), 100, dtype=np.uint8))
+    expected_c0 = np.uint8([
+        [[255, 100, 100, 100],
+         [100, 100, 255, 100],
+         [100, 0, 100, 0]],
+        [[0, 100, 0, 100],
+         [100, 100, 255, 255],
+         [0, 100, 100, 100]]
+    ])
+    expected_c1 = np.uint8([
+        [[255, 100, 100, 100],
+         [100, 100, 255, 100],
+         [100, 0, 100, 0]],
+        [[100, 100, 100, 100],
+         [100, 255, 255, 100],
+         [100, 0, 255, 100]]
+    ])
+    assert np.array_equal(observed[..., 0], expected_c0)
+    assert np.array_equal(observed[..., 1], expected_c1)
+
+    # masked sampling only samples as many replacement values as there are marked locations
+    class _CountingParameter(iap.StochasticParameter):
+        def __init__(self):
+            super(_CountingParameter, self).__init__()
+            self.nb_samples = 0
+
+        def _draw_samples(self, size, random_state):
+            self.nb_samples += int(np.prod(size))
+            return np.full(size, 255, dtype=np.float32)
+
+    replacement = _CountingParameter()
+    aug = iaa.ReplaceElementwise(mask=0.1, replacement=replacement, sparse_threshold=None)
+    observed = aug.augment_images(np.zeros((4, 32, 32, 3), dtype=np.uint8))
+    assert replacement.nb_samples == np.sum(observed[..., 0] == 255)
+    assert replacement.nb_samples < 0.2 * 4 * 32 * 32
+
+    # an unknown sampling mode raises an exception
+    got_exception = False
+    try:
+        _ = iaa.ReplaceElementwise(mask=0.1, replacement=0, replacement_sampling="test")
+    except Exception:
+        got_exception = True
+    assert got_exception
+
 
 def test_SaltAndPepper():
     reseed()
@@ -1312,6 +1498,16 @@ def test_Add():
     assert 150 < seen[0] < 250
     assert 150 < seen[1] < 250
 
+    # test that the batch-vectorized path for arrays matches the per-image path for lists
+    aug = iaa.Add(value=(-50, 50), per_channel=0.5)
+    aug_det = aug.to_deterministic()
+    images = np.random.RandomState(1).randint(0, 255, size=(20, 4, 4, 3)).astype(np.uint8)
+    observed_array = aug_det.augment_images(images)
+    observed_list = aug_det.augment_images(list(images))
+    assert ia.is_np_array(observed_array)
+    assert observed_array.dtype.type == np.uint8
+    assert array_equal_lists(list(observed_array), observed_list)
+
     # test exceptions for wrong parameter types
     got_exception = False
     try:
@@ -1749,5 +1945,59 @@ def test_ContrastNormalization():
     assert params[1].value == 0
 
 
+
+def test_JpegCompression():
+    reseed()
+
+    # smooth gradient image with some noise, strong compression removes the noise
+    image = np.tile(np.arange(64)[np.newaxis, :, np.newaxis] * 4, (64, 1, 3)).astype(np.uint8)
+    image = np.clip(image.astype(np.int32) + np.random.randint(-20, 20, size=image.shape), 0, 255).astype(np.uint8)
+
+    aug = iaa.JpegCompression(compression=0)
+    observed = aug.augment_image(image)
+    assert observed.shape == image.shape
+    assert observed.dtype.type == np.uint8
+    diff_weak = np.average(np.abs(observed.astype(np.int32) - image.astype(np.int32)))
+
+    aug = iaa.JpegCompression(compression=100)
+    observed = aug.augment_image(image)
+    diff_strong = np.average(np.abs(observed.astype(np.int32) - image.astype(np.int32)))
+    assert diff_strong > diff_weak
+
+    # single-channel images and lists of images
+    images = [image[..., 0:1], image]
+    observed = aug.augment_images(images)
+    assert isinstance(observed, list)
+    assert observed[0].shape == (64, 64, 1)
+    assert observed[1].shape == (64, 64, 3)
+
+    # the number of threads does not affect the results
+    images = np.tile(image[np.newaxis, ...], (8, 1, 1, 1))
+    observed = []
+    for nb_workers in [1, 4]:
+        aug = iaa.JpegCompression(compression=(0, 100), nb_workers=nb_workers, random_state=1)
+        observed.append(aug.augment_images(images))
+    assert np.array_equal(observed[0], observed[1])
+    assert observed[0].shape == images.shape
+
+    # keypoints are not changed
+    keypoints = [ia.KeypointsOnImage([ia.Keypoint(x=1, y=2)], shape=image.shape)]
+    assert keypoints_equal(aug.augment_keypoints(keypoints), keypoints)
+
+    # test exceptions for wrong parameter values
+    got_exception = False
+    try:
+        _ = iaa.JpegCompression(compression=50, nb_workers=0)
+    except Exception:
+        got_exception = True
+    assert got_exception
+
+    # test get_parameters()
+    aug = iaa.JpegCompression(compression=50)
+    params = aug.get_parameters()
+    assert isinstance(params[0], iap.Deterministic)
+    assert params[0].value == 50
+
+
 if __name__ == "__main__":
     main()
@@ -2,6 +2,8 @@ from __future__ import print_function, division, absolute_import
 
 import time
 import copy
+import json
+import pickle
 import warnings
 
 import matplotlib
@@ -27,16 +29,23 @@ def main():
     test_clip_augmented_image()
     test_clip_augmented_images_()
     test_clip_augmented_images()
+    test_apply_luts_uint8_()
+    test_add_elementwise_uint8()
+    test_multiply_elementwise_uint8()
     test_reduce_to_nonempty()
     test_invert_reduce_to_nonempty()
     test_Augmenter()
     test_Augmenter_augment_keypoints()
     test_Augmenter_augment_segmentation_maps()
+    test_Augmenter_augment_without_copy()
     test_Augmenter_find()
     test_Augmenter_remove()
     test_Augmenter_hooks()
     test_Augmenter_copy_random_state()
+    test_Augmenter_random_state_per_call()
     test_Augmenter_augment_batches()
+    test_Augmenter_augment_batch()
+    test_Augmenter_apply_records()
     test_Sequential()
     test_SomeOf()
     test_OneOf()
@@ -702,6 +711,81 @@ def test_clip_augmented_images():
     assert all([images_clipped[i][0, 2] == 25 for i in sm.xrange(len(images))])
 
 
+def test_apply_luts_uint8_():
+    images = np.arange(2*4*4*3).reshape((2, 4, 4, 3)).astype(np.uint8)
+    luts = np.zeros((2, 256, 3), dtype=np.uint8)
+    luts[0] = np.arange(256)[:, np.newaxis] * np.array([0, 1, 2])[np.newaxis, :] % 256
+    luts[1] = 255 - np.arange(256)[:, np.newaxis]
+    expected = [
+        np.stack([luts[0][images[0, ..., c], c] for c in sm.xrange(3)], axis=-1),
+        255 - images[1]
+    ]
+    images_aug = iaa.apply_luts_uint8_(np.copy(images), luts)
+    assert images_aug.shape == images.shape
+    assert images_aug.dtype.type == np.uint8
+    assert np.array_equal(images_aug[0], expected[0])
+    assert np.array_equal(images_aug[1], expected[1])
+
+    # list of images with different numbers of channels and 1D tables
+    images = [np.arange(4*4*c).reshape((4, 4, c)).astype(np.uint8) for c in [1, 3, 600]]
+    luts = [255 - np.arange(256).astype(np.uint8) for _ in images]
+    images_aug = iaa.apply_luts_uint8_([np.copy(image) for image in images], luts)
+    assert isinstance(images_aug, list)
+    for image, image_aug in zip(images, images_aug):
+        assert image_aug.shape == image.shape
+        assert np.array_equal(image_aug, 255 - image)
+
+    # channelwise tables for images with more channels than cv2 supports
+    image = np.arange(2*2*600).reshape((2, 2, 600)).astype(np.uint8)
+    lut = np.tile(255 - np.arange(256).astype(np.uint8)[:, np.newaxis], (1, 600))
+    image_aug = iaa.apply_luts_uint8_([image], [lut])[0]
+    assert np.array_equal(image_aug, 255 - np.arange(2*2*600).reshape((2, 2, 600)).astype(np.uint8))
+
+    # empty images
+    image = np.zeros((0, 4, 3), dtype=np.uint8)
+    image_aug = iaa.apply_luts_uint8_([image], [np.arange(256).astype(np.uint8)])[0]
+    assert image_aug.shape == (0, 4, 3)
+
+
+def test_add_elementwise_uint8():
+    image = np.uint8([[[0, 100, 250]], [[10, 128, 255]]])
+    values = np.int32([[[-10, 20, 10]], [[5, -200, -300]]])
+    image_aug = iaa.add_elementwise_uint8(image, values)
+    assert image_aug.shape == image.shape
+    assert image_aug.dtype.type == np.uint8
+    assert np.array_equal(image_aug, np.clip(image.astype(np.int32) + values, 0, 255))
+
+    # values of shape (H,W,1) are added to all channels
+    for nb_channels in [1, 3, 600]:
+        image = np.random.randint(0, 256, size=(8, 8, nb_channels)).astype(np.uint8)
+        values = np.random.randint(-300, 300, size=(8, 8, 1)).astype(np.int16)
+        image_aug = iaa.add_elementwise_uint8(image, values)
+        assert image_aug.shape == image.shape
+        assert np.array_equal(image_aug, np.clip(image.astype(np.int32) + values, 0, 255))
+
+    # only uint8 is supported
+    got_exception = False
+    try:
+        _ = iaa.add_elementwise_uint8(np.zeros((2, 2, 1), dtype=np.float32), np.zeros((2, 2, 1), dtype=np.int16))
+    except Exception:
+        got_exception = True
+    assert got_exception
+
+
+def test_multiply_elementwise_uint8():
+    images = np.uint8([[[[0, 100, 200]], [[10, 128, 255]]]])
+    values = np.float32([[[[2.0, 1.5, 1.5]], [[0.55, 0.0, 0.99]]]])
+    images_aug = iaa.multiply_elementwise_uint8(images, values)
+    assert images_aug.shape == images.shape
+    assert images_aug.dtype.type == np.uint8
+    assert np.array_equal(images_aug, np.uint8([[[[0, 150, 255]], [[5, 0, 252]]]]))
+
+    # values are broadcasted
+    image = np.full((4, 4, 3), 100, dtype=np.uint8)
+    image_aug = iaa.multiply_elementwise_uint8(image, np.full((4, 4, 1), 0.5))
+    assert np.all(image_aug == 50)
+
+
 def test_reduce_to_nonempty():
     kpsois = [
         ia.KeypointsOnImage([ia.Keypoint(x=0, y=1)], shape=(4, 4, 3)),
@@ -1224,6 +1308,63 @@ def test_Augmenter_augment_keypoints():
     assert len(kpsoi_aug[1].keypoints) == 0
 
 
+def test_Augmenter_augment_without_copy():
+    reseed()
+
+    # copy=True (default) does not change the input, copy=False may augment in-place
+    aug = iaa.Fliplr(1.0)
+    images = np.zeros((2, 4, 4, 3), dtype=np.uint8)
+    images[:, :, 0, :] = 255
+    observed = aug.augment_images(images)
+    assert np.all(observed[:, :, 3, :] == 255)
+    assert np.all(images[:, :, 0, :] == 255)
+
+    observed = aug.augment_images(images, copy=False)
+    assert np.all(observed[:, :, 3, :] == 255)
+    assert np.all(images[:, :, 3, :] == 255)
+
+    # list inputs may be changed in-place, but the list itself stays unchanged
+    aug = iaa.Add(1)
+    images = [np.zeros((4, 4, 3), dtype=np.uint8), np.zeros((2, 2), dtype=np.uint8)]
+    images_list = list(images)
+    observed = aug.augment_images(images, copy=False)
+    assert all([np.all(image == 1) for image in observed])
+    assert observed[1].shape == (2, 2)
+    assert all([image_a is image_b for image_a, image_b in zip(images, images_list)])
+
+    # keypoints
+    aug = iaa.Affine(translate_px={"x": 1})
+    kpsoi = ia.KeypointsOnImage([ia.Keypoint(x=1, y=1)], shape=(4, 4, 3))
+    observed = aug.augment_keypoints([kpsoi], copy=False)
+    assert np.isclose(observed[0].keypoints[0].x, 2)
+    assert np.isclose(kpsoi.keypoints[0].x, 1)
+
+    aug = iaa.Fliplr(1.0)
+    observed = aug.augment_keypoints([kpsoi], copy=False)
+    assert np.isclose(observed[0].keypoints[0].x, 2)
+    assert np.isclose(kpsoi.keypoints[0].x, 2)
+
+    # heatmaps
+    heatmaps_arr = np.float32([[0.0, 1.0]])[..., np.newaxis]
+    heatmaps = ia.HeatmapsOnImage(heatmaps_arr, shape=(1, 2, 3))
+    observed = aug.augment_heatmaps([heatmaps], copy=False)
+    assert np.allclose(observed[0].get_arr(), np.fliplr(heatmaps_arr))
+    assert np.allclose(heatmaps.get_arr(), np.fliplr(heatmaps_arr))
+
+    # nested augmenters do not copy, but the topmost augmenter does
+    aug = iaa.Sequential([
+        iaa.Add(1),
+        iaa.SomeOf(2, [iaa.Add(1), iaa.Multiply(2)]),
+        iaa.Sometimes(1.0, iaa.Add(1)),
+        iaa.WithChannels([0], iaa.Add(1))
+    ])
+    images = np.zeros((2, 4, 4, 3), dtype=np.uint8)
+    observed = aug.augment_images(images)
+    assert np.all(observed[..., 0] == 6)
+    assert np.all(observed[..., 1:] == 5)
+    assert np.all(images == 0)
+
+
 def test_Augmenter_augment_segmentation_maps():
     reseed()
 
@@ -2056,6 +2197,102 @@ def test_Sequential():
     observed = aug.augment_image(image)
     assert np.array_equal(observed, np.fliplr(np.flipud(image)))
 
+    # runs of pointwise augmenters are fused into a lookup table, which should
+    # produce the same outputs as executing the augmenters one by one
+    # (hooks with an activator deactivate the fusion)
+    def _create_pointwise_seq():
+        return iaa.Sequential([
+            iaa.Add((-40, 40), per_channel=0.5, random_state=1),
+            iaa.Multiply((0.5, 1.5), per_channel=0.5, random_state=2),
+            iaa.Invert(0.5, per_channel=0.5, random_state=3),
+            iaa.Fliplr(0.5, random_state=4),
+            iaa.ContrastNormalization((0.5, 1.5), per_channel=0.5, random_state=5),
+            iaa.GammaContrast((0.5, 2.0), per_channel=0.5, random_state=6),
+            iaa.LinearContrast((0.5, 1.5), per_channel=0.5, random_state=7)
+        ], random_state=8)
+
+    hooks = ia.HooksImages(activator=lambda images, augmenter, parents, default: default)
+    aug_fused = _create_pointwise_seq()
+    aug_unfused = _create_pointwise_seq()
+    images = np.random.randint(0, 255, size=(8, 4, 4, 3), dtype=np.uint8)
+    images_list = [np.random.randint(0, 255, size=(4, 5, c), dtype=np.uint8) for c in [1, 3, 4]]
+    for _ in sm.xrange(3):
+        observed = aug_fused.augment_images(images)
+        expected = aug_unfused.augment_images(images, hooks=hooks)
+        assert observed.dtype.type == np.uint8
+        assert np.array_equal(observed, expected)
+
+        observed = aug_fused.augment_images(images_list)
+        expected = aug_unfused.augment_images(images_list, hooks=hooks)
+        assert all([np.array_equal(image_obs, image_exp) for image_obs, image_exp in zip(observed, expected)])
+
+    # fuse_geometric, flips and rotations by 90 degrees need no interpolation
+    # and hence should lead to the same outputs as non-fused execution
+    aug_fused = iaa.Sequential([
+        iaa.Fliplr(0.5),
+        iaa.Flipud(0.5),
+        iaa.Rot90((0, 3), keep_size=False)
+    ], fuse_geometric=True).to_deterministic()
+    aug_unfused = aug_fused.deepcopy()
+    aug_unfused.fuse_geometric = False
+    images = np.random.randint(0, 255, size=(8, 6, 6, 3), dtype=np.uint8)
+    observed = aug_fused.augment_images(images)
+    expected = aug_unfused.augment_images(images)
+    assert np.array_equal(observed, expected)
+
+    heatmaps_arr = np.random.uniform(0.0, 1.0, size=(6, 6, 1)).astype(np.float32)
+    heatmaps = [ia.HeatmapsOnImage(heatmaps_arr, shape=(6, 6, 3)) for _ in sm.xrange(8)]
+    observed = aug_fused.augment_heatmaps([heatmaps_i.deepcopy() for heatmaps_i in heatmaps])
+    expected = aug_unfused.augment_heatmaps([heatmaps_i.deepcopy() for heatmaps_i in heatmaps])
+    for heatmaps_obs, heatmaps_exp in zip(observed, expected):
+        assert heatmaps_obs.shape == heatmaps_exp.shape
+        assert np.allclose(heatmaps_obs.arr_0to1, heatmaps_exp.arr_0to1)
+
+    # fuse_geometric, Affine followed by a resize
+    aug = iaa.Sequential([
+        iaa.Affine(translate_px={"x": 1}, order=0),
+        iaa.Scale({"height": 8, "width": 4}, interpolation="nearest")
+    ], fuse_geometric=True)
+    image = np.zeros((4, 4, 1), dtype=np.uint8)
+    image[:, 1:3, :] = 255
+    observed = aug.augment_image(image)
+    expected = np.zeros((8, 4, 1), dtype=np.uint8)
+    expected[:, 2:4, :] = 255
+    assert np.array_equal(observed, expected)
+
+    kps = [ia.KeypointsOnImage([ia.Keypoint(x=1, y=1)], shape=(4, 4, 1))]
+    observed = aug.augment_keypoints(kps)
+    assert observed[0].shape == (8, 4, 1)
+    assert np.allclose([observed[0].keypoints[0].x, observed[0].keypoints[0].y], [2, 2])
+
+    # fuse_geometric, keypoints are projected in the same way as in non-fused
+    # execution, also for augmenters that change the image size
+    kps = [ia.KeypointsOnImage([ia.Keypoint(x=1, y=2), ia.Keypoint(x=12.5, y=7), ia.Keypoint(x=0, y=9)],
+                               shape=(10, 15, 3))
+           for _ in sm.xrange(8)]
+    augs = [
+        [iaa.Fliplr(1.0), iaa.Scale({"height": 20, "width": 30})],
+        [iaa.Flipud(0.5), iaa.CropAndPad(px=((0, 3), (0, 3), (0, 3), (0, 3)), keep_size=True)],
+        [iaa.Rot90((0, 3), keep_size=True), iaa.Affine(rotate=(-20, 20))],
+        [iaa.PerspectiveTransform(scale=0.1, keep_size=True), iaa.Scale(0.5)]
+    ]
+    for children in augs:
+        aug_fused = iaa.Sequential(children, fuse_geometric=True).to_deterministic()
+        aug_unfused = aug_fused.deepcopy()
+        aug_unfused.fuse_geometric = False
+        observed = aug_fused.augment_keypoints(kps)
+        expected = aug_unfused.augment_keypoints(kps)
+        for kpsoi_obs, kpsoi_exp in zip(observed, expected):
+            assert kpsoi_obs.shape == kpsoi_exp.shape
+            assert np.allclose(kpsoi_obs.get_coords_array(), kpsoi_exp.get_coords_array(), atol=1e-4)
+
+    got_exception = False
+    try:
+        _ = iaa.Sequential([], fuse_geometric="test")
+    except Exception:
+        got_exception = True
+    assert got_exception
+
     # get_parameters
     aug = iaa.Sequential(iaa.Fliplr(1.0), random_order=False)
     assert aug.get_parameters() == [False]
@@ -2888,6 +3125,47 @@ def test_2d_inputs():
     assert array_equal_lists(observed, images_list2d3d)
 
 
+def test_Augmenter_random_state_per_call():
+    image = np.arange(4*4*3).reshape((4, 4, 3)).astype(np.uint8)
+    kps = ia.KeypointsOnImage([ia.Keypoint(x=1, y=2)], shape=image.shape)
+
+    for backend in ["mt19937", "philox"]:
+        ia.set_rng_backend(backend)
+        try:
+            aug = iaa.AdditiveGaussianNoise(scale=20, random_state=1)
+
+            # non-deterministic augmenters move their random state forward,
+            # the buffer random state is reused between calls
+            samples_before = ia.copy_random_state(aug.random_state).randint(0, 10**6, 10)
+            image_aug1 = aug.augment_image(image)
+            rs_call = aug._random_state_call
+            image_aug2 = aug.augment_image(image)
+            assert aug._random_state_call is rs_call
+            assert rs_call is not aug.random_state
+            assert not np.array_equal(image_aug1, image_aug2)
+            assert not np.array_equal(ia.copy_random_state(aug.random_state).randint(0, 10**6, 10), samples_before)
+
+            # deterministic augmenters keep their random state unchanged
+            aug_det = iaa.Sequential([iaa.Affine(translate_px=(-1, 1)), iaa.AdditiveGaussianNoise(scale=20)],
+                                     random_state=2).to_deterministic()
+            samples_before = ia.copy_random_state(aug_det[1].random_state).randint(0, 10**6, 10)
+            image_aug1 = aug_det.augment_image(image)
+            image_aug2 = aug_det.augment_image(image)
+            kps_aug1 = aug_det.augment_keypoints([kps])[0]
+            kps_aug2 = aug_det.augment_keypoints([kps])[0]
+            assert np.array_equal(image_aug1, image_aug2)
+            assert kps_aug1.keypoints[0].x == kps_aug2.keypoints[0].x
+            assert np.array_equal(ia.copy_random_state(aug_det[1].random_state).randint(0, 10**6, 10),
+                                  samples_before)
+
+            # the buffer is neither copied nor pickled
+            assert aug_det[1]._random_state_call is not None
+            assert aug_det.deepcopy()[1]._random_state_call is None
+            assert pickle.loads(pickle.dumps(aug_det))[1]._random_state_call is None
+        finally:
+            ia.set_rng_backend("mt19937")
+
+
 def test_Augmenter_augment_batches():
     reseed()
 
@@ -3092,5 +3370,171 @@ def test_Augmenter_augment_batches():
     """
 
 
+def test_Augmenter_augment_batch():
+    reseed()
+
+    image = np.zeros((6, 8, 3), dtype=np.uint8)
+    image[1, 2, :] = 255
+    heatmap_arr = np.zeros((6, 8), dtype=np.float32)
+    heatmap_arr[1, 2] = 1.0
+    segmap_arr = np.zeros((6, 8), dtype=np.int32)
+    segmap_arr[1, 2] = 1
+
+    def _create_batch(nb_images):
+        return ia.Batch(
+            images=np.uint8([image] * nb_images),
+            heatmaps=[ia.HeatmapsOnImage(heatmap_arr, shape=image.shape) for _ in sm.xrange(nb_images)],
+            segmentation_maps=[ia.SegmentationMapOnImage(segmap_arr, shape=image.shape, nb_classes=2)
+                               for _ in sm.xrange(nb_images)],
+            keypoints=[ia.KeypointsOnImage([ia.Keypoint(x=2, y=1)], shape=image.shape)
+                       for _ in sm.xrange(nb_images)],
+            bounding_boxes=[ia.BoundingBoxesOnImage([ia.BoundingBox(x1=2, y1=1, x2=2, y2=1)], shape=image.shape)
+                            for _ in sm.xrange(nb_images)]
+        )
+
+    def _fail_to_deterministic(n=None):
+        raise Exception("to_deterministic() should not be called")
+
+    # all modalities must be augmented in the same way, including
+    # augmenters with children that sample per image which child to use
+    # and augmenters that change the image shapes
+    for fuse_geometric in [False, True]:
+        seq = iaa.Sequential([
+            iaa.SomeOf(1, [iaa.Fliplr(1.0), iaa.Flipud(1.0)]),
+            iaa.Sometimes(0.5, iaa.Affine(translate_px={"x": (-2, 2), "y": (-1, 1)}, order=0)),
+            iaa.CropAndPad(px=(0, 2), keep_size=False),
+            iaa.Add((-10, 10)),
+            iaa.Multiply((0.9, 1.1))
+        ], random_order=True, fuse_geometric=fuse_geometric)
+        seq.to_deterministic = _fail_to_deterministic
+
+        batch = _create_batch(16)
+        batch_aug = seq.augment_batch(batch)
+
+        assert np.array_equal(batch.images, np.uint8([image] * 16))
+        assert batch.keypoints[0].keypoints[0].x == 2
+        for i in sm.xrange(16):
+            image_aug = batch_aug.images_aug[i]
+            y_img, x_img = np.unravel_index(np.argmax(image_aug[..., 0]), image_aug.shape[0:2])
+            assert image_aug[y_img, x_img, 0] > 200
+            kp = batch_aug.keypoints_aug[i].keypoints[0]
+            assert np.isclose(kp.x, x_img) and np.isclose(kp.y, y_img)
+            assert batch_aug.keypoints_aug[i].shape[0:2] == image_aug.shape[0:2]
+            bb = batch_aug.bounding_boxes_aug[i].bounding_boxes[0]
+            assert np.isclose(bb.x1, x_img) and np.isclose(bb.y1, y_img)
+            heatmap_aug = batch_aug.heatmaps_aug[i].get_arr()
+            assert heatmap_aug.shape[0:2] == image_aug.shape[0:2]
+            assert np.unravel_index(np.argmax(heatmap_aug), heatmap_aug.shape) == (y_img, x_img)
+            segmap_aug = batch_aug.segmentation_maps_aug[i].get_arr_int()
+            assert segmap_aug.shape[0:2] == image_aug.shape[0:2]
+            assert segmap_aug[y_img, x_img] == 1
+            assert np.sum(segmap_aug) == 1
+
+    # augmenters with children that do not sample jointly, 2D images as list
+    aug = iaa.WithChannels(None, iaa.Fliplr(0.5))
+    batch = ia.Batch(
+        images=[image[..., 0]] * 20,
+        keypoints=[ia.KeypointsOnImage([ia.Keypoint(x=2, y=1)], shape=image.shape) for _ in sm.xrange(20)]
+    )
+    batch_aug = aug.augment_batch(batch)
+    nb_flipped = 0
+    for image_aug, kps_aug in zip(batch_aug.images_aug, batch_aug.keypoints_aug):
+        assert image_aug.shape == (6, 8)
+        flipped = image_aug[1, 5] == 255
+        assert image_aug[1, 2] == (0 if flipped else 255)
+        assert kps_aug.keypoints[0].x == (5 if flipped else 2)
+        nb_flipped += int(flipped)
+    assert 0 < nb_flipped < 20
+
+    # hooks lead to augmenting each modality separately
+    aug = iaa.Fliplr(0.5)
+    batch = _create_batch(20)
+    hooks = ia.HooksImages(activator=lambda images, augmenter, parents, default: default)
+    batch_aug = aug.augment_batch(batch, hooks=hooks)
+    for image_aug, kps_aug in zip(batch_aug.images_aug, batch_aug.keypoints_aug):
+        flipped = image_aug[1, 5, 0] == 255
+        assert kps_aug.keypoints[0].x == (5 if flipped else 2)
+
+
+def test_Augmenter_apply_records():
+    reseed()
+
+    image = np.zeros((4, 8, 3), dtype=np.uint8)
+    image[1, 2, :] = 200
+    image_large = np.zeros((8, 16, 3), dtype=np.uint8)
+    image_large[2:4, 4:6, :] = 200
+
+    # geometric augmenters are recorded relative to the image size
+    seq = iaa.Sequential([
+        iaa.Fliplr(1.0),
+        iaa.Affine(translate_px={"x": 1}, order=0),
+        iaa.Add(10)
+    ])
+    images_aug, records = seq.augment_images([image], return_records=True)
+    assert len(records) == 1
+    expected = np.zeros((4, 8, 3), dtype=np.uint8) + 10
+    expected[1, 6, :] = 210
+    assert np.array_equal(images_aug[0], expected)
+
+    records = json.loads(json.dumps(records))
+    assert np.array_equal(seq.apply_records([image], records)[0], expected)
+
+    expected_large = np.zeros((8, 16, 3), dtype=np.uint8) + 10
+    expected_large[2:4, 12:14, :] = 210
+    observed = seq.apply_records(np.uint8([image_large]), records)
+    assert ia.is_np_array(observed)
+    assert np.array_equal(observed[0], expected_large)
+
+    kps = [ia.KeypointsOnImage([ia.Keypoint(x=2, y=1)], shape=image.shape)]
+    kps_aug = seq.apply_records_to_keypoints(kps, records)
+    assert np.isclose(kps_aug[0].keypoints[0].x, 6)
+    assert np.isclose(kps_aug[0].keypoints[0].y, 1)
+    assert kps[0].keypoints[0].x == 2
+    kps_large = [ia.KeypointsOnImage([ia.Keypoint(x=4.5, y=2.5)], shape=image_large.shape)]
+    kps_large_aug = seq.apply_records_to_keypoints(kps_large, records)
+    assert np.isclose(kps_large_aug[0].keypoints[0].x, 12.5)
+    assert np.isclose(kps_large_aug[0].keypoints[0].y, 2.5)
+
+    # replaying must reproduce the recorded augmentations for all kinds of
+    # augmenters and must not change any random state
+    seq = iaa.Sequential([
+        iaa.Fliplr(0.5),
+        iaa.SomeOf((0, 2), [
+            iaa.Affine(rotate=(-20, 20)),
+            iaa.Multiply((0.8, 1.2), per_channel=True),
+            iaa.GaussianBlur((0, 1.0))
+        ]),
+        iaa.Sometimes(0.5, iaa.CropAndPad(px=(-2, 2), keep_size=False), iaa.AdditiveGaussianNoise(scale=10)),
+        iaa.WithChannels([0], iaa.Add((-10, 10)))
+    ], random_order=True)
+    images = np.uint8([ia.quokka(size=(32, 32))] * 16)
+    images_aug, records = seq.augment_images(images, return_records=True)
+    records = pickle.loads(pickle.dumps(json.loads(json.dumps(records))))
+    state_seq = seq.random_state.get_state()[1]
+    state_global = ia.current_random_state().get_state()[1]
+    images_replayed = seq.apply_records(images, records)
+    assert np.array_equal(seq.random_state.get_state()[1], state_seq)
+    assert np.array_equal(ia.current_random_state().get_state()[1], state_global)
+    assert len(images_aug) == len(images_replayed) == 16
+    for image_aug, image_replayed in zip(images_aug, images_replayed):
+        assert np.array_equal(image_aug, image_replayed)
+
+    # records of deactivated augmenters are None
+    aug = iaa.Fliplr(1.0)
+    aug.activated = False
+    _, records = aug.augment_images([image], return_records=True)
+    assert records == [None]
+
+    # hooks are not supported together with records
+    hooks = ia.HooksImages(activator=lambda images, augmenter, parents, default: default)
+    got_exception = False
+    try:
+        _ = seq.augment_images(images, hooks=hooks, return_records=True)
+    except Exception as exc:
+        assert "Hooks can not be used" in str(exc)
+        got_exception = True
+    assert got_exception
+
+
 if __name__ == "__main__":
     main()
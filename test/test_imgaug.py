@@ -1,6 +1,7 @@
 from __future__ import print_function, division, absolute_import
 
 import time
+import pickle
 
 import matplotlib
 matplotlib.use('Agg')  # fix execution of tests involving matplotlib on travis
@@ -11,6 +12,7 @@ import shapely
 import shapely.geometry
 
 import imgaug as ia
+from imgaug import augmenters as iaa
 from imgaug.testutils import reseed
 
 
@@ -36,6 +38,7 @@ def main():
     test_derive_random_state()
     test_derive_random_states()
     test_forward_random_state()
+    test_set_rng_backend()
     # test_quokka()
     # test_quokka_square()
     # test_angle_between_vectors()
@@ -112,7 +115,9 @@ def main():
     test_Polygon___repr__()
     test_Polygon___str__()
     # test_Batch()
+    test_SharedMemoryTransport()
     test_BatchLoader()
+    test_AugmentationPool()
     # test_BackgroundAugmenter.get_batch()
     # test_BackgroundAugmenter._augment_images_worker()
     # test_BackgroundAugmenter.terminate()
@@ -373,6 +378,73 @@ def test_forward_random_state():
     assert rs1.randint(0, 10**6) == rs2.randint(0, 10**6)
 
 
+def test_set_rng_backend():
+    assert ia.get_rng_backend() == "mt19937"
+
+    got_exception = False
+    try:
+        ia.set_rng_backend("foo")
+    except Exception as exc:
+        assert "Expected backend" in str(exc)
+        got_exception = True
+    assert got_exception
+
+    ia.set_rng_backend("philox")
+    try:
+        assert ia.get_rng_backend() == "philox"
+
+        # new random states
+        rs1 = ia.new_random_state(1234)
+        rs2 = ia.new_random_state(1234)
+        assert isinstance(rs1, np.random.RandomState)
+        assert isinstance(rs1._bit_generator, np.random.Philox)
+        assert np.array_equal(rs1.randint(0, 10**6, 10), rs2.randint(0, 10**6, 10))
+        assert not np.array_equal(ia.new_random_state(1234).randint(0, 10**6, 10),
+                                  np.random.RandomState(1234).randint(0, 10**6, 10))
+        assert ia.new_random_state([1, 2]).randint(0, 10**6) == ia.new_random_state([1, 2]).randint(0, 10**6)
+        assert ia.new_random_state().randint(0, 10**6, 10).tolist() \
+            != ia.new_random_state().randint(0, 10**6, 10).tolist()
+
+        # copies
+        rs = ia.new_random_state(1017)
+        rs.normal()
+        rs_copy = ia.copy_random_state(rs)
+        assert rs_copy != rs
+        assert isinstance(rs_copy._bit_generator, np.random.Philox)
+        assert np.array_equal(rs.normal(size=(10,)), rs_copy.normal(size=(10,)))
+        state = ia.get_random_state_state(rs)
+        samples = rs.randint(0, 10**6, 10)
+        rs.set_state(state)
+        assert np.array_equal(rs.randint(0, 10**6, 10), samples)
+
+        # derived random states are reproducible and differ from each other
+        rss1 = ia.derive_random_states(ia.new_random_state(1017), n=3)
+        rss2 = ia.derive_random_states(ia.new_random_state(1017), n=3)
+        samples1 = [rs.randint(0, 10**6, 10).tolist() for rs in rss1]
+        samples2 = [rs.randint(0, 10**6, 10).tolist() for rs in rss2]
+        assert samples1 == samples2
+        assert len(set([tuple(samples) for samples in samples1])) == 3
+
+        # augmenters work with the backend and stay reproducible
+        image = np.arange(4*4*3).reshape((4, 4, 3)).astype(np.uint8)
+        aug = iaa.Sequential([iaa.Fliplr(0.5), iaa.AdditiveGaussianNoise(scale=10)], random_state=1)
+        aug_det = aug.to_deterministic()
+        images_aug1 = aug_det.augment_images([image] * 4)
+        images_aug2 = aug_det.augment_images([image] * 4)
+        assert all([np.array_equal(a, b) for a, b in zip(images_aug1, images_aug2)])
+        aug.reseed(1)
+        images_aug3 = aug.augment_images([image] * 4)
+        aug.reseed(1)
+        images_aug4 = aug.augment_images([image] * 4)
+        assert all([np.array_equal(a, b) for a, b in zip(images_aug3, images_aug4)])
+        assert isinstance(pickle.loads(pickle.dumps(aug)).random_state._bit_generator, np.random.Philox)
+    finally:
+        ia.set_rng_backend("mt19937")
+
+    # the default backend stays reproducible
+    assert ia.new_random_state(1234).randint(0, 10**6) == np.random.RandomState(1234).randint(0, 10**6)
+
+
 def test_imresize_many_images():
     for c in [1, 3]:
         image1 = np.zeros((16, 16, c), dtype=np.uint8) + 255
@@ -3890,6 +3962,93 @@ def test_Polygon_almost_equals():
     assert not poly_a.almost_equals(poly_b)
 
 
+def test_SharedMemoryTransport():
+    images = np.arange(2*4*4*3).astype(np.uint8).reshape((2, 4, 4, 3))
+    keypoints = [ia.KeypointsOnImage([ia.Keypoint(x=1, y=2)], shape=(4, 4, 3)) for _ in sm.xrange(2)]
+    images_list = [np.ones((3, 3, 3), dtype=np.uint8), np.zeros((5, 5), dtype=np.float32)]
+
+    # without shared memory the messages are just pickled batches
+    transport = ia.SharedMemoryTransport(2, None)
+    assert not transport.available
+    message = transport.encode(ia.Batch(images=images, keypoints=keypoints))
+    batch = pickle.loads(message)
+    assert np.array_equal(batch.images, images)
+    assert pickle.loads(transport.encode(None)) is None
+    transport.close()
+
+    if ia.shared_memory is None:
+        return
+
+    transport = ia.SharedMemoryTransport(2, 1024)
+    assert transport.available
+
+    # copy=True releases the slot directly
+    batch = ia.Batch(images=images, keypoints=keypoints, data="foo")
+    message = transport.encode(batch)
+    assert isinstance(pickle.loads(message), tuple)
+    assert np.array_equal(batch.images, images)
+    batch_decoded = transport.decode(message)
+    assert np.array_equal(batch_decoded.images, images)
+    assert batch_decoded.images.dtype.type == np.uint8
+    assert batch_decoded.keypoints[0].keypoints[0].y == 2
+    assert batch_decoded.data == "foo"
+
+    # copy=False occupies the slot until release() is called
+    batches_decoded = []
+    for _ in sm.xrange(2):
+        batch = ia.Batch(images=images)
+        batch.images_aug = images_list
+        message = transport.encode(batch)
+        batches_decoded.append(transport.decode(message, copy=False))
+    for batch_decoded in batches_decoded:
+        assert np.array_equal(batch_decoded.images, images)
+        assert isinstance(batch_decoded.images_aug, list)
+        assert np.array_equal(batch_decoded.images_aug[0], images_list[0])
+        assert np.array_equal(batch_decoded.images_aug[1], images_list[1])
+        assert batch_decoded.images_aug[1].dtype.type == np.float32
+
+    # all slots are occupied, hence the batch is pickled
+    message = transport.encode(ia.Batch(images=images))
+    assert isinstance(pickle.loads(message), ia.Batch)
+    assert np.array_equal(transport.decode(message).images, images)
+
+    for batch_decoded in batches_decoded:
+        transport.release(batch_decoded)
+        transport.release(batch_decoded)
+    message = transport.encode(ia.Batch(images=images))
+    assert isinstance(pickle.loads(message), tuple)
+    assert np.array_equal(transport.decode(message).images, images)
+
+    # batches that are too large for a slot are pickled
+    images_large = np.zeros((2, 32, 32, 3), dtype=np.uint8)
+    message = transport.encode(ia.Batch(images=images_large))
+    assert isinstance(pickle.loads(message), ia.Batch)
+    assert transport.decode(message).images.shape == images_large.shape
+    del batches_decoded
+    del batch_decoded
+    transport.close()
+
+    # transport of batches to and from background processes
+    def _load_func():
+        for i in sm.xrange(10):
+            yield ia.Batch(images=np.full((2, 4, 4, 3), i, dtype=np.uint8), data=i)
+
+    loader = ia.BatchLoader(_load_func, queue_size=2, threaded=False, shared_memory_slot_size=1024)
+    bg_augmenter = ia.BackgroundAugmenter(loader, iaa.Add(1), queue_size=2, nb_workers=2,
+                                          shared_memory_slot_size=1024)
+    datas = []
+    while True:
+        batch = bg_augmenter.get_batch(copy=False)
+        if batch is None:
+            break
+        assert np.all(batch.images == batch.data)
+        assert np.all(batch.images_aug == batch.data + 1)
+        datas.append(batch.data)
+        bg_augmenter.release_batch(batch)
+    assert sorted(datas) == list(sm.xrange(10))
+    loader.terminate()
+    bg_augmenter.terminate()
+
 def test_BatchLoader():
     def _load_func():
         for _ in sm.xrange(20):
@@ -3937,5 +4096,81 @@ def test_BatchLoader():
             assert loader.all_finished()
 
 
+def test_AugmentationPool():
+    augseq = iaa.Sequential([iaa.Fliplr(0.5), iaa.Add((-50, 50))])
+    batches = [np.arange(2*4*4*3).reshape((2, 4, 4, 3)).astype(np.uint8) for _ in sm.xrange(10)]
+
+    # results are in order and have the input datatype
+    with ia.AugmentationPool(augseq, nb_workers=2, seed=1) as pool:
+        batches_aug = pool.map(batches)
+        assert len(batches_aug) == len(batches)
+        assert all([ia.is_np_array(batch_aug) and batch_aug.shape == (2, 4, 4, 3) for batch_aug in batches_aug])
+
+        # per-batch seeds differ within a call and between calls
+        batches_aug_epoch2 = list(pool.imap(batches))
+        assert len(batches_aug_epoch2) == len(batches)
+        assert len(set([batch_aug.tobytes() for batch_aug in batches_aug])) > 1
+        assert any([not np.array_equal(a, b) for a, b in zip(batches_aug, batches_aug_epoch2)])
+
+        # unordered results contain the same batches as ordered ones
+        batches_list = [ia.Batch(images=batch, data=i) for i, batch in enumerate(batches)]
+        batches_aug_unordered = list(pool.imap_unordered(batches_list))
+        assert sorted([batch_aug.data for batch_aug in batches_aug_unordered]) == list(sm.xrange(len(batches)))
+
+    # results do not depend on the number of workers
+    for nb_workers in [1, 3]:
+        with ia.AugmentationPool(augseq, nb_workers=nb_workers, seed=1) as pool:
+            batches_aug_other = pool.map(batches, chunksize=3)
+            batches_aug_epoch2_other = list(pool.imap(iter(batches)))
+        assert all([np.array_equal(a, b) for a, b in zip(batches_aug, batches_aug_other)])
+        assert all([np.array_equal(a, b) for a, b in zip(batches_aug_epoch2, batches_aug_epoch2_other)])
+
+    # pools can be used via augment_batches()
+    pool = ia.AugmentationPool(augseq, nb_workers=2, seed=1)
+    batches_aug_other = list(augseq.augment_batches(batches, background=pool))
+    assert all([np.array_equal(a, b) for a, b in zip(batches_aug, batches_aug_other)])
+    pool.close()
+    pool.join()
+
+    got_exception = False
+    try:
+        with ia.AugmentationPool(iaa.Noop(), nb_workers=1) as pool:
+            _ = list(augseq.augment_batches(batches, background=pool))
+    except Exception as exc:
+        assert "AugmentationPool" in str(exc)
+        got_exception = True
+    assert got_exception
+
+    # large batches are split into shards, results do not depend on the
+    # number of workers
+    batches_large = [np.arange(10*4*4*3).reshape((10, 4, 4, 3)).astype(np.uint8) for _ in sm.xrange(3)]
+    results = []
+    for nb_workers in [1, 3]:
+        with ia.AugmentationPool(augseq, nb_workers=nb_workers, seed=1, shard_size=3) as pool:
+            results.append(pool.map(batches_large))
+    assert all([batch_aug.shape == (10, 4, 4, 3) for batch_aug in results[0]])
+    assert all([np.array_equal(a, b) for a, b in zip(results[0], results[1])])
+
+    # all modalities of a shard are augmented in the same way
+    image = np.zeros((4, 4, 1), dtype=np.uint8)
+    image[0, 0, 0] = 255
+    kps = ia.KeypointsOnImage([ia.Keypoint(x=0, y=0)], shape=image.shape)
+    batch = ia.Batch(images=[np.copy(image) for _ in sm.xrange(7)],
+                     keypoints=[kps.deepcopy() for _ in sm.xrange(7)],
+                     data="foo")
+    with ia.AugmentationPool(iaa.Fliplr(0.5), nb_workers=2, seed=1, shard_size=2) as pool:
+        batches_aug = list(pool.imap_unordered([batch, batch]))
+    assert len(batches_aug) == 2
+    for batch_aug in batches_aug:
+        assert batch_aug.data == "foo"
+        assert len(batch_aug.images) == len(batch_aug.images_aug) == len(batch_aug.keypoints_aug) == 7
+        flipped = []
+        for image_aug, kps_aug in zip(batch_aug.images_aug, batch_aug.keypoints_aug):
+            is_flipped = image_aug[0, 3, 0] == 255
+            assert np.isclose(kps_aug.keypoints[0].x, 3 if is_flipped else 0)
+            flipped.append(is_flipped)
+        assert 0 < sum(flipped) < 7
+
+
 if __name__ == "__main__":
     main()
@@ -23,6 +23,9 @@ def main():
     test_parameters_handle_probability_param()
     test_parameters_force_np_float_dtype()
     test_parameters_both_np_float_if_one_is_float()
+    test_parameters_draw_per_channel_samples()
+    test_parameters_draw_per_channel_elementwise_samples()
+    test_parameters_draw_sparse_mask_indices()
     test_parameters_draw_distribution_grid()
     test_parameters_draw_distribution_graph()
     test_parameters_Biomial()
@@ -52,9 +55,13 @@ def main():
     test_parameters_IterativeNoiseAggregator()
     test_parameters_Sigmoid()
     # test_parameters_SimplexNoise()
-    # test_parameters_FrequencyNoise()
+    test_parameters_FrequencyNoise()
     test_parameters_operators()
     test_parameters_copy()
+    test_parameters_draw_samples_out()
+    test_parameters_compile()
+    test_parameters_opensimplex_noise2d_array()
+    test_parameters_NoiseTextureBank()
 
     time_end = time.time()
     print("<%s> Finished without errors in %.4fs." % (__file__, time_end - time_start,))
@@ -599,6 +606,87 @@ def test_parameters_both_np_float_if_one_is_float():
     assert b2.dtype.type == np.float64, b2.dtype.type
 
 
+def test_parameters_draw_per_channel_samples():
+    # no per-channel sampling, all channels of an image have the same value
+    samples, mask = iap.draw_per_channel_samples(iap.Uniform(0, 1), iap.Deterministic(0), [3, 3, 1],
+                                                 np.random.RandomState(1))
+    assert samples.shape == (3, 3)
+    assert mask.shape == (3,)
+    assert not np.any(mask)
+    assert np.allclose(samples, samples[:, 0:1])
+    assert len(np.unique(samples[:, 0])) == 3
+
+    # per-channel sampling
+    samples, mask = iap.draw_per_channel_samples(iap.Uniform(0, 1), iap.Deterministic(1), [3, 3],
+                                                 np.random.RandomState(1))
+    assert np.all(mask)
+    assert all([len(np.unique(row)) == 3 for row in samples])
+
+    # mixed, the mask marks the images with per-channel values
+    samples, mask = iap.draw_per_channel_samples(iap.Uniform(0, 1), iap.Binomial(0.5), [2] * 1000,
+                                                 np.random.RandomState(1))
+    assert 400 < np.sum(mask) < 600
+    assert np.allclose(samples[~mask, 0], samples[~mask, 1])
+    assert not np.any(np.isclose(samples[mask, 0], samples[mask, 1]))
+
+    # same random state leads to the same samples
+    samples1, mask1 = iap.draw_per_channel_samples(iap.Uniform(0, 1), iap.Binomial(0.5), [3] * 10,
+                                                   np.random.RandomState(2))
+    samples2, mask2 = iap.draw_per_channel_samples(iap.Uniform(0, 1), iap.Binomial(0.5), [3] * 10,
+                                                   np.random.RandomState(2))
+    assert np.array_equal(samples1, samples2)
+    assert np.array_equal(mask1, mask2)
+
+    mask = iap.draw_per_channel_mask(iap.Binomial(0.5), 1000, np.random.RandomState(1))
+    assert mask.dtype.kind == "b"
+    assert 400 < np.sum(mask) < 600
+
+
+def test_parameters_draw_per_channel_elementwise_samples():
+    param = iap.Uniform(0, 1)
+
+    # parameters that are queried per call are queried per image
+    samples = iap.draw_per_channel_elementwise_samples(
+        iap.Uniform(0, iap.Choice([1, 100])), np.array([False] * 50), (50, 4, 5, 3), np.random.RandomState(1))
+    maxs = np.max(samples, axis=(1, 2, 3))
+    assert np.sum(maxs <= 1) > 0
+    assert np.sum(maxs > 1) > 0
+
+    # no image uses per-channel values
+    samples = iap.draw_per_channel_elementwise_samples(
+        param, np.array([False, False]), (2, 4, 5, 3), np.random.RandomState(1))
+    assert samples.shape == (2, 4, 5, 1)
+
+    # some images use per-channel values
+    samples = iap.draw_per_channel_elementwise_samples(
+        param, np.array([True, False, True]), (3, 4, 5, 3), np.random.RandomState(1))
+    assert samples.shape == (3, 4, 5, 3)
+    assert not np.allclose(samples[0, ..., 0], samples[0, ..., 1])
+    assert np.array_equal(samples[1, ..., 0], samples[1, ..., 1])
+    assert np.array_equal(samples[1, ..., 0], samples[1, ..., 2])
+    assert not np.allclose(samples[2, ..., 0], samples[2, ..., 2])
+
+
+def test_parameters_draw_sparse_mask_indices():
+    for p in [0.0, 0.01, 0.2, 1.0]:
+        indices = iap.draw_sparse_mask_indices(10000, p, np.random.RandomState(1))
+        assert indices.ndim == 1
+        assert len(np.unique(indices)) == len(indices)
+        assert np.array_equal(np.sort(indices), indices)
+        assert np.all(np.logical_and(0 <= indices, indices < 10000))
+        assert p * 10000 - 200 <= len(indices) <= p * 10000 + 200
+
+    # positions are uniformly distributed
+    counts = np.zeros((10,), dtype=np.int32)
+    rs = np.random.RandomState(1)
+    for _ in sm.xrange(200):
+        indices = iap.draw_sparse_mask_indices(10, 0.3, rs)
+        counts[indices] += 1
+    assert np.all(np.logical_and(60 - 25 < counts, counts < 60 + 25))
+
+    assert len(iap.draw_sparse_mask_indices(0, 0.5, np.random.RandomState(1))) == 0
+
+
 def test_parameters_draw_distribution_grid():
     params = [iap.Deterministic(1), iap.Uniform(0, 1.0)]
     graph1 = params[0].draw_distribution_graph(size=(100000,))
@@ -698,6 +786,36 @@ def test_parameters_Biomial():
     samples2 = param.draw_samples((10, 5), random_state=np.random.RandomState(1234))
     assert np.array_equal(samples1, samples2)
 
+    # masks
+    for p in [0.0, 0.05, 0.5, 0.95, 1.0]:
+        param = iap.Binomial(p)
+        mask = param.draw_mask((100, 200), random_state=np.random.RandomState(1))
+        assert mask.shape == (100, 200)
+        assert mask.dtype.type == np.bool_
+        assert p - 0.01 <= np.mean(mask) <= p + 0.01
+    mask1 = param.draw_mask((10, 5), random_state=np.random.RandomState(1234))
+    mask2 = param.draw_mask((10, 5), random_state=np.random.RandomState(1234))
+    assert np.array_equal(mask1, mask2)
+    mask = iap.Binomial(iap.Choice([0.0, 1.0])).draw_mask(10)
+    assert mask.shape == (10,)
+    assert np.all(mask) or not np.any(mask)
+
+    # batches sample p per entry
+    param = iap.Binomial(iap.Choice([0.0, 1.0]))
+    for as_mask in [False, True]:
+        samples = param.draw_samples_batch(100, (4, 5), random_state=np.random.RandomState(1), as_mask=as_mask)
+        assert samples.shape == (100, 4, 5)
+        if as_mask:
+            assert samples.dtype.type == np.bool_
+        means = np.average(samples, axis=(1, 2))
+        assert np.all(np.logical_or(means == 0, means == 1))
+        assert 0 < np.sum(means) < 100
+
+    # masks of other parameters are the sample values above 0.5
+    mask = iap.Uniform(0.0, 1.0).draw_mask((10, 10), random_state=np.random.RandomState(1))
+    samples = iap.Uniform(0.0, 1.0).draw_samples((10, 10), random_state=np.random.RandomState(1))
+    assert np.array_equal(mask, samples > 0.5)
+
 
 def test_parameters_Choice():
     reseed()
@@ -787,6 +905,47 @@ def test_parameters_Choice():
         else:
             assert False
 
+    # nested parameters lead to numeric arrays
+    param = iap.Choice([iap.Uniform(0, 1), iap.Normal(10, 0.1), 5])
+    samples = param.draw_samples((20, 30, 3), random_state=np.random.RandomState(1))
+    assert samples.shape == (20, 30, 3)
+    assert samples.dtype.kind == "f"
+    assert np.sum(samples == 5) > 0
+    assert np.sum(samples < 1.0) > 0
+    assert np.sum(np.logical_and(9.0 < samples, samples < 11.0)) > 0
+
+    # parameters are identified by object identity, not by their string representations
+    param_a = iap.Choice([0, 1])
+    param_b = iap.Choice([0, 1])
+    assert str(param_a) == str(param_b)
+    param = iap.Choice([param_a, param_b, 2])
+    samples = param.draw_samples((10000,), random_state=np.random.RandomState(1))
+    assert 3333 - 500 < np.sum(samples == 2) < 3333 + 500
+    assert 3333 - 500 < np.sum(samples == 0) < 3333 + 500
+    param = iap.Choice([param_a, param_a, 2])
+    samples = param.draw_samples((10000,), random_state=np.random.RandomState(1))
+    assert 3333 - 500 < np.sum(samples == 2) < 3333 + 500
+
+    # a parameter that was added multiple times is sampled once for all of its
+    # locations, using the seed that is derived from its first index
+    param_u = iap.Uniform(0, 1)
+    param = iap.Choice([param_u, iap.Normal(5, 1), param_u])
+    samples = param.draw_samples((1000,), random_state=np.random.RandomState(3))
+    assert samples.dtype.kind == "f"
+    seed = np.random.RandomState(3).randint(0, 10**6, 1)[0]
+    indices = ia.new_random_state(seed).choice(3, 1000)
+    is_u = indices != 1
+    expected_u = param_u.draw_samples((int(np.sum(is_u)),), random_state=ia.new_random_state(seed+1))
+    assert np.allclose(samples[is_u], expected_u)
+    assert np.all(np.logical_and(0 <= samples[is_u], samples[is_u] <= 1.0))
+    assert np.all(samples[~is_u] > 1.0)
+
+    # strings are kept as strings
+    param = iap.Choice([iap.Deterministic("linear"), "nearest"])
+    samples = param.draw_samples((100,), random_state=np.random.RandomState(1))
+    assert samples.dtype.kind == "U"
+    assert set(np.unique(samples)) == {"linear", "nearest"}
+
     param = iap.Choice([-1, 0, 1, 2, 3])
     samples1 = param.draw_samples((10, 5), random_state=np.random.RandomState(1234))
     samples2 = param.draw_samples((10, 5), random_state=np.random.RandomState(1234))
@@ -1541,6 +1700,45 @@ def test_parameters_FromLowerResolution():
     samples2 = param.draw_samples((10, 5, 1), random_state=np.random.RandomState(1234))
     assert np.allclose(samples1, samples2)
 
+    # batches are drawn per low resolution size, nearest neighbour upscaling must match opencv
+    class _DrawCounter(iap.StochasticParameter):
+        def __init__(self):
+            super(_DrawCounter, self).__init__()
+            self.sizes = []
+
+        def _draw_samples(self, size, random_state):
+            return random_state.randint(0, 255, size=size).astype(np.uint8)
+
+        def _draw_samples_batch(self, nb_samples, size, random_state, as_mask):
+            self.sizes.append((nb_samples,) + size)
+            return self._draw_samples((nb_samples,) + size, random_state)
+
+    other_param = _DrawCounter()
+    param = iap.FromLowerResolution(other_param, size_px=iap.Choice([4, 5]), method="nearest")
+    samples = param.draw_samples((50, 16, 20, 3), random_state=np.random.RandomState(1))
+    assert samples.shape == (50, 16, 20, 3)
+    assert samples.dtype.type == np.uint8
+    # heights and widths are both sampled from [4, 5]
+    assert len(other_param.sizes) <= 4
+    assert sum([size[0] for size in other_param.sizes]) == 50
+
+    other_param = _DrawCounter()
+    param = iap.FromLowerResolution(other_param, size_px=4, method="nearest")
+    samples = param.draw_samples((3, 16, 12, 1), random_state=np.random.RandomState(1))
+    rs = np.random.RandomState(1)
+    param.size_px.draw_samples((3, 2), random_state=rs)
+    param.method.draw_samples((3,), random_state=rs)
+    samples_small = rs.randint(0, 255, size=(3, 4, 4, 1)).astype(np.uint8)
+    expected = ia.imresize_many_images(samples_small, (16, 12), interpolation="nearest")
+    assert np.array_equal(samples, expected)
+
+    # values that the wrapped parameter samples once per call are sampled per entry of N
+    param = iap.FromLowerResolution(iap.Binomial(iap.Choice([0.0, 1.0])), size_px=4)
+    samples = param.draw_samples((100, 8, 8, 1), random_state=np.random.RandomState(1))
+    means = np.average(samples, axis=(1, 2, 3))
+    assert np.all(np.logical_or(means == 0, means == 1))
+    assert 0 < np.sum(means) < 100
+
     # str / repr
     param = iap.FromLowerResolution(other_param=iap.Deterministic(0), size_percent=1, method="nearest")
     assert param.__str__() == param.__repr__() == "FromLowerResolution(size_percent=Deterministic(int 1), method=Deterministic(nearest), other_param=Deterministic(int 0))"
@@ -2329,6 +2527,27 @@ def test_parameters_IterativeNoiseAggregator():
         got_exception = True
     assert got_exception
 
+    # aggregation happens in-place in float32 buffers, arrays returned by the wrapped
+    # parameter are not modified
+    class _Sequence(iap.StochasticParameter):
+        def __init__(self, arrays):
+            super(_Sequence, self).__init__()
+            self.arrays = arrays
+            self.idx = 0
+
+        def _draw_samples(self, size, random_state):
+            arr = self.arrays[self.idx % len(self.arrays)]
+            self.idx += 1
+            return arr
+
+    arrays = [np.float64([[1, 5]]), np.float64([[4, 2]]), np.float64([[3, 3]])]
+    for aggregation_method, expected in [("avg", [[8/3, 10/3]]), ("max", [[4, 5]]), ("min", [[1, 2]])]:
+        param = iap.IterativeNoiseAggregator(_Sequence(arrays), iterations=3, aggregation_method=aggregation_method)
+        samples = param.draw_samples((1, 2))
+        assert samples.dtype.type == np.float32
+        assert np.allclose(samples, expected)
+    assert np.array_equal(arrays[0], [[1, 5]])
+
     param = iap.IterativeNoiseAggregator(iap.Deterministic(0), iterations=(1, 3), aggregation_method="max")
     assert param.__str__() == param.__repr__() == "IterativeNoiseAggregator(Deterministic(int 0), DiscreteUniform(Deterministic(int 1), Deterministic(int 3)), Deterministic(max))"
 
@@ -2691,5 +2910,201 @@ def test_parameters_copy():
     assert param_copy.other_param.a[0] != param.other_param.a[0]
 
 
+def test_parameters_draw_samples_out():
+    param = iap.Uniform(0.0, 10.0)
+    out = np.zeros((10, 5), dtype=np.float64)
+    samples = param.draw_samples((10, 5), random_state=np.random.RandomState(1), out=out)
+    assert samples is out
+    assert np.array_equal(out, param.draw_samples((10, 5), random_state=np.random.RandomState(1)))
+
+    # values are cast to the dtype of out
+    out = np.zeros((10, 5), dtype=np.int32)
+    samples = param.draw_samples((10, 5), random_state=np.random.RandomState(1), out=out)
+    assert samples is out
+    assert np.array_equal(out, param.draw_samples((10, 5), random_state=np.random.RandomState(1)).astype(np.int32))
+
+    got_exception = False
+    try:
+        _ = param.draw_samples((10, 5), out=np.zeros((5, 10), dtype=np.float64))
+    except Exception as exc:
+        assert "Expected 'out'" in str(exc)
+        got_exception = True
+    assert got_exception
+
+
+def test_parameters_compile():
+    # non-arithmetic parameters are not changed
+    param = iap.Normal(0, 1)
+    assert param.compile() is param
+
+    params = [
+        iap.Clip(iap.Discretize(iap.Normal(0, 1) * 3 + 2), 0, 10),
+        iap.Normal(0, 1) * 3 + 2,
+        iap.Divide(iap.Uniform(0, 1) - 0.5, iap.Choice([0, 2, 3]), elementwise=True),
+        iap.Divide(iap.Uniform(0, 1), 0),
+        iap.Multiply(iap.DiscreteUniform(0, 5), iap.Uniform(0.5, 1.5), elementwise=True),
+        iap.Multiply(iap.DiscreteUniform(0, 5), 2),
+        iap.Clip(iap.Normal(0, 1), minval=0),
+        iap.Clip(iap.Normal(0, 1), maxval=0) - 1,
+        iap.Subtract(iap.Add(iap.Normal(0, 1), iap.Normal(3, 1), elementwise=True), iap.Uniform(0, 1)),
+        iap.Discretize(iap.Uniform(0, 4)) // 2,
+        iap.Absolute(iap.Normal(0, 1)) + 1
+    ]
+    for param in params:
+        param_compiled = param.compile()
+        assert isinstance(param_compiled, iap.CompiledParameter)
+        assert str(param) in str(param_compiled)
+        for size in [(5,), (16, 16, 3)]:
+            rs1 = np.random.RandomState(3)
+            rs2 = np.random.RandomState(3)
+            samples = param.draw_samples(size, random_state=rs1)
+            samples_compiled = param_compiled.draw_samples(size, random_state=rs2)
+            assert samples.dtype == samples_compiled.dtype
+            assert np.array_equal(samples, samples_compiled)
+            # the random state is forwarded in the same way
+            assert rs1.randint(0, 10**6) == rs2.randint(0, 10**6)
+
+    # the chain is followed down to the first non-arithmetic parameter
+    param_compiled = (iap.Absolute(iap.Normal(0, 1) * 2) + 1).compile()
+    assert len(param_compiled.chain) == 1
+    assert isinstance(param_compiled.source, iap.Absolute)
+
+
+def test_parameters_opensimplex_noise2d_array():
+    from imgaug.external.opensimplex import OpenSimplex
+
+    for seed in [0, 1, 123456]:
+        generator = OpenSimplex(seed=seed)
+        # the permutation arrays are shared between generators with the same seed
+        assert OpenSimplex(seed=seed)._perm is generator._perm
+
+        ys, xs = np.mgrid[0:20, 0:25]
+        noise = generator.noise2d_array(xs=xs, ys=ys)
+        expected = np.float64([[generator.noise2d(x=x, y=y) for x in range(25)] for y in range(20)])
+        assert noise.shape == (20, 25)
+        assert np.array_equal(noise, expected)
+
+        rs = np.random.RandomState(seed)
+        xs = rs.uniform(-100, 100, size=(500,))
+        ys = rs.uniform(-100, 100, size=(500,))
+        noise = generator.noise2d_array(xs=xs, ys=ys)
+        expected = np.float64([generator.noise2d(x=x, y=y) for x, y in zip(xs, ys)])
+        assert np.array_equal(noise, expected)
+
+    # SimplexNoise is unchanged by the vectorization
+    param = iap.SimplexNoise(size_px_max=8, upscale_method="nearest")
+    samples = param.draw_samples((32, 32), random_state=np.random.RandomState(1))
+    assert samples.shape == (32, 32)
+    assert samples.dtype.type == np.float32
+    assert 0.0 <= np.min(samples) and np.max(samples) <= 1.0
+
+
+def test_parameters_NoiseTextureBank():
+    nb_calls = [0]
+
+    def _generate(shape, seed):
+        nb_calls[0] += 1
+        return ia.new_random_state(seed).rand(*shape).astype(np.float32)
+
+    # textures are generated lazily, cropped from twice the size and reused
+    bank = iap.NoiseTextureBank(nb_textures=2, refresh_after=None)
+    rs = np.random.RandomState(1)
+    samples = [bank.draw("a", (4, 6), _generate, rs) for _ in range(20)]
+    assert all([sample.shape == (4, 6) for sample in samples])
+    assert nb_calls[0] == 2
+    assert bank.nb_bytes == 2 * (8 * 12 * 4)
+    # results are copies
+    samples[0][...] = -1
+    assert all([np.min(bank.draw("a", (4, 6), _generate, rs)) >= 0 for _ in range(10)])
+
+    # periodic textures are generated in the requested shape and shifted
+    texture = np.arange(16).reshape((4, 4)).astype(np.float32)
+    bank = iap.NoiseTextureBank(nb_textures=1)
+    sample = bank.draw("b", (4, 4), lambda shape, seed: texture, rs, periodic=True)
+    assert sample.shape == (4, 4)
+    assert np.array_equal(np.sort(sample.flatten()), texture.flatten())
+
+    # refresh policy
+    nb_calls[0] = 0
+    bank = iap.NoiseTextureBank(nb_textures=1, refresh_after=3)
+    for _ in range(9):
+        bank.draw("a", (4, 4), _generate, rs)
+    assert nb_calls[0] == 3
+    assert bank.nb_bytes == 8 * 8 * 4
+
+    # memory budget, least recently used keys are dropped first
+    bank = iap.NoiseTextureBank(nb_textures=1, max_bytes=2 * (8 * 8 * 4))
+    bank.draw("a", (4, 4), _generate, rs)
+    bank.draw("b", (4, 4), _generate, rs)
+    bank.draw("a", (4, 4), _generate, rs)
+    bank.draw("c", (4, 4), _generate, rs)
+    assert list(bank._textures.keys()) == ["a", "c"]
+    assert bank.nb_bytes == 2 * (8 * 8 * 4)
+    bank.clear()
+    assert bank.nb_bytes == 0
+    assert len(bank._textures) == 0
+
+    # exponent buckets
+    bank = iap.NoiseTextureBank(exponent_bucket_size=0.5)
+    assert np.isclose(bank.get_exponent_bucket(-2.1), -2.0)
+    assert np.isclose(bank.get_exponent_bucket(1.3), 1.5)
+
+    # usage in noise parameters
+    bank = iap.NoiseTextureBank(nb_textures=4)
+    for param in [iap.SimplexNoise(size_px_max=(4, 8), texture_bank=bank),
+                  iap.FrequencyNoise(size_px_max=(4, 8), texture_bank=bank),
+                  iap.SimplexNoise(texture_bank=True)]:
+        assert isinstance(param.texture_bank, iap.NoiseTextureBank)
+        for _ in range(10):
+            samples = param.draw_samples((16, 24), random_state=rs)
+            assert samples.shape == (16, 24)
+            assert 0.0 <= np.min(samples) and np.max(samples) <= 1.0
+    assert len(bank._textures) > 0
+    assert iap.SimplexNoise(texture_bank=False).texture_bank is None
+
+
+def test_parameters_FrequencyNoise():
+    param = iap.FrequencyNoise(exponent=(-4, 4), size_px_max=(4, 16), upscale_method=["linear", "cubic"])
+
+    # single planes
+    samples = param.draw_samples((20, 30), random_state=np.random.RandomState(1))
+    assert samples.shape == (20, 30)
+    assert samples.dtype.type == np.float32
+    assert 0.0 <= np.min(samples) and np.max(samples) <= 1.0
+    samples_stack = param.draw_samples((1, 20, 30), random_state=np.random.RandomState(1))
+    assert np.array_equal(samples, samples_stack[0])
+
+    # stacks of planes
+    samples = param.draw_samples((50, 20, 30), random_state=np.random.RandomState(1))
+    assert samples.shape == (50, 20, 30)
+    assert samples.dtype.type == np.float32
+    assert 0.0 <= np.min(samples) and np.max(samples) <= 1.0
+    assert not np.allclose(samples[0], samples[1])
+    samples_same = param.draw_samples((50, 20, 30), random_state=np.random.RandomState(1))
+    assert np.array_equal(samples, samples_same)
+
+    # planes that don't have to be upscaled are normalized to [0.0, 1.0]
+    param = iap.FrequencyNoise(exponent=-2, size_px_max=16)
+    samples = param.draw_samples((5, 8, 8), random_state=np.random.RandomState(1))
+    assert np.allclose(np.min(samples, axis=(1, 2)), 0.0)
+    assert np.allclose(np.max(samples, axis=(1, 2)), 1.0)
+
+    # low exponents lead to large blobs, i.e. neighbouring values are similar
+    diffs = []
+    for exponent in [-4, 4]:
+        param = iap.FrequencyNoise(exponent=exponent, size_px_max=32, upscale_method="linear")
+        samples = param.draw_samples((10, 32, 32), random_state=np.random.RandomState(1))
+        diffs.append(np.average(np.abs(samples[:, 1:, :] - samples[:, :-1, :])))
+    assert diffs[0] < diffs[1]
+
+    # distance matrices are cached per plane shape
+    f1 = iap.FrequencyNoise._get_distance_matrix((8, 5), 8, 8)
+    f2 = iap.FrequencyNoise._get_distance_matrix((8, 5), 8, 8)
+    assert f1 is f2
+    assert f1.shape == (8, 5)
+    assert np.isclose(f1[0, 0], 1.0)
+    assert np.isclose(f1[7, 4], np.sqrt(1**2 + 4**2))
+
+
 if __name__ == "__main__":
     main()